@@ -0,0 +1,365 @@
+"""
+Concurrent mixed read/write load of the ship configurations store:
+N threads or processes run a mix of ship lookups and ship updates for
+a fixed duration, throughput and latency percentiles are reported per
+operation type
+
+Usage:
+    python -m benchmarks.load_generator --ships 100000 --workers 8 \
+        --mode processes --duration 30 --distribution zipf \
+        --mix get_ship_parameter=45 get_ship_parameter_options=45 \
+        update_ship=10 --profile read-heavy --output load_results.json
+"""
+import argparse
+import bisect
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from configs.db_constants_and_configs import (NUMBER_OF_ROWS_PER_TABLE,
+                                              DB_CONNECTION_PROFILE,
+                                              CONNECTION_PROFILES,
+                                              LOAD_DURATION_S, LOAD_WORKERS,
+                                              LOAD_WORKER_MODES,
+                                              LOAD_OPERATIONS_MIX,
+                                              LOAD_KEY_DISTRIBUTIONS,
+                                              LOAD_ZIPF_EXPONENT)
+from data_base.compact_schema import get_item_keys_codec
+from data_base.dataset_cache import build_random_db
+from data_base.db_commands import (get_ship_parameter,
+                                   get_ship_parameter_options)
+from data_base.db_processing import DBConnector
+from data_base.lookup_cache import get_lookup_cache
+from data_base.ship_configurations import SHIPS_TABLE
+from utils.db_config_utils import get_primary_key, get_foreign_keys
+from utils.stats_utils import get_latency_summary
+
+
+class KeySampler:
+    """
+    Class that provides sampling of ship indexes with uniform or Zipfian
+    distribution, with Zipfian distribution ship-0 is the hottest key,
+    ship-1 is the next one and so on
+    """
+    def __init__(self, number_of_keys: int, distribution: str = 'uniform',
+                 zipf_exponent: float = LOAD_ZIPF_EXPONENT,
+                 generator: random.Random = random):
+        if distribution not in LOAD_KEY_DISTRIBUTIONS:
+            raise ValueError(f'Unsupported key distribution: {distribution}')
+        self.number_of_keys = number_of_keys
+        self.distribution = distribution
+        self.generator = generator
+        self.cum_weights = (
+            list(itertools.accumulate(1 / rank ** zipf_exponent for rank
+                                      in range(1, number_of_keys + 1)))
+            if distribution == 'zipf' else None)
+
+    def sample(self) -> int:
+        """
+        Method returns random key index
+        :return: index from [0, number_of_keys) interval
+        """
+        if self.cum_weights is None:
+            return self.generator.randrange(self.number_of_keys)
+        return bisect.bisect(self.cum_weights,
+                             self.generator.random() * self.cum_weights[-1])
+
+
+def load_item_keys(db_connector: DBConnector) -> tuple:
+    """
+    Function provides reading keys of all ships and of all items that
+    could be used as ship components, keys are returned as they are stored
+    in database, so load could be run against any database (e.g. imported
+    snapshot with its own ids)
+    :param db_connector: database connector object
+    :return: tuple in the following format:
+    ([ship_key, ...], {component_name: [component_key, ...], ...})
+    """
+    ships = [row[0] for row in db_connector.select_wo_condition(
+        SHIPS_TABLE, [get_primary_key(SHIPS_TABLE)])]
+    components = {
+        component_name: [row[0] for row in db_connector.select_wo_condition(
+            component_table, [component_key])]
+        for component_name, component_table, component_key
+        in get_foreign_keys(SHIPS_TABLE)}
+    return ships, components
+
+
+class LoadWorker:
+    """
+    Class that provides running mixed load through own database connection:
+    every operation is applied to the ship sampled by key sampler, with
+    Zipfian distribution the first ship of the database is the hottest one
+    """
+    def __init__(self, db_connector: DBConnector, ships: list,
+                 components: dict, distribution: str,
+                 seed: Optional[int] = None):
+        if not ships:
+            raise ValueError(f'There are no ships in '
+                             f'{db_connector.db_name} database')
+        self.db_connector = db_connector
+        self.ships = ships
+        self.components = components
+        self.components_names = list(components)
+        self.ship_key = get_primary_key(SHIPS_TABLE)
+        self.generator = random.Random(seed)
+        self.key_sampler = KeySampler(len(ships), distribution,
+                                      generator=self.generator)
+        self.keys_codec = get_item_keys_codec(db_connector)
+        self.operations = {
+            'get_ship_parameter': self.get_ship_parameter,
+            'get_ship_parameter_options': self.get_ship_parameter_options,
+            'update_ship': self.update_ship,
+        }
+
+    def get_ship_id(self, ship_index: int) -> str:
+        """
+        Method returns string id of the ship that is used by lookups
+        :param ship_index: index of the ship key
+        :return: ship id
+        """
+        return self.keys_codec.decode(self.ship_key, self.ships[ship_index])
+
+    def get_ship_parameter(self, ship_index: int) -> None:
+        get_ship_parameter(self.db_connector, self.get_ship_id(ship_index),
+                           self.generator.choice(self.components_names))
+
+    def get_ship_parameter_options(self, ship_index: int) -> None:
+        get_ship_parameter_options(
+            self.db_connector, self.get_ship_id(ship_index),
+            self.generator.choice(self.components_names))
+
+    def update_ship(self, ship_index: int) -> None:
+        """
+        Method provides replacing random component of the ship with
+        random existing item
+        :param ship_index: index of the ship key
+        """
+        component_name = self.generator.choice(self.components_names)
+        update_row = (self.ship_key, self.ships[ship_index], component_name,
+                      self.generator.choice(self.components[component_name]))
+        if not self.db_connector.update_multiple_data(SHIPS_TABLE,
+                                                      [update_row]):
+            raise RuntimeError(f'{self.get_ship_id(ship_index)} '
+                               f'is not updated')
+
+    def run(self, operations_mix: dict, duration: float) -> dict:
+        """
+        Method provides running operations in random order according to
+        their weights until duration is over
+        :param operations_mix: dict with operations weights following next
+                               format: {operation_name: weight, ...}
+        :param duration: load duration in seconds
+        :return: dict with operations results following next format:
+        {operation_name: {'latencies': [...], 'errors_latencies': [...]},
+         ...}
+        latencies of failed operations are kept separately, so fast
+        failures (e.g. busy database) don't skew latency percentiles
+        """
+        operations_names = list(operations_mix)
+        operations_weights = list(itertools.accumulate(
+            operations_mix.values()))
+        results = {operation_name: {'latencies': [], 'errors_latencies': []}
+                   for operation_name in operations_names}
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            operation_name = self.generator.choices(
+                operations_names, cum_weights=operations_weights)[0]
+            ship_index = self.key_sampler.sample()
+            start_time = time.perf_counter()
+            latencies_name = 'latencies'
+            try:
+                self.operations[operation_name](ship_index)
+            except Exception as error:
+                logging.debug(f'{operation_name} failed: {error}')
+                latencies_name = 'errors_latencies'
+            results[operation_name][latencies_name].append(
+                time.perf_counter() - start_time)
+        return results
+
+
+def run_load_worker(db_name: str, worker_index: int, operations_mix: dict,
+                    duration: float, distribution: str,
+                    profile: str = DB_CONNECTION_PROFILE,
+                    seed: Optional[int] = None,
+                    lookup_cache: bool = False) -> dict:
+    """
+    Function provides running load from one thread or process with own
+    database connection
+    :param db_name: name of the database
+    :param worker_index: index of the worker, it's used for seed derivation
+    :param operations_mix: dict with operations weights
+    :param duration: load duration in seconds
+    :param distribution: key distribution name ('uniform' or 'zipf')
+    :param profile: connection profile name
+    :param seed: seed of the load, None - random load
+    :param lookup_cache: True - enable lookups cache of the connection,
+                         so repeated reads of the worker are served from
+                         memory instead of database
+    :return: dict with operations results (see LoadWorker.run)
+    """
+    with DBConnector(db_name, profile=profile) as db:
+        if not lookup_cache:
+            get_lookup_cache(db).max_size = 0
+        ships, components = load_item_keys(db)
+        load_worker = LoadWorker(
+            db, ships, components, distribution,
+            seed + worker_index if seed is not None else None)
+        return load_worker.run(operations_mix, duration)
+
+
+def get_load_report(workers_results: list, duration: float) -> dict:
+    """
+    Function provides merging results of all workers
+    :param workers_results: list with results of every worker
+    :param duration: load duration in seconds
+    :return: dict with throughput and latency summary of successful
+    operations (see get_latency_summary), number of errors and mean
+    latency of failed operations for every operation and for all of them
+    """
+    latencies, errors_latencies = {}, {}
+    for worker_results in workers_results:
+        for operation_name, operation_results in worker_results.items():
+            latencies.setdefault(operation_name, []).extend(
+                operation_results['latencies'])
+            errors_latencies.setdefault(operation_name, []).extend(
+                operation_results['errors_latencies'])
+    latencies['total'] = list(itertools.chain.from_iterable(
+        latencies.values()))
+    errors_latencies['total'] = list(itertools.chain.from_iterable(
+        errors_latencies.values()))
+
+    return {operation_name: dict(
+                get_latency_summary(operation_latencies),
+                throughput_ops=len(operation_latencies) / duration,
+                errors=len(errors_latencies[operation_name]),
+                errors_mean_ms=get_latency_summary(
+                    errors_latencies[operation_name])['mean_ms'])
+            for operation_name, operation_latencies in latencies.items()}
+
+
+def run_load(db_name: str, workers: int = LOAD_WORKERS,
+             mode: str = 'threads', duration: float = LOAD_DURATION_S,
+             operations_mix: Optional[dict] = None,
+             distribution: str = 'uniform',
+             profile: str = DB_CONNECTION_PROFILE,
+             seed: Optional[int] = None, lookup_cache: bool = False) -> dict:
+    """
+    Function provides running mixed load against existing database from
+    several threads or processes
+    :param db_name: name of the database
+    :param workers: number of threads or processes
+    :param mode: 'threads' or 'processes'
+    :param duration: load duration in seconds
+    :param operations_mix: dict with operations weights,
+                           LOAD_OPERATIONS_MIX is used by default
+    :param distribution: key distribution name ('uniform' or 'zipf')
+    :param profile: connection profile name
+    :param seed: seed of the load, None - random load
+    :param lookup_cache: True - enable lookups cache of connections
+    :return: dict with load settings and report (see get_load_report)
+    """
+    if mode not in LOAD_WORKER_MODES:
+        raise ValueError(f'Unsupported load mode: {mode}')
+    operations_mix = operations_mix or LOAD_OPERATIONS_MIX
+    logging.info(f'Run {operations_mix} load against {db_name} from '
+                 f'{workers} {mode} for {duration}s')
+    # persistent settings (e.g. WAL journal mode) are applied once,
+    # so workers don't change them concurrently
+    with DBConnector(db_name, profile=profile):
+        pass
+
+    executor_class = (ThreadPoolExecutor if mode == 'threads'
+                      else ProcessPoolExecutor)
+    with executor_class(max_workers=workers) as executor:
+        futures = [executor.submit(run_load_worker, db_name, worker_index,
+                                   operations_mix, duration, distribution,
+                                   profile, seed, lookup_cache)
+                   for worker_index in range(workers)]
+        workers_results = [future.result() for future in futures]
+
+    return {
+        'workers': workers,
+        'mode': mode,
+        'duration_s': duration,
+        'distribution': distribution,
+        'profile': profile,
+        'operations_mix': operations_mix,
+        'operations': get_load_report(workers_results, duration),
+    }
+
+
+def parse_operations_mix(operations_mix: list) -> dict:
+    """
+    Function provides parsing operations mix command line values
+    :param operations_mix: list of strings in the following format:
+                           ['operation_name=weight', ...]
+    :return: dict in the following format: {operation_name: weight, ...}
+    """
+    parsed_mix = {}
+    for operation_weight in operations_mix:
+        operation_name, weight = operation_weight.split('=')
+        if operation_name not in LOAD_OPERATIONS_MIX:
+            raise ValueError(f'Unknown operation: {operation_name}')
+        parsed_mix[operation_name] = float(weight)
+    return parsed_mix
+
+
+def main() -> None:
+    """
+    Function provides command line entry point of the load generator
+    """
+    parser = argparse.ArgumentParser(description='Mixed load generator')
+    parser.add_argument('--db-name',
+                        help='existing database, by default temporary '
+                             'database is generated')
+    parser.add_argument('--ships', type=int,
+                        default=NUMBER_OF_ROWS_PER_TABLE['Ships'],
+                        help='number of ships in generated database')
+    parser.add_argument('--workers', type=int, default=LOAD_WORKERS,
+                        help='number of threads or processes')
+    parser.add_argument('--mode', choices=LOAD_WORKER_MODES,
+                        default='threads', help='workers type')
+    parser.add_argument('--duration', type=float, default=LOAD_DURATION_S,
+                        help='load duration in seconds')
+    parser.add_argument('--mix', nargs='+',
+                        help='operations weights in operation=weight format')
+    parser.add_argument('--distribution', choices=LOAD_KEY_DISTRIBUTIONS,
+                        default='uniform', help='ships keys distribution')
+    parser.add_argument('--profile', choices=CONNECTION_PROFILES,
+                        default=DB_CONNECTION_PROFILE,
+                        help='connection profile of workers')
+    parser.add_argument('--seed', type=int, help='seed of data and load')
+    parser.add_argument('--lookup-cache', action='store_true',
+                        help='enable lookups cache of workers, so repeated '
+                             'reads are served from memory')
+    parser.add_argument('--output', help='JSON file for results')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    operations_mix = parse_operations_mix(args.mix) if args.mix else None
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_name = args.db_name
+        if db_name is None:
+            db_name = os.path.join(work_dir, 'load.db')
+            with DBConnector(db_name) as db:
+                build_random_db(db, args.seed, rows_per_table=dict(
+                    NUMBER_OF_ROWS_PER_TABLE, Ships=args.ships))
+        results = run_load(db_name, args.workers, args.mode, args.duration,
+                           operations_mix, args.distribution, args.profile,
+                           args.seed, args.lookup_cache)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Benchmark of the whole data pipeline:
+initialize_db -> generate_random_db_data -> dump_db ->
+generate_updated_db_data -> compare
+
+Usage:
+    python -m benchmarks.pipeline_benchmark --sizes 100 1000 10000 \
+        --output benchmark_results.json --baseline benchmark_baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from configs.db_constants_and_configs import (NUMBER_OF_ROWS_PER_TABLE,
+                                              GENERATION_BACKEND,
+                                              BENCHMARK_SHIP_SIZES,
+                                              BENCHMARK_LOOKUPS,
+                                              BENCHMARK_REGRESSION_THRESHOLD)
+from data_base.db_commands import (initialize_db, initialize_db_indexes,
+                                   generate_random_db_data,
+                                   generate_updated_db_data,
+                                   get_ship_parameter,
+                                   get_ship_parameter_options)
+from data_base.db_diff import compare_databases
+from data_base.db_processing import DBConnector
+from utils.data_generation_utils import generate_n_items
+from utils.stats_utils import get_latency_summary
+
+
+def get_peak_rss_mb() -> float:
+    """
+    Function returns peak resident set size of the current process over
+    its whole lifetime, so it never decreases between pipeline phases
+    :return: peak RSS in megabytes
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is measured in bytes on macOS and in kilobytes on Linux
+    return max_rss / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+
+@contextmanager
+def measure_phase(results: dict, phase_name: str,
+                  number_of_rows: int) -> Iterator[None]:
+    """
+    Context manager that measures duration and throughput of the pipeline
+    phase and stores them into results dict together with peak RSS of the
+    process so far (it includes peaks of the previous phases)
+    :param results: dict where phase results should be stored
+    :param phase_name: name of the pipeline phase
+    :param number_of_rows: number of rows processed by the phase
+    """
+    logging.info(f'Benchmark {phase_name} phase')
+    start_time = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start_time
+    results[phase_name] = {
+        'duration_s': duration,
+        'rows': number_of_rows,
+        'rows_per_s': number_of_rows / duration if duration else 0.0,
+        'process_peak_rss_mb': get_peak_rss_mb(),
+    }
+
+
+def run_lookups(db_connector: DBConnector, ship_ids: list) -> dict:
+    """
+    Function provides measuring latencies of ship parameter lookups
+    :param db_connector: database connector object
+    :param ship_ids: ids of ships that should be looked up
+    :return: dict with latencies summary for each lookup function
+    """
+    latencies = {'get_ship_parameter': [], 'get_ship_parameter_options': []}
+    for ship_id in ship_ids:
+        component = random.choice(('weapon', 'hull', 'engine'))
+        start_time = time.perf_counter()
+        get_ship_parameter(db_connector, ship_id, component)
+        latencies['get_ship_parameter'].append(
+            time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        get_ship_parameter_options(db_connector, ship_id, component)
+        latencies['get_ship_parameter_options'].append(
+            time.perf_counter() - start_time)
+
+    return {lookup_name: get_latency_summary(lookup_latencies)
+            for lookup_name, lookup_latencies in latencies.items()}
+
+
+def run_pipeline_benchmark(number_of_ships: int, work_dir: str,
+                           number_of_lookups: int = BENCHMARK_LOOKUPS,
+                           backend: str = GENERATION_BACKEND,
+                           workers: Optional[int] = None) -> dict:
+    """
+    Function provides benchmark of all pipeline phases for one table size
+    :param number_of_ships: number of rows in Ships table
+    :param work_dir: directory where databases are created
+    :param number_of_lookups: number of ships that are looked up
+    :param backend: data generation backend name
+    :param workers: number of sharded generation workers,
+                    None - generate data serially
+    :return: dict with results of each phase
+    """
+    rows_per_table = dict(NUMBER_OF_ROWS_PER_TABLE, Ships=number_of_ships)
+    total_rows = sum(rows_per_table.values())
+    db_name = os.path.join(work_dir, f'benchmark_{number_of_ships}.db')
+    dumped_db_name = os.path.join(work_dir,
+                                  f'benchmark_{number_of_ships}_dumped.db')
+    results = {}
+
+    with DBConnector(db_name) as db:
+        with measure_phase(results, 'initialize_db', 0):
+            initialize_db(db)
+        with measure_phase(results, 'generate_random_db_data', total_rows):
+            generate_random_db_data(db, backend,
+                                    rows_per_table=rows_per_table,
+                                    workers=workers)
+        with measure_phase(results, 'initialize_db_indexes', total_rows):
+            initialize_db_indexes(db)
+        with measure_phase(results, 'dump_db', total_rows):
+            db.dump_db(dumped_db_name)
+
+        with DBConnector(dumped_db_name) as dumped_db:
+            with measure_phase(results, 'generate_updated_db_data',
+                               total_rows):
+                generate_updated_db_data(dumped_db, rows_per_table)
+
+        with measure_phase(results, 'compare', 2 * total_rows):
+            compare_databases(db, dumped_db_name)
+
+        ship_ids = random.sample(generate_n_items('ship', number_of_ships),
+                                 min(number_of_lookups, number_of_ships))
+        with measure_phase(results, 'lookups', len(ship_ids)):
+            results['lookups_latency'] = run_lookups(db, ship_ids)
+
+    os.remove(db_name)
+    os.remove(dumped_db_name)
+    return results
+
+
+def compare_with_baseline(results: dict, baseline: dict,
+                          threshold: float = BENCHMARK_REGRESSION_THRESHOLD
+                          ) -> list:
+    """
+    Function provides comparing benchmark results with stored baseline
+    :param results: dict with benchmark results
+    :param baseline: dict with baseline results in the same format
+    :param threshold: max allowed ratio of phase duration to the
+                      baseline one
+    :return: list of strings with found regressions descriptions
+    """
+    regressions = []
+    for size, phases in results['sizes'].items():
+        baseline_phases = baseline.get('sizes', {}).get(size, {})
+        for phase_name, phase_results in phases.items():
+            baseline_duration = baseline_phases.get(phase_name, {}).get(
+                'duration_s')
+            if not baseline_duration or 'duration_s' not in phase_results:
+                continue
+            ratio = phase_results['duration_s'] / baseline_duration
+            phase_results['baseline_ratio'] = ratio
+            if ratio > threshold:
+                regressions.append(
+                    f'{phase_name} for {size} ships: '
+                    f'{phase_results["duration_s"]:.3f}s vs '
+                    f'{baseline_duration:.3f}s in baseline ({ratio:.2f}x)')
+    return regressions
+
+
+def run_benchmarks(sizes: tuple, output: str, baseline: Optional[str] = None,
+                   number_of_lookups: int = BENCHMARK_LOOKUPS,
+                   backend: str = GENERATION_BACKEND,
+                   threshold: float = BENCHMARK_REGRESSION_THRESHOLD,
+                   workers: Optional[int] = None) -> list:
+    """
+    Function provides running pipeline benchmark for every table size,
+    storing results into JSON file and comparing them with baseline
+    :param sizes: tuple with numbers of ships
+    :param output: JSON file name where results should be stored
+    :param baseline: JSON file name with baseline results
+    :param number_of_lookups: number of ships that are looked up
+    :param backend: data generation backend name
+    :param threshold: max allowed ratio of phase duration to the
+                      baseline one
+    :param workers: number of sharded generation workers,
+                    None - generate data serially
+    :return: list of strings with found regressions descriptions
+    """
+    results = {'backend': backend, 'workers': workers, 'sizes': {}}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for number_of_ships in sizes:
+            logging.info(f'Run pipeline benchmark for {number_of_ships} ships')
+            results['sizes'][str(number_of_ships)] = run_pipeline_benchmark(
+                number_of_ships, work_dir, number_of_lookups, backend,
+                workers)
+
+    regressions = []
+    if baseline:
+        with open(baseline) as baseline_file:
+            regressions = compare_with_baseline(results,
+                                                json.load(baseline_file),
+                                                threshold)
+        results['regressions'] = regressions
+
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    return regressions
+
+
+def main() -> None:
+    """
+    Function provides command line entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Data pipeline benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=BENCHMARK_SHIP_SIZES,
+                        help='numbers of ships to benchmark')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file for results')
+    parser.add_argument('--baseline', help='JSON file with baseline results')
+    parser.add_argument('--lookups', type=int, default=BENCHMARK_LOOKUPS,
+                        help='number of ships that are looked up')
+    parser.add_argument('--backend', default=GENERATION_BACKEND,
+                        help='data generation backend')
+    parser.add_argument('--threshold', type=float,
+                        default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help='max allowed duration ratio to baseline')
+    parser.add_argument('--workers', type=int,
+                        help='number of sharded generation workers')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    regressions = run_benchmarks(tuple(args.sizes), args.output,
+                                 args.baseline, args.lookups, args.backend,
+                                 args.threshold, args.workers)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,131 @@
 CREATE_QUERY = 'CREATE TABLE {} ({});'
+CREATE_WITHOUT_ROWID_QUERY = 'CREATE TABLE {} ({}) WITHOUT ROWID;'
 FOREIGN_KEYS_QUERY = 'FOREIGN KEY ({}) REFERENCES {} ({})'
 INSERT_QUERY = 'INSERT INTO {} VALUES ({});'
 UPDATE_QUERY = 'UPDATE {} SET {} = ? WHERE {} = ?;'
 SIMPLE_SELECT_QUERY = 'SELECT {} FROM {};'
 WHERE_CLAUSE = 'WHERE {}'
 JOIN_CLAUSE = 'JOIN {} ON {}'
+CREATE_INDEX_QUERY = 'CREATE INDEX IF NOT EXISTS {} ON {} ({});'
+EXPLAIN_QUERY_PLAN = 'EXPLAIN QUERY PLAN {}'
+PRAGMA_QUERY = 'PRAGMA {} = {};'
+SCHEMA_VERSION_QUERY = 'PRAGMA schema_version;'
+DATABASE_VERSIONS_QUERY = ('SELECT data_version, schema_version '
+                           'FROM pragma_data_version, pragma_schema_version;')
+FOREIGN_KEY_CHECK_QUERY = 'PRAGMA foreign_key_check;'
+TABLE_PRIMARY_KEY_QUERY = ('SELECT type FROM pragma_table_info(?, ?) '
+                           'WHERE pk = 1;')
+TABLE_EXISTS_QUERY = 'SELECT COUNT(*) FROM pragma_table_info(?);'
+ATTACH_QUERY = 'ATTACH DATABASE ? AS {};'
+DETACH_QUERY = 'DETACH DATABASE {};'
+BEGIN_TRANSACTION_QUERY = 'BEGIN {} TRANSACTION;'
+SAVEPOINT_QUERY = 'SAVEPOINT {};'
+RELEASE_SAVEPOINT_QUERY = 'RELEASE SAVEPOINT {};'
+ROLLBACK_TO_SAVEPOINT_QUERY = 'ROLLBACK TO SAVEPOINT {};'
+CONDITION_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'LIKE', 'IS',
+                       'IS NOT', 'IN')
+CACHED_STATEMENTS = 256
+QUERY_SHAPES_CACHE_SIZE = 1024
+DB_BUSY_TIMEOUT = 30
+
+# PRAGMA settings of the connection profiles, "default" profile restores
+# SQLite default values; locking_mode is applied before journal_mode
+CONNECTION_PROFILES = {
+    'default': {
+        'locking_mode': 'NORMAL',
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    'bulk-load': {
+        'locking_mode': 'EXCLUSIVE',
+        'journal_mode': 'MEMORY',
+        'synchronous': 'OFF',
+        'cache_size': -262144,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+    },
+    'read-heavy': {
+        'locking_mode': 'NORMAL',
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -131072,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'durable': {
+        'locking_mode': 'NORMAL',
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+}
+DB_CONNECTION_PROFILE = 'default'
+DB_GENERATION_PROFILE = 'bulk-load'
+DB_COMPARISON_PROFILE = 'read-heavy'
+POOL_MAX_READERS = 8
+POOL_CHECKOUT_TIMEOUT = 30
+ASYNC_DB_WORKERS = 4
+ASYNC_LOOKUPS_CONCURRENCY = 64
+# DEFERRED transaction takes locks on the first database access, IMMEDIATE
+# one takes write lock on BEGIN, so concurrent writers wait for it instead
+# of failing on the first write
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+TRANSACTION_MODE = 'DEFERRED'
+BULK_TRANSACTION_MODE = 'IMMEDIATE'
+# bulk loads are committed after every N write statements (executemany()
+# call is one statement), None - bulk load is one all-or-nothing transaction
+BULK_COMMIT_EVERY = None
+INSERT_BATCH_SIZE = 10000
+FETCH_CHUNK_SIZE = 1000
+LOOKUP_CACHE_SIZE = 10000
+SLOW_QUERY_THRESHOLD_MS = 100
+QUERY_STATS_MAX_SAMPLES = 10000
+QUERY_STATS_MAX_SLOW_QUERIES = 1000
+GENERATION_CHUNK_SIZE = 10000
+GENERATION_SHARD_SIZE = 50000
+GENERATION_BACKENDS = ('python', 'numpy')
+GENERATION_BACKEND = 'python'
 DB_NAME = 'sqlite_python.db'
 NEW_DB_NAME = 'new_sqlite_python.db'
+IN_MEMORY_DB_NAME = 'file:{}?mode=memory&cache=shared'
+USE_IN_MEMORY_DB = False
+BACKUP_PAGES_PER_STEP = 1024
+DATASET_CACHE_DIR = '.dataset_cache'
+DATASET_CACHE_MAX_SIZE = 2 * 1024 ** 3
+DATASET_GENERATOR_VERSION = 2
+DATASET_SEED = None
+# streaming export/import of all tables, "binary" format stores chunks
+# of rows serialized with marshal module, so it should be read only by
+# the same Python version and only from trusted sources
+TRANSFER_FORMATS = ('csv', 'jsonl', 'binary')
+TRANSFER_FORMAT = 'csv'
+TRANSFER_MANIFEST_NAME = 'manifest.json'
+TRANSFER_COMPRESS_LEVEL = 1
+EXPORT_CHUNK_SIZE = 10000
+IMPORT_BATCH_SIZE = 100000
+DUMPED_DB_ALIAS = 'dumped'
+OVERLAY_DB_ALIAS = 'overlay'
+OVERLAY_DELETED_COLUMN = 'overlay_deleted'
+OVERLAY_TABLE_SUFFIX = '_overlay'
+FINGERPRINTS_TABLE_SUFFIX = '_fingerprints'
+FINGERPRINT_BUCKETS_TABLE_SUFFIX = '_fingerprint_buckets'
+FINGERPRINT_BUCKETS = 1024
+USE_OVERLAY_DUMP = False
+# compact schema stores item ids ('ship-12') as integers (12), primary keys
+# become aliases of rowid unless tables are created WITHOUT ROWID
+USE_COMPACT_SCHEMA = False
+COMPACT_WITHOUT_ROWID = False
+COMPACT_PRIMARY_KEY_TYPE = 'INTEGER PRIMARY KEY'
+COMPACT_FOREIGN_KEY_TYPE = 'INTEGER'
+# denormalized table with one row per ship and options of all its
+# components, it's maintained by triggers when it's enabled
+SHIP_CONFIGURATIONS_TABLE = 'ship_configurations'
+USE_SHIP_CONFIGURATIONS_TABLE = False
 
 TABLES_CONFIG = {
     'weapons':
@@ -43,6 +162,10 @@ TABLES_CONFIG = {
         },
 }
 
+# additional indexes, indexes for foreign keys are created automatically
+# {table_name: [(column_name, ...), ...], ...}
+EXTRA_INDEXES_CONFIG = {}
+
 ITEM_TABLE_MATCHER = {
         'ship': 'Ships',
         'weapon': 'weapons',
@@ -58,3 +181,27 @@ NUMBER_OF_ROWS_PER_TABLE = {
     'hulls': 5,
     'engines': 6
 }
+
+# ships configuration tests are generated by chunks of ships; "pairs" mode
+# runs a test per ship-component pair, "batched" mode runs a test per chunk
+# that is checked by one bulk query per database
+VERIFICATION_MODES = ('pairs', 'batched')
+VERIFICATION_MODE = 'pairs'
+TEST_CASES_CHUNK_SIZE = 1000
+# number of ships that are checked, all generated ships by default
+TEST_CASES_NUMBER = NUMBER_OF_ROWS_PER_TABLE['Ships']
+
+BENCHMARK_SHIP_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+BENCHMARK_LOOKUPS = 1000
+BENCHMARK_REGRESSION_THRESHOLD = 1.2
+LOAD_DURATION_S = 10
+LOAD_WORKERS = 4
+LOAD_WORKER_MODES = ('threads', 'processes')
+# weights of operations in the mixed load
+LOAD_OPERATIONS_MIX = {
+    'get_ship_parameter': 45,
+    'get_ship_parameter_options': 45,
+    'update_ship': 10,
+}
+LOAD_KEY_DISTRIBUTIONS = ('uniform', 'zipf')
+LOAD_ZIPF_EXPONENT = 1.1
@@ -1,22 +1,184 @@
+import argparse
+
 import pytest
 
 from configs.db_constants_and_configs import (TABLES_CONFIG, DB_NAME,
-                                              NEW_DB_NAME)
-from data_base.db_processing import DBConnector
-from data_base.db_commands import (initialize_db, generate_random_db_data,
-                                   generate_updated_db_data)
+                                              NEW_DB_NAME, USE_IN_MEMORY_DB,
+                                              DB_GENERATION_PROFILE,
+                                              DB_COMPARISON_PROFILE,
+                                              DATASET_SEED, USE_OVERLAY_DUMP,
+                                              VERIFICATION_MODES,
+                                              VERIFICATION_MODE,
+                                              TEST_CASES_CHUNK_SIZE,
+                                              TEST_CASES_NUMBER)
+from data_base.dataset_cache import DatasetCache, build_random_db
+from data_base.db_processing import DBConnector, get_in_memory_db_name
+from data_base.db_commands import generate_updated_db_data
+from data_base.db_diff import compare_databases, compare_overlay
+from data_base.db_overlay import OverlayDBConnector
+from data_base.db_transfer import import_database
+from data_base.query_stats import QueryStats
+from utils.data_generation_utils import (generate_test_cases_chunks,
+                                         get_shard_chunks, iter_test_cases)
+
+ORIGINAL_DB_NAME = (get_in_memory_db_name(DB_NAME) if USE_IN_MEMORY_DB
+                    else DB_NAME)
+DUMPED_DB_NAME = (get_in_memory_db_name(NEW_DB_NAME) if USE_IN_MEMORY_DB
+                  else NEW_DB_NAME)
+QUERY_STATS_KEY = pytest.StashKey[QueryStats]()
+# parameter of the ships configuration test of every verification mode
+VERIFICATION_MODES_PARAMETERS = {
+    'pairs': 'ship_to_check',
+    'batched': 'ships_chunk',
+}
+
+
+def parse_shard(shard: str) -> tuple:
+    """
+    Function provides parsing shard option value
+    :param shard: shard in the following format: i/n, where i is shard
+                  number from [1, n] interval and n is number of shards
+    :return: tuple in the following format: (shard_index, shards_number),
+             shard_index is zero based
+    """
+    try:
+        shard_number, shards_number = map(int, shard.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid shard: {shard}, '
+                                         f'expected i/n format')
+    if not 1 <= shard_number <= shards_number:
+        raise argparse.ArgumentTypeError(f'Invalid shard: {shard}, shard '
+                                         f'number should be from [1, n]')
+    return shard_number - 1, shards_number
+
+
+def pytest_addoption(parser) -> None:
+    """
+    Pytest hook that adds custom command line options
+    """
+    parser.addoption('--query-stats', action='store_true', default=False,
+                     help='collect statistics of executed SQL-queries and '
+                          'show them in terminal summary')
+    parser.addoption('--dataset-seed', type=int, default=DATASET_SEED,
+                     help='seed of the original db data, generated db is '
+                          'cached on disk and reused for the same seed')
+    parser.addoption('--import-snapshot',
+                     help='directory with exported database that is '
+                          'imported as the original db instead of '
+                          'generating data')
+    parser.addoption('--verification-mode', choices=VERIFICATION_MODES,
+                     default=VERIFICATION_MODE,
+                     help='pairs - test per ship-component pair, batched - '
+                          'test per chunk of ships checked by bulk queries')
+    parser.addoption('--cases-chunk-size', type=int,
+                     default=TEST_CASES_CHUNK_SIZE,
+                     help='number of ships in one chunk of test cases')
+    parser.addoption('--cases-number', type=int, default=TEST_CASES_NUMBER,
+                     help='number of ships that are checked')
+    parser.addoption('--shard', type=parse_shard, default=(0, 1),
+                     help='run only i-th of n shards of test cases chunks '
+                          '(i/n format)')
+
+
+def pytest_configure(config) -> None:
+    """
+    Pytest hook that creates queries statistics collector if it's enabled
+    """
+    if config.getoption('query_stats'):
+        config.stash[QUERY_STATS_KEY] = QueryStats()
+
+
+def pytest_generate_tests(metafunc) -> None:
+    """
+    Pytest hook that parametrizes ships configuration test of the current
+    verification mode (test of another mode is deselected, see
+    pytest_collection_modifyitems): test cases are generated lazily by
+    chunks of ships and only chunks of the current shard are used
+    """
+    config = metafunc.config
+    verification_parameter = VERIFICATION_MODES_PARAMETERS[
+        config.getoption('verification_mode')]
+    if verification_parameter not in metafunc.fixturenames:
+        return
+    shard_chunks = get_shard_chunks(
+        generate_test_cases_chunks(
+            config.getoption('cases_chunk_size'),
+            number_of_case_items=config.getoption('cases_number')),
+        *config.getoption('shard'))
+    if verification_parameter == 'ship_to_check':
+        metafunc.parametrize(
+            'ship_to_check, component_to_check',
+            [test_case for ships_chunk in shard_chunks
+             for test_case in iter_test_cases(ships_chunk)])
+    else:
+        ships_chunks = list(shard_chunks)
+        metafunc.parametrize(
+            'ships_chunk', ships_chunks,
+            ids=[f'{ships_chunk[0]}..{ships_chunk[-1]}'
+                 for ships_chunk in ships_chunks])
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    """
+    Pytest hook that deselects ships configuration test of inactive
+    verification mode
+    """
+    verification_mode = config.getoption('verification_mode')
+    inactive_parameters = {
+        parameter for mode, parameter in VERIFICATION_MODES_PARAMETERS.items()
+        if mode != verification_mode}
+    deselected_items = [
+        item for item in items
+        if inactive_parameters & set(getattr(item, 'fixturenames', ()))]
+    if deselected_items:
+        config.hook.pytest_deselected(items=deselected_items)
+        items[:] = [item for item in items if item not in deselected_items]
+
+
+def pytest_terminal_summary(terminalreporter, config) -> None:
+    """
+    Pytest hook that shows collected statistics of SQL-queries
+    """
+    query_stats = config.stash.get(QUERY_STATS_KEY, None)
+    if query_stats is None:
+        return
+    terminalreporter.section('SQL-queries statistics')
+    for report_line in query_stats.format_report():
+        terminalreporter.write_line(report_line)
 
 
 @pytest.fixture(scope='session')
-def dumped_db_connector(db_connector: DBConnector) -> tuple:
+def query_stats(pytestconfig) -> QueryStats:
+    """
+    Pytest fixture that provides queries statistics collector
+    :return: QueryStats object or None if statistics collection is disabled
+    """
+    return pytestconfig.stash.get(QUERY_STATS_KEY, None)
+
+
+@pytest.fixture(scope='session')
+def dumped_db_connector(db_connector: DBConnector,
+                        query_stats: QueryStats) -> tuple:
     """
     Pytest fixture that dumps and replaces data from original db
+    (or stores changed data in overlay over original db if
+    USE_OVERLAY_DUMP is set)
     :param db_connector: connection to original db
+    :param query_stats: queries statistics collector
     :return: connector to dumped db with new data
     """
-    db_connector.dump_db(NEW_DB_NAME)
-    with DBConnector(NEW_DB_NAME) as dumped_db:
+    if USE_OVERLAY_DUMP:
+        with OverlayDBConnector(ORIGINAL_DB_NAME, query_stats=query_stats,
+                                profile=DB_COMPARISON_PROFILE) as overlay_db:
+            generate_updated_db_data(overlay_db)
+            yield overlay_db
+        return
+
+    with DBConnector(DUMPED_DB_NAME, query_stats=query_stats,
+                     profile=DB_GENERATION_PROFILE) as dumped_db:
+        dumped_db.restore(db_connector.conn)
         generate_updated_db_data(dumped_db)
+        dumped_db.apply_profile(DB_COMPARISON_PROFILE)
 
         yield dumped_db
 
@@ -25,20 +187,44 @@ def dumped_db_connector(db_connector: DBConnector) -> tuple:
 
 
 @pytest.fixture(scope='session')
-def db_connector() -> DBConnector:
+def db_connector(pytestconfig, query_stats: QueryStats) -> DBConnector:
     """
     Pytest fixture that creates/destroys db connection and generates data in it
+    (or restores it from the dataset cache if --dataset-seed is set, or
+    imports exported database if --import-snapshot is set)
+    :param query_stats: queries statistics collector
     :return: connector db
     """
-    with DBConnector(DB_NAME) as db:
-        initialize_db(db)
-        generate_random_db_data(db)
+    with DBConnector(ORIGINAL_DB_NAME, query_stats=query_stats,
+                     profile=DB_GENERATION_PROFILE) as db:
+        snapshot_path = pytestconfig.getoption('import_snapshot')
+        if snapshot_path:
+            import_database(db, snapshot_path)
+        else:
+            build_random_db(db, seed=pytestconfig.getoption('dataset_seed'),
+                            dataset_cache=DatasetCache())
+        db.apply_profile(DB_COMPARISON_PROFILE)
         yield db
 
         for table_name in TABLES_CONFIG:
             db.drop_table(table_name)
 
 
+@pytest.fixture(scope='session')
+def databases_diff(db_connector: DBConnector,
+                   dumped_db_connector: DBConnector) -> dict:
+    """
+    Pytest fixture that compares original and dumped databases once
+    per session
+    :param db_connector: connection to original db
+    :param dumped_db_connector: connection to dumped db
+    :return: dict with comparison report (see compare_databases)
+    """
+    if USE_OVERLAY_DUMP:
+        return compare_overlay(dumped_db_connector)
+    return compare_databases(db_connector, dumped_db_connector.db_name)
+
+
 @pytest.hookimpl(trylast=True)
 def pytest_assertrepr_compare(op, left, right) -> list:
     """
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Awaitable, Iterable
+
+from configs.db_constants_and_configs import ASYNC_LOOKUPS_CONCURRENCY
+from data_base.async_db_processing import AsyncDBConnector
+from data_base.db_commands import (get_ship_parameter,
+                                   get_ship_parameter_options)
+
+
+async def get_ship_parameter_async(async_db_connector: AsyncDBConnector,
+                                   ship_id: str, param_name: str) -> str:
+    """
+    Function provides selecting ship parameter data from Ships table
+    without blocking event loop (see get_ship_parameter)
+    :param async_db_connector: async database connector object
+    :param ship_id: concrete id of the ship
+    :param param_name: parameter name that should be selected
+    :return: parameter value
+    """
+    return await async_db_connector.run(get_ship_parameter, ship_id,
+                                        param_name)
+
+
+async def get_ship_parameter_options_async(
+        async_db_connector: AsyncDBConnector, ship_id: str,
+        param_name: str) -> dict:
+    """
+    Function provides selecting ship parameter options data without
+    blocking event loop (see get_ship_parameter_options)
+    :param async_db_connector: async database connector object
+    :param ship_id: concrete id of the ship
+    :param param_name: parameter name that options should be selected
+    :return: dict with option values following next format:
+    {option_name: option_value, ...}
+    """
+    return await async_db_connector.run(get_ship_parameter_options, ship_id,
+                                        param_name)
+
+
+async def gather_with_concurrency(awaitables: Iterable[Awaitable],
+                                  concurrency: int = ASYNC_LOOKUPS_CONCURRENCY
+                                  ) -> list:
+    """
+    Function provides gathering awaitables results with limited number
+    of awaitables running at the same time: fixed number of workers take
+    awaitables from the shared iterator, so awaitables (e.g. coroutines
+    from generator) are created only when they are about to be executed
+    :param awaitables: awaitables that should be executed
+    :param concurrency: max number of awaitables running at the same time
+    :return: list with results in the order of awaitables
+    """
+    results = {}
+    indexed_awaitables = enumerate(awaitables)
+
+    async def run_worker() -> None:
+        for index, awaitable in indexed_awaitables:
+            results[index] = await awaitable
+
+    workers = [asyncio.ensure_future(run_worker())
+               for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for worker in workers:
+            worker.cancel()
+        raise
+    return [results[index] for index in range(len(results))]
+
+
+async def get_ship_component_async(async_db_connector: AsyncDBConnector,
+                                   ship_id: str, component_name: str
+                                   ) -> tuple:
+    """
+    Function provides selecting ship component value and its options
+    :param async_db_connector: async database connector object
+    :param ship_id: concrete id of the ship
+    :param component_name: ship component name
+    :return: tuple in the following format: (component_value, options)
+    """
+    return await asyncio.gather(
+        get_ship_parameter_async(async_db_connector, ship_id,
+                                 component_name),
+        get_ship_parameter_options_async(async_db_connector, ship_id,
+                                         component_name))
+
+
+async def compare_ships_configuration_async(
+        async_db_connector: AsyncDBConnector,
+        async_dumped_db_connector: AsyncDBConnector, test_cases: list,
+        concurrency: int = ASYNC_LOOKUPS_CONCURRENCY) -> dict:
+    """
+    Function provides comparing ship components of original and dumped
+    databases with concurrent lookups in both of them
+    :param async_db_connector: async connector to original database
+    :param async_dumped_db_connector: async connector to dumped database
+    :param test_cases: list of tuples in the following format:
+                       [(ship_id, component_name), ...]
+    :param concurrency: max number of lookups running at the same time
+                        against each database
+    :return: dict with changed ship components in the same format
+             as get_changed_ship_components returns
+    """
+    logging.info(f'Compare {len(test_cases)} ship components asynchronously')
+    expected_components, actual_components = await asyncio.gather(
+        gather_with_concurrency(
+            (get_ship_component_async(async_db_connector, *test_case)
+             for test_case in test_cases), concurrency),
+        gather_with_concurrency(
+            (get_ship_component_async(async_dumped_db_connector, *test_case)
+             for test_case in test_cases), concurrency))
+
+    result = {}
+    for test_case, expected_component, actual_component in zip(
+            test_cases, expected_components, actual_components):
+        if expected_component != actual_component:
+            result[test_case] = {
+                'value': (expected_component[0], actual_component[0]),
+                'options': (expected_component[1], actual_component[1]),
+            }
+    return result
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from configs.db_constants_and_configs import ASYNC_DB_WORKERS
+from data_base.db_processing import DBConnector
+
+logger = logging.getLogger()
+
+
+class AsyncDBWorker:
+    """
+    Class that provides single-thread executor with its own database
+    connector, the connector is created and used only in executor thread
+    """
+    def __init__(self, connector: DBConnector):
+        self.connector = connector
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Method provides running function with worker connector as the first
+        argument in the worker thread
+        :param func: function that should be executed
+        :return: function result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(func, self.connector, *args, **kwargs))
+
+
+class AsyncDBConnector:
+    """
+    Class that provides asyncio interface for interaction with sqlite
+    database: all DBConnector methods are available as coroutines and are
+    executed by a pool of workers, each of them has its own connection
+    """
+    def __init__(self, db_name: str, workers: int = ASYNC_DB_WORKERS,
+                 **connector_kwargs):
+        self.db_name = db_name
+        self.workers_number = workers
+        self.connector_kwargs = connector_kwargs
+        self.__workers = []
+        self.__free_workers = None
+
+    async def __aenter__(self):
+        await self.create_connection()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.destroy_connection()
+
+    def __getattr__(self, name: str) -> Callable:
+        """
+        Method provides coroutine wrappers for public DBConnector methods
+        :param name: name of DBConnector method
+        :return: coroutine function with the same arguments
+        """
+        if name.startswith('_') or not callable(getattr(DBConnector, name,
+                                                        None)):
+            raise AttributeError(f'{type(self).__name__} object has no '
+                                 f'attribute {name}')
+
+        async def run_connector_method(*args, **kwargs) -> Any:
+            return await self.run(
+                lambda connector: getattr(connector, name)(*args, **kwargs))
+
+        run_connector_method.__name__ = name
+        return run_connector_method
+
+    async def create_connection(self) -> None:
+        """
+        Method provides creating workers with their own connections,
+        all worker connectors share table versions, so changes made by
+        one worker invalidate cached data of the others
+        """
+        logger.debug(f'Create {self.workers_number} async workers for '
+                     f'{self.db_name}')
+        self.__free_workers = asyncio.Queue()
+        tables_versions = {}
+        for _ in range(self.workers_number):
+            worker = AsyncDBWorker(DBConnector(self.db_name,
+                                               **self.connector_kwargs))
+            await worker.run(DBConnector.__enter__)
+            worker.connector.tables_versions = tables_versions
+            self.__workers.append(worker)
+            self.__free_workers.put_nowait(worker)
+
+    async def destroy_connection(self) -> None:
+        """
+        Method provides closing connections and executors of all workers
+        """
+        logger.debug(f'Destroy async workers for {self.db_name}')
+        for worker in self.__workers:
+            await worker.run(DBConnector.destroy_connection)
+            worker.executor.shutdown()
+        self.__workers = []
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Method provides running function on the first free worker, the
+        function gets worker connector as the first argument, e.g.
+        await async_db.run(get_ship_parameter, 'ship-0', 'hull')
+        :param func: function that should be executed
+        :return: function result
+        """
+        worker = await self.__free_workers.get()
+        try:
+            return await worker.run(func, *args, **kwargs)
+        finally:
+            self.__free_workers.put_nowait(worker)
@@ -0,0 +1,234 @@
+import logging
+import threading
+import weakref
+from typing import Optional
+
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              COMPACT_PRIMARY_KEY_TYPE,
+                                              COMPACT_FOREIGN_KEY_TYPE,
+                                              TABLE_PRIMARY_KEY_QUERY)
+from data_base.db_processing import DBConnector
+from utils.db_config_utils import (get_table_columns, get_primary_key,
+                                   get_foreign_keys)
+
+SHIPS_TABLE = 'Ships'
+ITEM_ID_SEPARATOR = '-'
+
+
+def get_compact_table_config(table_name: str) -> dict:
+    """
+    Function returns table configuration of the compact schema: primary
+    key becomes INTEGER PRIMARY KEY (alias of rowid) and foreign keys
+    become INTEGER columns, other columns stay the same
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: dict with table fields configuration
+    """
+    foreign_keys_columns = {column_name for column_name, _, _
+                            in get_foreign_keys(table_name)}
+    table_config = dict(TABLES_CONFIG[table_name])
+    table_config[get_primary_key(table_name)] = COMPACT_PRIMARY_KEY_TYPE
+    for column_name in foreign_keys_columns:
+        table_config[column_name] = COMPACT_FOREIGN_KEY_TYPE
+    return table_config
+
+
+def get_key_columns(table_name: str) -> dict:
+    """
+    Function returns columns that store item ids: primary key and
+    foreign keys of the table
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: dict in the following format: {column_name: item_name, ...}
+    """
+    primary_key = get_primary_key(table_name)
+    key_columns = {primary_key: primary_key}
+    key_columns.update((column_name, referenced_column)
+                       for column_name, _, referenced_column
+                       in get_foreign_keys(table_name))
+    return key_columns
+
+
+def encode_item(item_id: Optional[str]) -> Optional[int]:
+    """
+    Function returns integer id of the item, e.g. 'ship-12' -> 12
+    :param item_id: string id of the item
+    :return: integer id
+    """
+    if item_id is None:
+        return item_id
+    return int(item_id.strip("'").rsplit(ITEM_ID_SEPARATOR, 1)[1])
+
+
+def decode_item(item_name: str, item_id: Optional[int]) -> Optional[str]:
+    """
+    Function returns string id of the item, e.g. ('ship', 12) -> 'ship-12'
+    :param item_name: name of the item (primary key column name)
+    :param item_id: integer id of the item
+    :return: string id
+    """
+    if item_id is None:
+        return item_id
+    return f'{item_name}{ITEM_ID_SEPARATOR}{item_id}'
+
+
+class ItemKeysCodec:
+    """
+    Class that provides mapping between string item ids used by the code
+    and ids stored in database. Regular schema stores string ids, so
+    values are returned as is (see CompactItemKeysCodec)
+    """
+    compact = False
+
+    def encode(self, item_id: Optional[str]) -> Optional[str]:
+        return item_id
+
+    def decode(self, item_name: str, item_id: Optional[str]
+               ) -> Optional[str]:
+        return item_id
+
+    def encode_row(self, table_name: str, row: tuple) -> tuple:
+        return row
+
+    def decode_row(self, table_name: str, row: tuple) -> tuple:
+        return row
+
+    def encode_update(self, table_name: str, update_row: tuple) -> tuple:
+        return update_row
+
+    def decode_configuration_row(self, row: tuple) -> tuple:
+        return row
+
+
+class CompactItemKeysCodec(ItemKeysCodec):
+    """
+    Class that provides mapping between string item ids and integer ids
+    stored in compact schema
+    """
+    compact = True
+
+    def __init__(self):
+        self.__rows_keys = {}
+
+    def __get_row_keys(self, table_name: str) -> tuple:
+        """
+        Method returns positions and item names of key columns in the row
+        with all table columns
+        :param table_name: name of the table from TABLES_CONFIG
+        :return: tuple in the following format: ((index, item_name), ...)
+        """
+        if table_name not in self.__rows_keys:
+            key_columns = get_key_columns(table_name)
+            self.__rows_keys[table_name] = tuple(
+                (col_index, key_columns[col_name])
+                for col_index, col_name
+                in enumerate(get_table_columns(table_name))
+                if col_name in key_columns)
+        return self.__rows_keys[table_name]
+
+    def encode(self, item_id: Optional[str]) -> Optional[int]:
+        return encode_item(item_id)
+
+    def decode(self, item_name: str, item_id: Optional[int]
+               ) -> Optional[str]:
+        return decode_item(item_name, item_id)
+
+    def encode_row(self, table_name: str, row: tuple) -> tuple:
+        """
+        Method returns row with encoded item ids
+        :param table_name: name of the table from TABLES_CONFIG
+        :param row: tuple with all table columns values
+        :return: tuple with the same values and integer item ids
+        """
+        row = list(row)
+        for col_index, _ in self.__get_row_keys(table_name):
+            row[col_index] = encode_item(row[col_index])
+        return tuple(row)
+
+    def decode_row(self, table_name: str, row: tuple) -> tuple:
+        """
+        Method returns row with decoded item ids
+        :param table_name: name of the table from TABLES_CONFIG
+        :param row: tuple with all table columns values
+        :return: tuple with the same values and string item ids
+        """
+        row = list(row)
+        for col_index, item_name in self.__get_row_keys(table_name):
+            row[col_index] = decode_item(item_name, row[col_index])
+        return tuple(row)
+
+    def encode_update(self, table_name: str, update_row: tuple) -> tuple:
+        """
+        Method returns update data with encoded item ids
+        :param table_name: name of the table from TABLES_CONFIG
+        :param update_row: tuple in the following format:
+        (condition_column, condition_value, column, value)
+        :return: tuple in the same format
+        """
+        key_columns = get_key_columns(table_name)
+        condition_column, condition_value, column, value = update_row
+        if condition_column in key_columns:
+            condition_value = encode_item(condition_value)
+        if column in key_columns:
+            value = encode_item(value)
+        return condition_column, condition_value, column, value
+
+    def decode_configuration_row(self, row: tuple) -> tuple:
+        """
+        Method returns row of build_ship_configurations_query output
+        with decoded ship and components ids
+        :param row: tuple with ship configuration data
+        :return: tuple in the same format
+        """
+        ship_key = get_primary_key(SHIPS_TABLE)
+        foreign_keys = get_foreign_keys(SHIPS_TABLE)
+        decoded_ids = [decode_item(ship_key, row[0])]
+        decoded_ids.extend(
+            decode_item(component_key, component_id)
+            for (_, _, component_key), component_id
+            in zip(foreign_keys, row[1:len(foreign_keys) + 1]))
+        return tuple(decoded_ids) + tuple(row[len(foreign_keys) + 1:])
+
+
+ITEM_KEYS_CODEC = ItemKeysCodec()
+COMPACT_ITEM_KEYS_CODEC = CompactItemKeysCodec()
+
+_connectors_schemas = weakref.WeakKeyDictionary()
+_connectors_schemas_lock = threading.Lock()
+
+
+def is_compact_schema(db_connector: DBConnector,
+                      alias: str = 'main') -> bool:
+    """
+    Function checks whether database was initialized with compact schema,
+    the result is cached until Ships table is changed
+    :param db_connector: database connector object
+    :param alias: schema name of the database
+    :return: True - if Ships table has integer primary key
+    """
+    ships_version = db_connector.get_table_version(SHIPS_TABLE)
+    with _connectors_schemas_lock:
+        schemas = _connectors_schemas.setdefault(db_connector, {})
+        cached_schema = schemas.get(alias)
+    if cached_schema is not None and cached_schema[0] == ships_version:
+        return cached_schema[1]
+
+    primary_key_type = db_connector.select_with_query(
+        TABLE_PRIMARY_KEY_QUERY, (SHIPS_TABLE, alias))
+    compact = (bool(primary_key_type) and
+               primary_key_type[0][0].upper() == 'INTEGER')
+    logging.debug(f'{alias} schema of {db_connector} is '
+                  f'{"compact" if compact else "regular"}')
+    with _connectors_schemas_lock:
+        schemas[alias] = (ships_version, compact)
+    return compact
+
+
+def get_item_keys_codec(db_connector: DBConnector,
+                        alias: str = 'main') -> ItemKeysCodec:
+    """
+    Function returns item ids codec according to the database schema
+    :param db_connector: database connector object
+    :param alias: schema name of the database
+    :return: codec object (see ItemKeysCodec)
+    """
+    return (COMPACT_ITEM_KEYS_CODEC if is_compact_schema(db_connector, alias)
+            else ITEM_KEYS_CODEC)
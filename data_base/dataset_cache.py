@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from typing import Optional
+
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              EXTRA_INDEXES_CONFIG,
+                                              NUMBER_OF_ROWS_PER_TABLE,
+                                              INTEGER_RANGE,
+                                              GENERATION_BACKEND,
+                                              GENERATION_SHARD_SIZE,
+                                              BACKUP_PAGES_PER_STEP,
+                                              DATASET_CACHE_DIR,
+                                              DATASET_CACHE_MAX_SIZE,
+                                              DATASET_GENERATOR_VERSION,
+                                              USE_COMPACT_SCHEMA,
+                                              COMPACT_WITHOUT_ROWID,
+                                              USE_SHIP_CONFIGURATIONS_TABLE)
+from data_base.db_commands import (initialize_db, initialize_db_indexes,
+                                   generate_random_db_data)
+from data_base.db_processing import DBConnector, log_backup_progress
+from data_base.materialized_configurations import enable_ship_configurations
+
+DATASET_FILE_SUFFIX = '.db'
+
+
+def get_dataset_fingerprint(seed: int, backend: str = GENERATION_BACKEND,
+                            rows_per_table: Optional[dict] = None,
+                            workers: Optional[int] = None) -> str:
+    """
+    Function provides fingerprint of all settings that generated dataset
+    depends on
+    :param seed: seed of data generation
+    :param backend: generation backend name ('python' or 'numpy')
+    :param rows_per_table: dict with number of rows for each table,
+                           NUMBER_OF_ROWS_PER_TABLE is used by default
+    :param workers: number of worker processes for sharded generation,
+                    only sharded or not generation matters
+    :return: hex digest of the settings
+    """
+    settings = {
+        'tables_config': TABLES_CONFIG,
+        'extra_indexes_config': EXTRA_INDEXES_CONFIG,
+        'rows_per_table': rows_per_table or NUMBER_OF_ROWS_PER_TABLE,
+        'integer_range': INTEGER_RANGE,
+        'seed': seed,
+        'backend': backend,
+        'shard_size': GENERATION_SHARD_SIZE if workers is not None else None,
+        'generator_version': DATASET_GENERATOR_VERSION,
+        'compact_schema': USE_COMPACT_SCHEMA,
+        'without_rowid': USE_COMPACT_SCHEMA and COMPACT_WITHOUT_ROWID,
+        'ship_configurations_table': USE_SHIP_CONFIGURATIONS_TABLE,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()
+                          ).hexdigest()
+
+
+class DatasetCache:
+    """
+    Class that provides on-disk cache of generated databases keyed by
+    settings fingerprint, least recently used entries are evicted when
+    cache size exceeds max_size
+    """
+    def __init__(self, cache_dir: str = DATASET_CACHE_DIR,
+                 max_size: int = DATASET_CACHE_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def get_path(self, fingerprint: str) -> str:
+        """
+        Method returns path of the cached database file
+        :param fingerprint: settings fingerprint of the dataset
+        :return: path of the database file
+        """
+        return os.path.join(self.cache_dir,
+                            f'{fingerprint}{DATASET_FILE_SUFFIX}')
+
+    def get_entries(self) -> list:
+        """
+        Method returns cached database files from the least recently used
+        :return: list of tuples in the following format:
+        [(path, size, last_used_time), ...]
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(DATASET_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, file_name)
+            file_stat = os.stat(path)
+            entries.append((path, file_stat.st_size, file_stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def load(self, db_connector: DBConnector, fingerprint: str,
+             pages: int = BACKUP_PAGES_PER_STEP) -> bool:
+        """
+        Method provides restoring database from the cache
+        :param db_connector: connector to database that should be restored
+        :param fingerprint: settings fingerprint of the dataset
+        :param pages: number of pages copied per backup step
+        :return: True - if dataset was found in the cache and restored
+        """
+        path = self.get_path(fingerprint)
+        if not os.path.exists(path):
+            logging.info(f'Dataset {fingerprint} is not found in the cache')
+            return False
+
+        logging.info(f'Restore {db_connector.db_name} from cached {path}')
+        with closing(sqlite3.connect(f'file:{path}?mode=ro',
+                                     uri=True)) as cached_conn:
+            db_connector.restore(cached_conn, pages)
+        os.utime(path)
+        return True
+
+    def store(self, db_connector: DBConnector, fingerprint: str,
+              pages: int = BACKUP_PAGES_PER_STEP) -> None:
+        """
+        Method provides storing database into the cache and evicting
+        old entries, the file appears in the cache only when it's complete
+        :param db_connector: connector to database that should be stored
+        :param fingerprint: settings fingerprint of the dataset
+        :param pages: number of pages copied per backup step
+        """
+        path = self.get_path(fingerprint)
+        tmp_path = f'{path}.tmp'
+        logging.info(f'Store {db_connector.db_name} into cached {path}')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with closing(sqlite3.connect(tmp_path)) as cache_conn:
+                db_connector.conn.backup(cache_conn, pages=pages,
+                                         progress=log_backup_progress)
+            os.replace(tmp_path, path)
+        except (sqlite3.Error, OSError) as error:
+            logging.warning(f'Dataset {fingerprint} is not cached: {error}')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[str] = None) -> list:
+        """
+        Method provides removing least recently used entries until cache
+        size doesn't exceed max_size
+        :param keep: path of the entry that shouldn't be removed
+        :return: list of removed paths
+        """
+        entries = self.get_entries()
+        cache_size = sum(size for _, size, _ in entries)
+        removed_paths = []
+        for path, size, _ in entries:
+            if cache_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            logging.info(f'Evict cached dataset {path}')
+            os.remove(path)
+            cache_size -= size
+            removed_paths.append(path)
+        return removed_paths
+
+
+def build_random_db(db_connector: DBConnector, seed: Optional[int] = None,
+                    backend: str = GENERATION_BACKEND,
+                    rows_per_table: Optional[dict] = None,
+                    dataset_cache: Optional[DatasetCache] = None,
+                    workers: Optional[int] = None) -> bool:
+    """
+    Function provides creating tables, generating data and indexes
+    (and materialized ship configurations if they are used) or restoring
+    the same database from the dataset cache
+    Note: dataset cache is used only with seed, otherwise generated data
+    isn't reproducible
+    :param db_connector: database connector object
+    :param seed: seed of data generation
+    :param backend: generation backend name ('python' or 'numpy')
+    :param rows_per_table: dict with number of rows for each table,
+                           NUMBER_OF_ROWS_PER_TABLE is used by default
+    :param dataset_cache: dataset cache object, None - don't use cache
+    :param workers: number of worker processes for sharded generation
+    :return: True - if database was restored from the cache
+    """
+    use_cache = dataset_cache is not None and seed is not None
+    fingerprint = (get_dataset_fingerprint(seed, backend, rows_per_table,
+                                           workers)
+                   if use_cache else None)
+    if use_cache and dataset_cache.load(db_connector, fingerprint):
+        return True
+
+    initialize_db(db_connector)
+    generate_random_db_data(db_connector, backend, seed, rows_per_table,
+                            workers)
+    initialize_db_indexes(db_connector)
+    if USE_SHIP_CONFIGURATIONS_TABLE:
+        enable_ship_configurations(db_connector)
+    if use_cache:
+        dataset_cache.store(db_connector, fingerprint)
+    return False
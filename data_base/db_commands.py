@@ -1,61 +1,182 @@
 import logging
+import random
+import re
+from itertools import chain
+from typing import Optional
 
-from configs.db_constants_and_configs import TABLES_CONFIG, ITEM_TABLE_MATCHER
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              ITEM_TABLE_MATCHER,
+                                              GENERATION_BACKEND,
+                                              FETCH_CHUNK_SIZE,
+                                              USE_COMPACT_SCHEMA,
+                                              COMPACT_WITHOUT_ROWID,
+                                              SHIP_CONFIGURATIONS_TABLE,
+                                              BULK_TRANSACTION_MODE,
+                                              BULK_COMMIT_EVERY)
+from data_base.compact_schema import (get_compact_table_config,
+                                      get_item_keys_codec)
 from data_base.db_processing import DBConnector
+from data_base.lookup_cache import get_lookup_cache, MISSING
+from data_base.materialized_configurations import (
+    get_configuration_options_columns)
+from data_base.ship_configurations import (ShipConfigurations,
+                                           build_ship_configurations_query)
 from data_generators.items_generator import ItemsGenerator
+from data_generators.sharded_generator import (generate_sharded_rows,
+                                               get_generation_executor,
+                                               get_shard_seed)
+from utils.db_config_utils import get_table_indexes, get_table_columns
 
+USED_INDEX_PATTERN = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
 
-def initialize_db(db_connector: DBConnector) -> None:
+
+def initialize_db(db_connector: DBConnector,
+                  compact: bool = USE_COMPACT_SCHEMA,
+                  without_rowid: bool = COMPACT_WITHOUT_ROWID) -> None:
     """
-    Function provides database initialization (creating tables)
+    Function provides database initialization (creating tables in one
+    transaction)
+    Note: indexes aren't created here, they should be built by
+    initialize_db_indexes function after bulk data insertion
     :param db_connector: database connector object
+    :param compact: True - create compact schema with integer item ids
+                    (see get_compact_table_config)
+    :param without_rowid: True - create compact tables WITHOUT ROWID
     """
-    logging.info(f'Initialize {db_connector.db_name} database')
-    for table_name, columns in TABLES_CONFIG.items():
-        db_connector.add_table(table_name, columns)
+    logging.info(f'Initialize {db_connector.db_name} database'
+                 f'{" with compact schema" if compact else ""}')
+    with db_connector.transaction():
+        for table_name, columns in TABLES_CONFIG.items():
+            if compact:
+                db_connector.add_table(table_name,
+                                       get_compact_table_config(table_name),
+                                       without_rowid)
+            else:
+                db_connector.add_table(table_name, columns)
 
 
-def generate_random_db_data(db_connector: DBConnector) -> None:
+def initialize_db_indexes(db_connector: DBConnector) -> None:
     """
-    Function provides database data generation and insertion
+    Function provides creating indexes for foreign keys and extra indexes
+    described in db config
     :param db_connector: database connector object
     """
-    logging.info('Start generating data')
+    logging.info(f'Create indexes in {db_connector.db_name} database')
     for table_name in TABLES_CONFIG:
-        item_generator = ItemsGenerator(table_name)
-        raw_generated_data = item_generator.generate_data()
-        cleared_data = item_generator.parse_data_for_insert_query(
-            raw_generated_data)
-        db_connector.insert_data(table_name, item_generator.columns,
-                                 cleared_data)
+        for index_columns in get_table_indexes(table_name):
+            db_connector.add_index(table_name, index_columns)
 
 
-def generate_updated_db_data(db_connector: DBConnector) -> None:
+def generate_random_db_data(db_connector: DBConnector,
+                            backend: str = GENERATION_BACKEND,
+                            seed: Optional[int] = None,
+                            rows_per_table: Optional[dict] = None,
+                            workers: Optional[int] = None,
+                            commit_every: Optional[int] = BULK_COMMIT_EVERY
+                            ) -> None:
     """
-    Function provides new database data generation and updating
+    Function provides database data generation and insertion,
+    rows are generated by chunks and inserted as soon as they are ready,
+    all tables are filled in one IMMEDIATE transaction
     :param db_connector: database connector object
+    :param backend: generation backend name ('python' or 'numpy')
+    :param seed: master seed of random generators, seeds of all tables
+                 (and of all shards in sharded mode) are derived from it
+    :param rows_per_table: dict with number of rows for each table,
+                           NUMBER_OF_ROWS_PER_TABLE is used by default
+    :param workers: number of worker processes for sharded generation,
+                    None - generate rows serially without shards
+    :param commit_every: commit after every N insert batches,
+                         None - commit once after all tables are filled
+    Note: sharded generation result depends only on seed and shard size,
+    so it is the same for any number of workers. Serial generation
+    (workers=None) consumes random streams by generation chunks instead of
+    shards, so with the same seed it gives other data than sharded one
+    """
+    keys_codec = get_item_keys_codec(db_connector)
+    if workers is None:
+        logging.info(f'Start generating data with {backend} backend')
+        with db_connector.transaction(BULK_TRANSACTION_MODE, commit_every):
+            for table_name in TABLES_CONFIG:
+                table_seed = (get_shard_seed(seed, table_name, 0)
+                              if seed is not None else None)
+                item_generator = ItemsGenerator(table_name, backend,
+                                                table_seed, rows_per_table)
+                generated_rows = (
+                    keys_codec.encode_row(table_name, row) for row
+                    in chain.from_iterable(item_generator.generate_rows()))
+                db_connector.insert_data(table_name, item_generator.columns,
+                                         generated_rows)
+        return
+
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    logging.info(f'Start sharded generating data with {backend} backend, '
+                 f'{workers} workers and {seed} master seed')
+    executor = get_generation_executor(workers)
+    try:
+        with db_connector.transaction(BULK_TRANSACTION_MODE, commit_every):
+            for table_name in TABLES_CONFIG:
+                generated_rows = (
+                    keys_codec.encode_row(table_name, row) for row
+                    in chain.from_iterable(generate_sharded_rows(
+                        table_name, seed, executor, backend, rows_per_table,
+                        max_pending_shards=2 * workers)))
+                db_connector.insert_data(table_name,
+                                         ItemsGenerator(table_name).columns,
+                                         generated_rows)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def generate_updated_db_data(db_connector: DBConnector,
+                             rows_per_table: Optional[dict] = None) -> None:
+    """
+    Function provides new database data generation and updating,
+    all tables are updated in one IMMEDIATE transaction
+    :param db_connector: database connector object
+    :param rows_per_table: dict with number of rows for each table,
+                           NUMBER_OF_ROWS_PER_TABLE is used by default
     """
     logging.info('Start generating updated data')
-    for table_name in TABLES_CONFIG:
-        item_generator = ItemsGenerator(table_name)
-        raw_updated_data = item_generator.generate_updated_data()
-        cleared_data = item_generator.parse_data_for_update_query(
-            raw_updated_data)
-        db_connector.update_multiple_data(table_name, cleared_data)
+    keys_codec = get_item_keys_codec(db_connector)
+    with db_connector.transaction(BULK_TRANSACTION_MODE):
+        for table_name in TABLES_CONFIG:
+            item_generator = ItemsGenerator(table_name,
+                                            rows_per_table=rows_per_table)
+            raw_updated_data = item_generator.generate_updated_data()
+            cleared_data = [
+                keys_codec.encode_update(table_name, update_row)
+                for update_row
+                in item_generator.parse_data_for_update_query(
+                    raw_updated_data)]
+            db_connector.update_multiple_data(table_name, cleared_data)
 
 
 def get_ship_parameter(db_connector: DBConnector, ship_id: str,
                        param_name: str) -> str:
     """
-    Function provides selecting ship parameter data from Ships table
+    Function provides selecting ship parameter data from Ships table,
+    selected values are cached until Ships table is changed.
+    Item ids are mapped to integer ones in compact schema
     :param db_connector: database connector object
     :param ship_id: concrete id of the ship
     :param param_name: parameter name that should be selected
     :return: parameter value
     """
     logging.info(f'Get {param_name} value for {ship_id} from {db_connector}')
-    ship_parameter = db_connector.select_with_condition(
-        'Ships', [param_name], f'ship = "{ship_id}"')[0][0]
+    lookup_cache = get_lookup_cache(db_connector)
+    cache_key = ('Ships', ship_id, param_name)
+    ships_version = db_connector.get_table_version('Ships')
+    ship_parameter = lookup_cache.get(cache_key, ships_version)
+    if ship_parameter is MISSING:
+        keys_codec = get_item_keys_codec(db_connector)
+        ship_parameter = keys_codec.decode(
+            param_name, db_connector.select_with_condition(
+                'Ships', [param_name],
+                [('ship', '=', keys_codec.encode(ship_id))])[0][0])
+        lookup_cache.put(cache_key, ships_version, ship_parameter)
     return ship_parameter.strip("'")
 
 
@@ -63,7 +184,11 @@ def get_ship_parameter_options(db_connector: DBConnector, ship_id: str,
                                param_name: str) -> dict:
     """
     Function provides selecting ship parameter options data by
-    joining data from Ships and parameter tables
+    joining data from Ships and parameter tables. Ship parameter values
+    and parameter options are cached until corresponding table is changed.
+    Materialized ship configurations are read by ship primary key instead
+    of joining if they are enabled. Item ids are mapped to integer ones in
+    compact schema
     :param db_connector: database connector object
     :param ship_id: concrete id of the ship
     :param param_name: parameter name that options should be selected
@@ -72,14 +197,116 @@ def get_ship_parameter_options(db_connector: DBConnector, ship_id: str,
     """
     logging.info(f'Get options for {param_name} for {ship_id} from '
                  f'{db_connector}')
-    result_data = {}
     table_to_select = ITEM_TABLE_MATCHER[param_name]
-    parameter_options = list(TABLES_CONFIG[table_to_select].keys())[1:]
-    ship_parameter_options = db_connector.select_with_join_and_condition(
-        table_to_select, parameter_options,
-        'Ships', param_name, f'Ships.ship = "{ship_id}"')[0]
-
-    for option_name, option_value in zip(parameter_options,
-                                         ship_parameter_options):
-        result_data[option_name] = option_value
-    return result_data
+    parameter_options = get_table_columns(table_to_select)[1:]
+    lookup_cache = get_lookup_cache(db_connector)
+    ships_version, options_version = db_connector.get_tables_versions(
+        ('Ships', table_to_select))
+
+    ship_parameter_key = ('Ships', ship_id, param_name)
+    ship_parameter = lookup_cache.get(ship_parameter_key, ships_version)
+    options_data = (
+        lookup_cache.get((table_to_select, ship_parameter), options_version)
+        if ship_parameter is not MISSING else MISSING)
+
+    if options_data is MISSING:
+        keys_codec = get_item_keys_codec(db_connector)
+        if db_connector.has_table(SHIP_CONFIGURATIONS_TABLE):
+            selected_data = db_connector.select_with_condition(
+                SHIP_CONFIGURATIONS_TABLE,
+                [param_name, *get_configuration_options_columns(param_name)],
+                [('ship', '=', keys_codec.encode(ship_id))])[0]
+        else:
+            selected_data = db_connector.select_with_join_and_condition(
+                table_to_select,
+                [f'{table_to_select}.{param_name}', *parameter_options],
+                'Ships', param_name,
+                [('Ships.ship', '=', keys_codec.encode(ship_id))])[0]
+        ship_parameter = keys_codec.decode(param_name, selected_data[0])
+        options_data = selected_data[1:]
+        lookup_cache.put(ship_parameter_key, ships_version, ship_parameter)
+        lookup_cache.put((table_to_select, ship_parameter), options_version,
+                         options_data)
+
+    return dict(zip(parameter_options, options_data))
+
+
+def load_ship_configurations(db_connector: DBConnector,
+                             chunk_size: int = FETCH_CHUNK_SIZE,
+                             ship_ids: Optional[list] = None
+                             ) -> ShipConfigurations:
+    """
+    Function provides loading configurations of all ships (or only
+    of the given ones) with a single query that joins Ships and all
+    component tables
+    :param db_connector: database connector object
+    :param chunk_size: number of rows fetched from database at once
+    :param ship_ids: list of ship ids that should be loaded,
+                     None - load all ships
+    :return: ShipConfigurations object indexed by ship id
+    """
+    logging.info(f'Load {len(ship_ids) if ship_ids is not None else "all"} '
+                 f'ship configurations from {db_connector}')
+    ship_configurations = ShipConfigurations()
+    keys_codec = get_item_keys_codec(db_connector)
+    condition, query_data = None, None
+    if ship_ids is not None:
+        condition = f'Ships.ship IN ({", ".join("?" * len(ship_ids))})'
+        query_data = [keys_codec.encode(ship_id) for ship_id in ship_ids]
+    for rows_chunk in db_connector.select_in_chunks(
+            build_ship_configurations_query(condition), query_data,
+            chunk_size=chunk_size):
+        for row in rows_chunk:
+            ship_configurations.add_row(
+                keys_codec.decode_configuration_row(row))
+    return ship_configurations
+
+
+def get_lookup_cache_stats(db_connector: DBConnector) -> dict:
+    """
+    Function returns statistics of ship parameters lookup cache
+    :param db_connector: database connector object
+    :return: dict with cache statistics (see LookupCache.get_stats)
+    """
+    return get_lookup_cache(db_connector).get_stats()
+
+
+def explain_ship_parameter_options(db_connector: DBConnector,
+                                   param_name: str,
+                                   condition_column: str = 'Ships.ship'
+                                   ) -> list:
+    """
+    Function provides query plan of the JOIN that is used for selecting
+    ship parameter options
+    :param db_connector: database connector object
+    :param param_name: parameter name that options should be selected
+    :param condition_column: column that is used in the condition, e.g.
+                             'Ships.ship' for lookup by ship or
+                             'weapons.weapon' for reverse lookup
+    :return: list with query plan steps details
+    """
+    table_to_select = ITEM_TABLE_MATCHER[param_name]
+    parameter_options = get_table_columns(table_to_select)[1:]
+    return db_connector.explain_select_with_join_and_condition(
+        table_to_select, parameter_options, 'Ships', param_name,
+        [(condition_column, '=', None)])
+
+
+def get_full_scans(query_plan: list) -> list:
+    """
+    Function returns query plan steps that scan whole table or index
+    :param query_plan: list with query plan steps details
+    :return: list with query plan steps that aren't index searches
+    """
+    return [plan_step for plan_step in query_plan
+            if plan_step.startswith('SCAN')]
+
+
+def get_used_indexes(query_plan: list) -> set:
+    """
+    Function returns names of indexes that are used in query plan
+    :param query_plan: list with query plan steps details
+    :return: set with index names
+    """
+    return {index_name for plan_step in query_plan
+            for index_name in USED_INDEX_PATTERN.findall(plan_step)}
@@ -0,0 +1,218 @@
+import logging
+from typing import Optional
+
+from configs.db_constants_and_configs import TABLES_CONFIG, DUMPED_DB_ALIAS
+from data_base.compact_schema import get_item_keys_codec
+from data_base.db_processing import DBConnector
+from utils.db_config_utils import (get_table_columns, get_primary_key,
+                                   get_foreign_keys)
+
+SHIPS_TABLE = 'Ships'
+OVERLAY_VIEWS_ALIAS = 'temp'
+
+
+def _strip_quotes(value: Optional[str]) -> Optional[str]:
+    """Function returns item value without surrounding quotes"""
+    return value.strip("'") if value is not None else value
+
+
+def build_changed_rows_query(table_name: str, original_alias: str,
+                             dumped_alias: str) -> str:
+    """
+    Function provides building query that selects every row that was
+    changed, removed or added in dumped database
+    :param table_name: name of the table that should be compared
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: SQL-query, each output row has the following format:
+    (original_col_0, ..., original_col_n, dumped_col_0, ..., dumped_col_n)
+    """
+    columns = get_table_columns(table_name)
+    primary_key = get_primary_key(table_name)
+    original_columns = ', '.join(f'o.{col}' for col in columns)
+    dumped_columns = ', '.join(f'd.{col}' for col in columns)
+    empty_columns = ', '.join(['NULL'] * len(columns))
+    changed_condition = ' OR '.join(f'o.{col} IS NOT d.{col}'
+                                    for col in columns[1:]) or '0'
+
+    return (f'SELECT {original_columns}, {dumped_columns} '
+            f'FROM {original_alias}.{table_name} AS o '
+            f'LEFT JOIN {dumped_alias}.{table_name} AS d '
+            f'ON o.{primary_key} = d.{primary_key} '
+            f'WHERE d.{primary_key} IS NULL OR {changed_condition} '
+            f'UNION ALL '
+            f'SELECT {empty_columns}, {dumped_columns} '
+            f'FROM {dumped_alias}.{table_name} AS d '
+            f'WHERE d.{primary_key} IN ('
+            f'SELECT {primary_key} FROM {dumped_alias}.{table_name} '
+            f'EXCEPT SELECT {primary_key} '
+            f'FROM {original_alias}.{table_name});')
+
+
+def build_changed_components_query(component_name: str, component_table: str,
+                                   original_alias: str,
+                                   dumped_alias: str) -> str:
+    """
+    Function provides building query that selects ships which component
+    value or component options differ in dumped database
+    :param component_name: ship component name (column of Ships table)
+    :param component_table: table name with component options
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: SQL-query, each output row has the following format:
+    (ship, original_value, dumped_value, original_option_0, ...,
+     original_option_n, dumped_option_0, ..., dumped_option_n)
+    """
+    ship_key = get_primary_key(SHIPS_TABLE)
+    component_key = get_primary_key(component_table)
+    options = get_table_columns(component_table)[1:]
+    original_options = ', '.join(f'oc.{option}' for option in options)
+    dumped_options = ', '.join(f'dc.{option}' for option in options)
+    changed_condition = ' '.join(f'OR oc.{option} IS NOT dc.{option}'
+                                 for option in options)
+
+    return (f'SELECT o.{ship_key}, o.{component_name}, d.{component_name}, '
+            f'{original_options}, {dumped_options} '
+            f'FROM {original_alias}.{SHIPS_TABLE} AS o '
+            f'JOIN {dumped_alias}.{SHIPS_TABLE} AS d '
+            f'ON o.{ship_key} = d.{ship_key} '
+            f'LEFT JOIN {original_alias}.{component_table} AS oc '
+            f'ON o.{component_name} = oc.{component_key} '
+            f'LEFT JOIN {dumped_alias}.{component_table} AS dc '
+            f'ON d.{component_name} = dc.{component_key} '
+            f'WHERE o.{component_name} IS NOT d.{component_name} '
+            f'{changed_condition};')
+
+
+def get_changed_rows(db_connector: DBConnector, table_name: str,
+                     original_alias: str = 'main',
+                     dumped_alias: str = DUMPED_DB_ALIAS) -> dict:
+    """
+    Function provides finding all changed rows of the table
+    :param db_connector: database connector object with attached dumped db
+    :param table_name: name of the table that should be compared
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: dict with changed columns following next format:
+    {primary_key: {column_name: (expected_value, actual_value), ...}, ...}
+    Note: missing rows have None as all values on the missing side,
+    item ids are reported as strings in compact schema as well
+    """
+    logging.info(f'Compare {table_name} table of {original_alias} and '
+                 f'{dumped_alias} databases')
+    columns = get_table_columns(table_name)
+    keys_codec = get_item_keys_codec(db_connector, original_alias)
+    changed_rows = db_connector.select_with_query(
+        build_changed_rows_query(table_name, original_alias, dumped_alias))
+
+    result = {}
+    for row in changed_rows or []:
+        expected_row = keys_codec.decode_row(table_name, row[:len(columns)])
+        actual_row = keys_codec.decode_row(table_name, row[len(columns):])
+        primary_key = (expected_row[0] if expected_row[0] is not None
+                       else actual_row[0])
+        result[primary_key] = {
+            col_name: (expected_value, actual_value)
+            for col_name, expected_value, actual_value
+            in zip(columns, expected_row, actual_row)
+            if expected_value != actual_value
+        }
+    return result
+
+
+def get_changed_ship_components(db_connector: DBConnector,
+                                original_alias: str = 'main',
+                                dumped_alias: str = DUMPED_DB_ALIAS) -> dict:
+    """
+    Function provides finding all ships with changed components
+    :param db_connector: database connector object with attached dumped db
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: dict with changed ship components following next format:
+    {(ship_id, component_name): {
+        'value': (expected_value, actual_value),
+        'options': (expected_options, actual_options)
+    }, ...}
+    where options are dicts in the following format:
+    {option_name: option_value, ...}
+    """
+    logging.info(f'Compare ship components of {original_alias} and '
+                 f'{dumped_alias} databases')
+    ship_key = get_primary_key(SHIPS_TABLE)
+    keys_codec = get_item_keys_codec(db_connector, original_alias)
+    foreign_keys = get_foreign_keys(SHIPS_TABLE)
+    result = {}
+    for component_name, component_table, component_key in foreign_keys:
+        options = get_table_columns(component_table)[1:]
+        changed_components = db_connector.select_with_query(
+            build_changed_components_query(component_name, component_table,
+                                           original_alias, dumped_alias))
+
+        for row in changed_components or []:
+            ship_id = keys_codec.decode(ship_key, row[0])
+            expected_value, actual_value = (
+                keys_codec.decode(component_key, value) for value in row[1:3])
+            expected_options = row[3:3 + len(options)]
+            actual_options = row[3 + len(options):]
+            result[(ship_id, component_name)] = {
+                'value': (_strip_quotes(expected_value),
+                          _strip_quotes(actual_value)),
+                'options': (dict(zip(options, expected_options)),
+                            dict(zip(options, actual_options))),
+            }
+    return result
+
+
+def get_databases_report(db_connector: DBConnector,
+                         original_alias: str = 'main',
+                         dumped_alias: str = DUMPED_DB_ALIAS) -> dict:
+    """
+    Function provides comparing two schemas available in one connection
+    :param db_connector: database connector object
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: dict with comparison report following next format:
+    {
+        'tables': {table_name: <get_changed_rows output>, ...},
+        'ships': <get_changed_ship_components output>
+    }
+    """
+    tables_report = {
+        table_name: get_changed_rows(db_connector, table_name,
+                                     original_alias, dumped_alias)
+        for table_name in TABLES_CONFIG
+    }
+    ships_report = get_changed_ship_components(db_connector, original_alias,
+                                               dumped_alias)
+    return {'tables': tables_report, 'ships': ships_report}
+
+
+def compare_databases(db_connector: DBConnector, dumped_db_name: str,
+                      dumped_alias: str = DUMPED_DB_ALIAS) -> dict:
+    """
+    Function provides comparing original database with the dumped one
+    by attaching dumped database to the original connection
+    :param db_connector: connector to original database
+    :param dumped_db_name: name of the dumped database
+    :param dumped_alias: schema name for attached dumped database
+    :return: dict with comparison report (see get_databases_report)
+    """
+    logging.info(f'Compare {db_connector.db_name} with {dumped_db_name}')
+    db_connector.attach_db(dumped_db_name, dumped_alias)
+    try:
+        return get_databases_report(db_connector, dumped_alias=dumped_alias)
+    finally:
+        db_connector.detach_db(dumped_alias)
+
+
+def compare_overlay(overlay_db_connector: DBConnector) -> dict:
+    """
+    Function provides comparing original database with merged data of
+    overlay connector: original tables are available in main schema and
+    merged views shadow them in temp schema
+    :param overlay_db_connector: overlay connector (see OverlayDBConnector)
+    :return: dict with comparison report (see get_databases_report)
+    """
+    logging.info(f'Compare {overlay_db_connector.db_name} with its overlay')
+    return get_databases_report(overlay_db_connector, 'main',
+                                OVERLAY_VIEWS_ALIAS)
@@ -0,0 +1,256 @@
+import logging
+
+from configs.db_constants_and_configs import (TABLES_CONFIG, DUMPED_DB_ALIAS,
+                                              FINGERPRINTS_TABLE_SUFFIX,
+                                              FINGERPRINT_BUCKETS_TABLE_SUFFIX,
+                                              FINGERPRINT_BUCKETS)
+from data_base.db_processing import DBConnector
+from utils.db_config_utils import get_table_columns, get_primary_key
+
+FINGERPRINT_TRIGGERS = ('insert', 'update', 'delete')
+
+
+def get_fingerprints_table_name(table_name: str) -> str:
+    """
+    Function returns name of the table with rows hashes
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: table name
+    """
+    return f'{table_name}{FINGERPRINTS_TABLE_SUFFIX}'
+
+
+def get_fingerprint_buckets_table_name(table_name: str) -> str:
+    """
+    Function returns name of the table with buckets summaries
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: table name
+    """
+    return f'{table_name}{FINGERPRINT_BUCKETS_TABLE_SUFFIX}'
+
+
+def build_fingerprint_tables_queries(table_name: str) -> list:
+    """
+    Function provides building queries that create fingerprint tables:
+    hash of every row and summary hash of every bucket of primary keys
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: list of SQL-queries
+    """
+    fingerprints_table = get_fingerprints_table_name(table_name)
+    return [
+        f'CREATE TABLE IF NOT EXISTS {fingerprints_table} '
+        f'(row_key PRIMARY KEY, bucket INTEGER, row_hash INTEGER);',
+        f'CREATE INDEX IF NOT EXISTS idx_{fingerprints_table}_bucket '
+        f'ON {fingerprints_table} (bucket);',
+        f'CREATE TABLE IF NOT EXISTS '
+        f'{get_fingerprint_buckets_table_name(table_name)} '
+        f'(bucket INTEGER PRIMARY KEY, bucket_hash INTEGER, '
+        f'rows_number INTEGER);',
+    ]
+
+
+def build_fingerprints_fill_queries(table_name: str,
+                                    buckets: int = FINGERPRINT_BUCKETS
+                                    ) -> list:
+    """
+    Function provides building queries that calculate fingerprints of
+    all existing rows of the table by bulk statements
+    :param table_name: name of the table from TABLES_CONFIG
+    :param buckets: number of primary key buckets
+    :return: list of SQL-queries
+    """
+    columns = ', '.join(get_table_columns(table_name))
+    primary_key = get_primary_key(table_name)
+    fingerprints_table = get_fingerprints_table_name(table_name)
+    buckets_table = get_fingerprint_buckets_table_name(table_name)
+    return [
+        f'DELETE FROM {fingerprints_table};',
+        f'DELETE FROM {buckets_table};',
+        f'INSERT INTO {fingerprints_table} (row_key, bucket, row_hash) '
+        f'SELECT {primary_key}, key_bucket({primary_key}, {buckets}), '
+        f'row_hash({columns}) FROM {table_name};',
+        f'INSERT INTO {buckets_table} (bucket, bucket_hash, rows_number) '
+        f'SELECT bucket, hash_sum(row_hash), COUNT(*) '
+        f'FROM {fingerprints_table} GROUP BY bucket;',
+    ]
+
+
+def build_fingerprint_triggers_queries(table_name: str,
+                                       buckets: int = FINGERPRINT_BUCKETS
+                                       ) -> list:
+    """
+    Function provides building queries that create triggers keeping
+    fingerprints of the table up to date
+    :param table_name: name of the table from TABLES_CONFIG
+    :param buckets: number of primary key buckets
+    :return: list of SQL-queries
+    """
+    columns = get_table_columns(table_name)
+    primary_key = get_primary_key(table_name)
+    fingerprints_table = get_fingerprints_table_name(table_name)
+    buckets_table = get_fingerprint_buckets_table_name(table_name)
+    new_values = ', '.join(f'NEW.{col_name}' for col_name in columns)
+    remove_old_row = (
+        f'UPDATE {buckets_table} SET bucket_hash = hash_sub(bucket_hash, '
+        f'(SELECT row_hash FROM {fingerprints_table} '
+        f'WHERE row_key = OLD.{primary_key})), '
+        f'rows_number = rows_number - 1 '
+        f'WHERE bucket = key_bucket(OLD.{primary_key}, {buckets}); '
+        f'DELETE FROM {fingerprints_table} '
+        f'WHERE row_key = OLD.{primary_key};')
+    add_new_row = (
+        f'INSERT INTO {fingerprints_table} (row_key, bucket, row_hash) '
+        f'VALUES (NEW.{primary_key}, key_bucket(NEW.{primary_key}, '
+        f'{buckets}), row_hash({new_values})); '
+        f'INSERT INTO {buckets_table} (bucket, bucket_hash, rows_number) '
+        f'VALUES (key_bucket(NEW.{primary_key}, {buckets}), '
+        f'row_hash({new_values}), 1) '
+        f'ON CONFLICT (bucket) DO UPDATE SET '
+        f'bucket_hash = hash_add(bucket_hash, excluded.bucket_hash), '
+        f'rows_number = rows_number + 1;')
+    triggers_bodies = {
+        'insert': add_new_row,
+        'update': f'{remove_old_row} {add_new_row}',
+        'delete': remove_old_row,
+    }
+    return [f'CREATE TRIGGER IF NOT EXISTS {fingerprints_table}_{action} '
+            f'AFTER {action.upper()} ON {table_name} '
+            f'BEGIN {triggers_bodies[action]} END;'
+            for action in FINGERPRINT_TRIGGERS]
+
+
+def enable_fingerprints(db_connector: DBConnector,
+                        buckets: int = FINGERPRINT_BUCKETS) -> None:
+    """
+    Function provides calculating fingerprints of all tables and creating
+    triggers that maintain them on every change
+    Note: it's much faster to enable fingerprints after bulk data
+    insertion, the same number of buckets should be used for databases
+    that are compared
+    :param db_connector: database connector object
+    :param buckets: number of primary key buckets
+    """
+    logging.info(f'Enable fingerprints in {db_connector.db_name} database')
+    for table_name in TABLES_CONFIG:
+        for query in (build_fingerprint_tables_queries(table_name) +
+                      build_fingerprints_fill_queries(table_name, buckets) +
+                      build_fingerprint_triggers_queries(table_name,
+                                                         buckets)):
+            db_connector.execute_with_query(query)
+
+
+def disable_fingerprints(db_connector: DBConnector) -> None:
+    """
+    Function provides dropping fingerprint triggers and tables
+    :param db_connector: database connector object
+    """
+    logging.info(f'Disable fingerprints in {db_connector.db_name} database')
+    for table_name in TABLES_CONFIG:
+        fingerprints_table = get_fingerprints_table_name(table_name)
+        for action in FINGERPRINT_TRIGGERS:
+            db_connector.execute_with_query(
+                f'DROP TRIGGER IF EXISTS {fingerprints_table}_{action};')
+        db_connector.execute_with_query(
+            f'DROP TABLE IF EXISTS {fingerprints_table};')
+        db_connector.execute_with_query(
+            f'DROP TABLE IF EXISTS '
+            f'{get_fingerprint_buckets_table_name(table_name)};')
+
+
+def get_table_fingerprint(db_connector: DBConnector, table_name: str,
+                          alias: str = 'main') -> tuple:
+    """
+    Function returns fingerprint of the whole table combined from its
+    buckets summaries
+    :param db_connector: database connector object
+    :param table_name: name of the table from TABLES_CONFIG
+    :param alias: schema name of the database
+    :return: tuple in the following format: (table_hash, rows_number)
+    """
+    return db_connector.select_with_query(
+        f'SELECT hash_sum(bucket_hash), IFNULL(SUM(rows_number), 0) '
+        f'FROM {alias}.{get_fingerprint_buckets_table_name(table_name)};'
+    )[0]
+
+
+def get_changed_buckets(db_connector: DBConnector, table_name: str,
+                        original_alias: str = 'main',
+                        dumped_alias: str = DUMPED_DB_ALIAS) -> list:
+    """
+    Function returns buckets which summaries differ in two databases
+    :param db_connector: database connector object with attached dumped db
+    :param table_name: name of the table from TABLES_CONFIG
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: sorted list of bucket numbers
+    """
+    buckets_table = get_fingerprint_buckets_table_name(table_name)
+    original_buckets = (f'SELECT bucket, bucket_hash FROM '
+                        f'{original_alias}.{buckets_table} '
+                        f'WHERE rows_number > 0')
+    dumped_buckets = (f'SELECT bucket, bucket_hash FROM '
+                      f'{dumped_alias}.{buckets_table} '
+                      f'WHERE rows_number > 0')
+    changed_buckets = db_connector.select_with_query(
+        f'SELECT bucket FROM ({original_buckets} EXCEPT {dumped_buckets}) '
+        f'UNION SELECT bucket FROM ({dumped_buckets} EXCEPT '
+        f'{original_buckets});')
+    return sorted(bucket for bucket, in changed_buckets)
+
+
+def get_changed_keys(db_connector: DBConnector, table_name: str,
+                     original_alias: str = 'main',
+                     dumped_alias: str = DUMPED_DB_ALIAS) -> list:
+    """
+    Function provides finding primary keys of changed, removed or added
+    rows: table fingerprints are compared first, then buckets summaries
+    and only rows of changed buckets are read
+    :param db_connector: database connector object with attached dumped db
+    :param table_name: name of the table from TABLES_CONFIG
+    :param original_alias: schema name of the original database
+    :param dumped_alias: schema name of the dumped database
+    :return: sorted list of primary keys
+    """
+    if (get_table_fingerprint(db_connector, table_name, original_alias) ==
+            get_table_fingerprint(db_connector, table_name, dumped_alias)):
+        return []
+
+    changed_buckets = get_changed_buckets(db_connector, table_name,
+                                          original_alias, dumped_alias)
+    logging.info(f'{len(changed_buckets)} buckets of {table_name} table '
+                 f'are changed')
+    if not changed_buckets:
+        return []
+
+    fingerprints_table = get_fingerprints_table_name(table_name)
+    buckets_placeholders = ', '.join('?' * len(changed_buckets))
+    rows_hashes = []
+    for alias in (original_alias, dumped_alias):
+        rows_hashes.append(dict(db_connector.select_with_query(
+            f'SELECT row_key, row_hash FROM {alias}.{fingerprints_table} '
+            f'WHERE bucket IN ({buckets_placeholders});', changed_buckets)))
+    original_hashes, dumped_hashes = rows_hashes
+    return sorted(
+        row_key for row_key in original_hashes.keys() | dumped_hashes.keys()
+        if original_hashes.get(row_key) != dumped_hashes.get(row_key))
+
+
+def compare_fingerprints(db_connector: DBConnector, dumped_db_name: str,
+                         dumped_alias: str = DUMPED_DB_ALIAS) -> dict:
+    """
+    Function provides comparing fingerprints of original database with
+    the dumped one by attaching dumped database to the original connection
+    :param db_connector: connector to original database
+    :param dumped_db_name: name of the dumped database
+    :param dumped_alias: schema name for attached dumped database
+    :return: dict with changed primary keys following next format:
+    {table_name: [primary_key, ...], ...}
+    """
+    logging.info(f'Compare fingerprints of {db_connector.db_name} with '
+                 f'{dumped_db_name}')
+    db_connector.attach_db(dumped_db_name, dumped_alias)
+    try:
+        return {table_name: get_changed_keys(db_connector, table_name,
+                                             dumped_alias=dumped_alias)
+                for table_name in TABLES_CONFIG}
+    finally:
+        db_connector.detach_db(dumped_alias)
@@ -0,0 +1,246 @@
+import logging
+import sqlite3
+from contextlib import closing
+from typing import Callable, Optional
+
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              BACKUP_PAGES_PER_STEP,
+                                              DUMPED_DB_ALIAS,
+                                              OVERLAY_DB_ALIAS,
+                                              OVERLAY_DELETED_COLUMN,
+                                              OVERLAY_TABLE_SUFFIX,
+                                              SHIP_CONFIGURATIONS_TABLE)
+from data_base.db_processing import DBConnector, log_backup_progress
+from data_base.materialized_configurations import get_configurations_columns
+from data_base.ship_configurations import build_ship_configurations_query
+from utils.db_config_utils import get_table_columns, get_primary_key
+
+logger = logging.getLogger()
+
+
+def get_overlay_table_name(table_name: str) -> str:
+    """
+    Function returns name of the overlay table, it differs from the
+    original table name because tables in trigger bodies could be
+    referenced only by unqualified names
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: overlay table name without schema name
+    """
+    return f'{table_name}{OVERLAY_TABLE_SUFFIX}'
+
+
+def build_overlay_table_query(table_name: str) -> str:
+    """
+    Function provides building query that creates overlay table: it has
+    the same columns as the original table plus deletion mark. Columns
+    have no types, so values are stored exactly as they are read from
+    the original table (text or integer ids in compact schema)
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: SQL-query
+    """
+    columns = list(get_table_columns(table_name))
+    columns[0] = f'{columns[0]} PRIMARY KEY'
+    columns.append(f'{OVERLAY_DELETED_COLUMN} INTEGER NOT NULL DEFAULT 0')
+    return (f'CREATE TABLE IF NOT EXISTS {OVERLAY_DB_ALIAS}.'
+            f'{get_overlay_table_name(table_name)} ({", ".join(columns)});')
+
+
+def build_merged_view_query(table_name: str) -> str:
+    """
+    Function provides building query that creates temporary view with the
+    same name as the original table, the view shadows the original table
+    for unqualified queries and returns overlay rows instead of original ones
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: SQL-query
+    """
+    columns = ', '.join(get_table_columns(table_name))
+    primary_key = get_primary_key(table_name)
+    overlay_table = f'{OVERLAY_DB_ALIAS}.{get_overlay_table_name(table_name)}'
+    return (f'CREATE TEMP VIEW IF NOT EXISTS {table_name} ({columns}) AS '
+            f'SELECT {columns} FROM {overlay_table} '
+            f'WHERE NOT {OVERLAY_DELETED_COLUMN} '
+            f'UNION ALL '
+            f'SELECT {columns} FROM main.{table_name} '
+            f'WHERE {primary_key} NOT IN ('
+            f'SELECT {primary_key} FROM {overlay_table});')
+
+
+def build_overlay_triggers_queries(table_name: str) -> list:
+    """
+    Function provides building queries that create triggers redirecting
+    changes of the merged view into overlay table
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: list of SQL-queries
+    """
+    columns = get_table_columns(table_name)
+    primary_key = get_primary_key(table_name)
+    overlay_table = get_overlay_table_name(table_name)
+    overlay_columns = ', '.join(columns + (OVERLAY_DELETED_COLUMN, ))
+    new_values = ', '.join(f'NEW.{col_name}' for col_name in columns)
+    old_values = ', '.join(f'OLD.{col_name}' for col_name in columns)
+    mark_deleted = (f'INSERT OR REPLACE INTO {overlay_table} '
+                    f'({overlay_columns}) SELECT {old_values}, 1')
+    insert_new = (f'INSERT OR REPLACE INTO {overlay_table} '
+                  f'({overlay_columns}) VALUES ({new_values}, 0);')
+    return [
+        f'CREATE TEMP TRIGGER IF NOT EXISTS {table_name}_overlay_insert '
+        f'INSTEAD OF INSERT ON {table_name} BEGIN {insert_new} END;',
+        f'CREATE TEMP TRIGGER IF NOT EXISTS {table_name}_overlay_update '
+        f'INSTEAD OF UPDATE ON {table_name} BEGIN {mark_deleted} '
+        f'WHERE OLD.{primary_key} IS NOT NEW.{primary_key}; '
+        f'{insert_new} END;',
+        f'CREATE TEMP TRIGGER IF NOT EXISTS {table_name}_overlay_delete '
+        f'INSTEAD OF DELETE ON {table_name} BEGIN {mark_deleted}; END;',
+    ]
+
+
+def build_merged_configurations_view_query() -> str:
+    """
+    Function provides building query that creates temporary view shadowing
+    materialized ship configurations: triggers of the original database
+    don't see overlay changes, so configurations are joined from merged
+    views instead
+    :return: SQL-query
+    """
+    return (f'CREATE TEMP VIEW IF NOT EXISTS {SHIP_CONFIGURATIONS_TABLE} '
+            f'({", ".join(get_configurations_columns())}) AS '
+            f'{build_ship_configurations_query()}')
+
+
+class OverlayDBConnector(DBConnector):
+    """
+    Class that provides copy-on-write view of the original database:
+    original database is opened as main schema and is never changed,
+    all changes are stored in attached overlay database and unqualified
+    queries read merged data through temporary views, so the connector
+    could be used instead of connector to the full dump of original db
+    """
+    def __init__(self, db_name: str, overlay_db_name: str = ':memory:',
+                 **connector_kwargs):
+        super().__init__(db_name, **connector_kwargs)
+        self.overlay_db_name = overlay_db_name
+
+    def create_connection(self) -> None:
+        """
+        Method provides creating connection to the original database,
+        attaching overlay database and creating merged views over it
+        """
+        if self.conn is not None:
+            return
+        super().create_connection()
+        self.attach_db(self.overlay_db_name, OVERLAY_DB_ALIAS)
+        for table_name in TABLES_CONFIG:
+            self.execute_with_query(build_overlay_table_query(table_name))
+            self.execute_with_query(build_merged_view_query(table_name))
+            for trigger_query in build_overlay_triggers_queries(table_name):
+                self.execute_with_query(trigger_query)
+        if self.has_table(SHIP_CONFIGURATIONS_TABLE):
+            self.execute_with_query(build_merged_configurations_view_query())
+
+    def _get_rows_affected(self, conn: sqlite3.Connection,
+                           cursor: sqlite3.Cursor, total_changes: int) -> int:
+        """
+        Method returns number of rows changed by the last executed query:
+        changes of merged views are made by INSTEAD OF triggers and aren't
+        counted in cursor rowcount, so changes of overlay tables are
+        counted instead
+        Note: every primary key update changes two overlay rows (old row
+        is marked as deleted)
+        :param conn: connection the query was executed on
+        :param cursor: cursor the query was executed by
+        :param total_changes: total changes of the connection before
+                              the query execution
+        :return: number of changed rows
+        """
+        return conn.total_changes - total_changes
+
+    def get_overlay_size(self) -> dict:
+        """
+        Method returns number of changed rows stored in overlay
+        :return: dict in the following format: {table_name: rows, ...}
+        """
+        return {table_name: self.select_with_query(
+                    f'SELECT COUNT(*) FROM {OVERLAY_DB_ALIAS}.'
+                    f'{get_overlay_table_name(table_name)};')[0][0]
+                for table_name in TABLES_CONFIG}
+
+    def reset_overlay(self) -> None:
+        """
+        Method provides removing all changes, so merged data becomes equal
+        to the original database again
+        """
+        logger.info(f'Reset overlay of {self.db_name}')
+        for table_name in TABLES_CONFIG:
+            self.execute_with_query(
+                f'DELETE FROM {OVERLAY_DB_ALIAS}.'
+                f'{get_overlay_table_name(table_name)};')
+            self._touch_table(table_name)
+
+    def materialize(self, new_db_name: str,
+                    pages: int = BACKUP_PAGES_PER_STEP,
+                    progress: Optional[Callable] = log_backup_progress
+                    ) -> None:
+        """
+        Method provides creating full database file with merged data:
+        original database is copied and overlay changes are applied to it
+        :param new_db_name: name of the materialized database
+        :param pages: number of pages copied per backup step
+        :param progress: callback called after every backup step with
+                         (status, remaining, total) arguments
+        """
+        logger.info(f'Materialize overlay of {self.db_name} into '
+                    f'{new_db_name}')
+        with closing(sqlite3.connect(new_db_name, uri=True)) as new_db_conn:
+            self.conn.backup(new_db_conn, pages=pages, progress=progress)
+
+        self.attach_db(new_db_name, DUMPED_DB_ALIAS)
+        try:
+            for table_name in TABLES_CONFIG:
+                columns = ', '.join(get_table_columns(table_name))
+                primary_key = get_primary_key(table_name)
+                overlay_table = (f'{OVERLAY_DB_ALIAS}.'
+                                 f'{get_overlay_table_name(table_name)}')
+                self.execute_with_query(
+                    f'DELETE FROM {DUMPED_DB_ALIAS}.{table_name} '
+                    f'WHERE {primary_key} IN ('
+                    f'SELECT {primary_key} FROM {overlay_table});')
+                self.execute_with_query(
+                    f'INSERT INTO {DUMPED_DB_ALIAS}.{table_name} ({columns}) '
+                    f'SELECT {columns} FROM {overlay_table} '
+                    f'WHERE NOT {OVERLAY_DELETED_COLUMN};')
+        finally:
+            self.detach_db(DUMPED_DB_ALIAS)
+
+    def dump_db(self, new_db_name: str,
+                pages: int = BACKUP_PAGES_PER_STEP,
+                progress: Optional[Callable] = log_backup_progress) -> None:
+        """
+        Method provides dumping merged database (see materialize)
+        :param new_db_name: dumped database name
+        :param pages: number of pages copied per backup step
+        :param progress: callback called after every backup step with
+                         (status, remaining, total) arguments
+        """
+        self.materialize(new_db_name, pages, progress)
+
+    def restore(self, source_conn: sqlite3.Connection,
+                pages: int = BACKUP_PAGES_PER_STEP,
+                progress: Optional[Callable] = log_backup_progress) -> None:
+        """
+        Restoring is not supported: it would overwrite original database
+        """
+        raise sqlite3.NotSupportedError('Original database of overlay '
+                                        'connector could not be restored')
+
+    def drop_table(self, table_name: str) -> None:
+        """
+        Method provides dropping overlay of the table, original table
+        stays untouched
+        :param table_name: name of the table that overlay should be dropped
+        """
+        logger.info(f'Drop overlay of {table_name} table')
+        self._touch_table(table_name)
+        self.execute_with_query(f'DROP VIEW IF EXISTS temp.{table_name};')
+        self.execute_with_query(
+            f'DROP TABLE IF EXISTS {OVERLAY_DB_ALIAS}.'
+            f'{get_overlay_table_name(table_name)};')
@@ -0,0 +1,313 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from configs.db_constants_and_configs import (ATTACH_QUERY, DETACH_QUERY,
+                                              CACHED_STATEMENTS,
+                                              POOL_MAX_READERS,
+                                              POOL_CHECKOUT_TIMEOUT,
+                                              DB_BUSY_TIMEOUT,
+                                              PRAGMA_QUERY,
+                                              CONNECTION_PROFILES,
+                                              DB_CONNECTION_PROFILE,
+                                              DATABASE_VERSIONS_QUERY)
+from data_base.db_processing import DBConnector
+from data_base.query_stats import QueryStats
+from utils.hash_utils import register_hash_functions
+
+logger = logging.getLogger()
+
+
+class ConnectionPool:
+    """
+    Class that provides thread-safe pool of connections to sqlite database:
+    every thread gets its own read connection, all writes are serialized
+    through a single writer connection, database versions are read
+    through a single versions connection
+    """
+    def __init__(self, db_name: str, max_readers: int = POOL_MAX_READERS,
+                 checkout_timeout: float = POOL_CHECKOUT_TIMEOUT,
+                 cached_statements: int = CACHED_STATEMENTS):
+        self.db_name = db_name
+        self.pragmas = {}
+        self.checkout_timeout = checkout_timeout
+        self.cached_statements = cached_statements
+        self.writer = None
+        self.attached_dbs = {}
+        self.__versions_connection = None
+        self.__versions_lock = threading.Lock()
+        self.__writer_lock = threading.RLock()
+        self.__readers_semaphore = threading.BoundedSemaphore(max_readers)
+        self.__local = threading.local()
+        self.__connections = []
+        self.__stats_lock = threading.Lock()
+        self.__stats = {'reader_checkouts': 0, 'reader_returns': 0,
+                        'writer_checkouts': 0, 'writer_returns': 0,
+                        'readers_created': 0}
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Method provides creating new connection in WAL mode with
+        pragmas of the pool applied
+        :return: sqlite connection
+        """
+        connection = sqlite3.connect(self.db_name, timeout=DB_BUSY_TIMEOUT,
+                                     check_same_thread=False,
+                                     cached_statements=self.cached_statements,
+                                     uri=True)
+        register_hash_functions(connection)
+        connection.execute('PRAGMA journal_mode=WAL;')
+        for pragma_name, pragma_value in self.pragmas.items():
+            connection.execute(PRAGMA_QUERY.format(pragma_name, pragma_value))
+        self.__connections.append(connection)
+        return connection
+
+    def __update_stats(self, stat_name: str) -> None:
+        """
+        Method provides thread-safe increment of pool statistics
+        :param stat_name: name of the statistics counter
+        """
+        with self.__stats_lock:
+            self.__stats[stat_name] += 1
+
+    def __sync_attached_dbs(self, connection: sqlite3.Connection,
+                            attached_dbs: dict) -> None:
+        """
+        Method provides applying attached databases of the pool to
+        the reader connection
+        :param connection: reader connection
+        :param attached_dbs: dict with databases attached to the connection
+                             {alias: db_name, ...}
+        """
+        for alias in set(attached_dbs) - set(self.attached_dbs):
+            connection.execute(DETACH_QUERY.format(alias))
+            del attached_dbs[alias]
+        for alias, db_name in self.attached_dbs.items():
+            if attached_dbs.get(alias) != db_name:
+                connection.execute(ATTACH_QUERY.format(alias), (db_name,))
+                attached_dbs[alias] = db_name
+
+    def open(self) -> None:
+        """
+        Method provides opening writer and versions connections of the pool
+        """
+        logger.debug(f'Open connections pool to the {self.db_name}')
+        self.writer = self.__connect()
+        self.__versions_connection = self.__connect()
+
+    def close(self) -> None:
+        """
+        Method provides closing all connections of the pool
+        """
+        logger.debug(f'Close connections pool to the {self.db_name}')
+        for connection in self.__connections:
+            connection.close()
+        self.__connections = []
+        self.writer = None
+        self.__versions_connection = None
+
+    def attach_db(self, db_name: str, alias: str) -> None:
+        """
+        Method provides registering database that should be attached to
+        every reader connection of the pool
+        :param db_name: name of the database that should be attached
+        :param alias: schema name under which attached database is available
+        """
+        self.attached_dbs[alias] = db_name
+
+    def detach_db(self, alias: str) -> None:
+        """
+        Method provides unregistering attached database
+        :param alias: schema name of the attached database
+        """
+        self.attached_dbs.pop(alias, None)
+
+    @contextmanager
+    def reader(self) -> Iterator[tuple]:
+        """
+        Method provides checkout of the read connection of the current thread
+        :return: tuple in the following format: (connection, cursor)
+        """
+        if not self.__readers_semaphore.acquire(timeout=self.checkout_timeout):
+            raise sqlite3.OperationalError('Timeout while waiting for '
+                                           'free read connection')
+        self.__update_stats('reader_checkouts')
+        try:
+            if getattr(self.__local, 'connection', None) is None:
+                self.__local.connection = self.__connect()
+                self.__local.attached_dbs = {}
+                self.__update_stats('readers_created')
+            connection = self.__local.connection
+            self.__sync_attached_dbs(connection, self.__local.attached_dbs)
+            cursor = connection.cursor()
+            try:
+                yield connection, cursor
+            finally:
+                cursor.close()
+        finally:
+            self.__readers_semaphore.release()
+            self.__update_stats('reader_returns')
+
+    @contextmanager
+    def writer_connection(self) -> Iterator[tuple]:
+        """
+        Method provides serialized checkout of the writer connection,
+        the thread that holds it could check it out again
+        :return: tuple in the following format: (connection, cursor)
+        """
+        with self.__writer_lock:
+            self.__update_stats('writer_checkouts')
+            self.__local.writer_checkouts = (
+                getattr(self.__local, 'writer_checkouts', 0) + 1)
+            cursor = self.writer.cursor()
+            try:
+                yield self.writer, cursor
+            finally:
+                cursor.close()
+                self.__local.writer_checkouts -= 1
+                self.__update_stats('writer_returns')
+
+    def get_database_versions(self) -> tuple:
+        """
+        Method returns versions of database data and schema read through
+        the versions connection, so they are the same for all threads
+        (data version changes after commits of any other connection,
+        including the writer one)
+        :return: tuple in the following format:
+        (data_version, schema_version)
+        """
+        with self.__versions_lock:
+            return self.__versions_connection.execute(
+                DATABASE_VERSIONS_QUERY).fetchone()
+
+    def holds_writer(self) -> bool:
+        """
+        Method checks whether writer connection is checked out by the
+        current thread at the moment
+        :return: True - if the thread holds writer connection
+        """
+        return getattr(self.__local, 'writer_checkouts', 0) > 0
+
+    def get_stats(self) -> dict:
+        """
+        Method returns checkout/return statistics of the pool
+        :return: dict with statistics counters and number of connections
+                 that are checked out at the moment
+        """
+        with self.__stats_lock:
+            stats = dict(self.__stats)
+        stats['checked_out'] = (
+            stats['reader_checkouts'] - stats['reader_returns'] +
+            stats['writer_checkouts'] - stats['writer_returns'])
+        return stats
+
+
+class PooledDBConnector(DBConnector):
+    """
+    Class that provides thread-safe object for interaction with sqlite
+    database: select queries are executed on per-thread read connections,
+    other queries are executed on a single serialized writer connection
+    """
+    # pool connections always work in WAL mode with normal locking
+    fixed_pragmas = ('locking_mode', 'journal_mode')
+
+    def __init__(self, db_name: str, max_readers: int = POOL_MAX_READERS,
+                 cached_statements: int = CACHED_STATEMENTS,
+                 query_stats: Optional[QueryStats] = None,
+                 profile: str = DB_CONNECTION_PROFILE):
+        super().__init__(db_name, cached_statements, query_stats, profile)
+        self.max_readers = max_readers
+        self.pool = None
+
+    @contextmanager
+    def _checkout_connection(self, read_only: bool) -> Iterator[tuple]:
+        """
+        Method provides connection from the pool, queries of the thread
+        that holds writer connection (e.g. inside transaction block) are
+        executed on it, so they see uncommitted changes
+        :param read_only: True - if query doesn't modify database
+        :return: tuple in the following format: (connection, cursor)
+        """
+        checkout = (self.pool.reader()
+                    if read_only and not self.pool.holds_writer()
+                    else self.pool.writer_connection())
+        with checkout as connection_and_cursor:
+            yield connection_and_cursor
+
+    def _get_database_versions(self) -> tuple:
+        """
+        Method returns versions of database data and schema that are the
+        same for all threads (see ConnectionPool.get_database_versions)
+        :return: tuple in the following format:
+        (data_version, schema_version)
+        """
+        return self.pool.get_database_versions()
+
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Property checks whether queries of the current thread are executed
+        inside transaction block: the block holds writer connection, so
+        queries of other threads aren't a part of it
+        """
+        return super().in_transaction and self.pool.holds_writer()
+
+    def create_connection(self) -> None:
+        """
+        Method provides creating connections pool to SQLite database
+        """
+        if self.pool is not None:
+            return
+        logger.debug(f'Create connections pool to the {self.db_name}')
+        try:
+            self.pool = ConnectionPool(
+                self.db_name, self.max_readers,
+                cached_statements=self.cached_statements)
+            self.pool.open()
+            self.conn = self.pool.writer
+            self.cursor = self.conn.cursor()
+            self.apply_profile(self.profile)
+        except sqlite3.Error as error:
+            logger.debug('Error while connecting to SQLite', error)
+
+    def destroy_connection(self) -> None:
+        """
+        Method provides closing all connections of the pool
+        """
+        logger.debug('Disconnect from SQLite')
+        self.pool.close()
+        self.pool = None
+        self.cursor = None
+        self.conn = None
+
+    def apply_profile(self, profile: str) -> None:
+        """
+        Method provides applying connection profile to the writer connection
+        and to all read connections that will be created after that
+        (journal_mode and locking_mode of the profile are ignored)
+        :param profile: name of the connection profile
+        """
+        super().apply_profile(profile)
+        self.pool.pragmas = {
+            pragma_name: pragma_value for pragma_name, pragma_value
+            in CONNECTION_PROFILES[profile].items()
+            if pragma_name not in self.fixed_pragmas}
+
+    def attach_db(self, db_name: str, alias: str) -> None:
+        """
+        Method provides attaching another database to all pool connections
+        :param db_name: name of the database that should be attached
+        :param alias: schema name under which attached database is available
+        """
+        super().attach_db(db_name, alias)
+        self.pool.attach_db(db_name, alias)
+
+    def detach_db(self, alias: str) -> None:
+        """
+        Method provides detaching database from all pool connections
+        :param alias: schema name of the attached database
+        """
+        super().detach_db(alias)
+        self.pool.detach_db(alias)
@@ -1,23 +1,121 @@
 import logging
 import sqlite3
-from typing import Optional, Union
+import time
+from contextlib import contextmanager, suppress
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Union
 
 from configs.db_constants_and_configs import (FOREIGN_KEYS_QUERY, CREATE_QUERY,
+                                              CREATE_WITHOUT_ROWID_QUERY,
                                               INSERT_QUERY, UPDATE_QUERY,
-                                              SIMPLE_SELECT_QUERY,
-                                              WHERE_CLAUSE, JOIN_CLAUSE)
+                                              CREATE_INDEX_QUERY,
+                                              EXPLAIN_QUERY_PLAN,
+                                              ATTACH_QUERY, DETACH_QUERY,
+                                              BEGIN_TRANSACTION_QUERY,
+                                              SAVEPOINT_QUERY,
+                                              RELEASE_SAVEPOINT_QUERY,
+                                              ROLLBACK_TO_SAVEPOINT_QUERY,
+                                              TRANSACTION_MODES,
+                                              TRANSACTION_MODE,
+                                              CACHED_STATEMENTS,
+                                              INSERT_BATCH_SIZE,
+                                              FETCH_CHUNK_SIZE,
+                                              IN_MEMORY_DB_NAME,
+                                              BACKUP_PAGES_PER_STEP,
+                                              PRAGMA_QUERY,
+                                              SCHEMA_VERSION_QUERY,
+                                              DATABASE_VERSIONS_QUERY,
+                                              TABLE_EXISTS_QUERY,
+                                              CONNECTION_PROFILES,
+                                              DB_CONNECTION_PROFILE)
+from data_base.query_builder import parse_conditions, build_select_query
+from data_base.query_stats import QueryStats
+from utils.hash_utils import register_hash_functions
 
 logger = logging.getLogger()
 
+READ_QUERY_PREFIXES = ('SELECT', 'WITH', 'EXPLAIN')
+SAVEPOINT_PREFIX = 'savepoint_'
+
+
+def is_read_query(query: str) -> bool:
+    """
+    Function checks if SQL-query only reads data from database
+    :param query: SQL-query
+    :return: True - if query is a select one
+    """
+    return query.lstrip().upper().startswith(READ_QUERY_PREFIXES)
+
+
+def get_in_memory_db_name(db_name: str) -> str:
+    """
+    Function returns name of the named in-memory database with shared cache,
+    such database is available for all connections of the process
+    while at least one of them is opened
+    :param db_name: database name
+    :return: URI of the in-memory database
+    """
+    return IN_MEMORY_DB_NAME.format(db_name)
+
+
+def get_index_name(table_name: str, columns: tuple) -> str:
+    """
+    Function returns default index name for the table columns
+    :param table_name: name of the indexed table
+    :param columns: tuple with indexed column names
+    :return: index name in the following format: idx_<table>_<columns>
+    """
+    columns_name = '_'.join(column.strip('"').replace(' ', '_')
+                            for column in columns)
+    return f'idx_{table_name}_{columns_name}'
+
+
+def dict_row_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    """
+    Row factory that returns rows as dicts: {column_name: value, ...}
+    :param cursor: cursor the row was fetched from
+    :param row: tuple with row values
+    :return: dict with row values
+    """
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def log_backup_progress(status: int, remaining: int, total: int) -> None:
+    """
+    Function provides logging of the database backup progress
+    :param status: status of the last backup step
+    :param remaining: number of pages that remain to be copied
+    :param total: total number of pages
+    """
+    logger.debug(f'Copied {total - remaining} of {total} pages')
+
 
 class DBConnector:
     """
     Class that provides object for interaction with sqlite database
     """
-    def __init__(self, db_name: str):
+    # pragmas that can't be changed by connection profiles
+    fixed_pragmas = ()
+
+    def __init__(self, db_name: str,
+                 cached_statements: int = CACHED_STATEMENTS,
+                 query_stats: Optional[QueryStats] = None,
+                 profile: str = DB_CONNECTION_PROFILE):
+        if profile not in CONNECTION_PROFILES:
+            raise ValueError(f'Unknown connection profile: {profile}')
         self.db_name = db_name
+        self.cached_statements = cached_statements
+        self.query_stats = query_stats
+        self.profile = profile
         self.cursor = None
         self.conn = None
+        self.tables_versions = {}
+        self.database_version = 0
+        self.__tables_existence = {}
+        self.__transaction_depth = 0
+        self.__transaction_mode = None
+        self.__commit_every = None
+        self.__uncommitted_statements = 0
 
     def __enter__(self):
         self.create_connection()
@@ -40,34 +138,326 @@ class DBConnector:
         :param query_data: list with data that should be inserted in
                            executemany() method
         :return: list with output result if it is possible
+        Note: inside transaction block commit is ignored (see transaction)
+        and errors are raised, so the whole block could be rolled back
         """
         logger.debug(f'Execute query: {query}')
+        read_only = not (many or commit) and is_read_query(query)
         try:
-            if many:
-                self.cursor.executemany(query, query_data)
-            else:
-                if query_data:
-                    self.cursor.execute(query, query_data)
+            with self._checkout_connection(read_only) as (conn, cursor):
+                in_transaction = self.in_transaction
+                total_changes = conn.total_changes
+                start_time = time.perf_counter()
+                if many:
+                    cursor.executemany(query, query_data)
                 else:
-                    self.cursor.execute(query)
+                    if query_data:
+                        cursor.execute(query, query_data)
+                    else:
+                        cursor.execute(query)
 
-            if commit:
-                self.conn.commit()
+                if in_transaction:
+                    if not is_read_query(query):
+                        self.__count_statements(conn, 1)
+                elif commit:
+                    conn.commit()
 
-            logger.debug('Query has executed successfully')
-            return self.cursor.fetchall()
+                result = cursor.fetchall()
+                if self.query_stats is not None:
+                    self.__record_query_stats(
+                        conn, query, None if many else query_data,
+                        time.perf_counter() - start_time,
+                        len(result) if read_only else
+                        self._get_rows_affected(conn, cursor, total_changes))
+                logger.debug('Query has executed successfully')
+                return result
         except sqlite3.Error as error:
+            if self.in_transaction:
+                raise
             logger.warning(f'Error while executing query {query}', error)
 
+    def __execute_batch(self, batch: list) -> int:
+        """
+        Method provides execution of multiple executemany() queries
+        inside one transaction (or savepoint of the current transaction),
+        it is rolled back if any of the queries fails
+        :param batch: list of tuples in the following format:
+                      [(query, query_data), ...]
+        :return: number of rows affected by all queries
+        """
+        rows_affected = 0
+        in_transaction = self.in_transaction
+        try:
+            with self.transaction(), self._checkout_connection(
+                    read_only=False) as (conn, cursor):
+                for query, query_data in batch:
+                    logger.debug(f'Execute query: {query}')
+                    total_changes = conn.total_changes
+                    start_time = time.perf_counter()
+                    cursor.executemany(query, query_data)
+                    query_rows = self._get_rows_affected(conn, cursor,
+                                                         total_changes)
+                    rows_affected += query_rows
+                    if self.query_stats is not None:
+                        self.query_stats.record(
+                            query, time.perf_counter() - start_time,
+                            query_rows)
+                    self.__count_statements(conn, 1)
+            logger.debug('Batch has executed successfully')
+        except sqlite3.Error as error:
+            if in_transaction:
+                raise
+            logger.warning(f'Error while executing batch, rolled back: '
+                           f'{error}')
+            return 0
+
+        return rows_affected
+
+    def __count_statements(self, conn: sqlite3.Connection,
+                           statements: int) -> None:
+        """
+        Method provides counting write statements of the current transaction
+        and committing it by commit_every policy (see transaction), the
+        transaction is committed only when there are no open savepoints
+        :param conn: connection of the transaction
+        :param statements: number of executed write statements
+        """
+        self.__uncommitted_statements += statements
+        if (self.__commit_every and self.__transaction_depth == 1 and
+                self.__uncommitted_statements >= self.__commit_every):
+            logger.debug(f'Commit {self.__uncommitted_statements} '
+                         f'statements of the transaction')
+            conn.commit()
+            conn.execute(BEGIN_TRANSACTION_QUERY.format(
+                self.__transaction_mode))
+            self.__uncommitted_statements = 0
+
+    def __record_query_stats(self, conn: sqlite3.Connection, query: str,
+                             query_data: Optional[Union[list, tuple]],
+                             duration: float, rows: int) -> None:
+        """
+        Method provides recording query statistics, query plan is captured
+        for slow select queries (except EXPLAIN ones). Errors of query plan
+        capturing are logged, so they don't change query result
+        :param conn: connection the query was executed on
+        :param query: executed SQL-query
+        :param query_data: values of query parameters
+        :param duration: query duration in seconds
+        :param rows: number of rows returned (or affected) by the query
+        """
+        query_plan = None
+        if (self.query_stats.is_slow(duration) and is_read_query(query) and
+                not query.lstrip().upper().startswith('EXPLAIN')):
+            try:
+                query_plan = [plan_step[-1] for plan_step in conn.execute(
+                    EXPLAIN_QUERY_PLAN.format(query), query_data or ())]
+            except sqlite3.Error as error:
+                logger.warning(f'Error while capturing query plan of '
+                               f'{query}: {error}')
+        self.query_stats.record(query, duration, rows, query_plan)
+
+    def _get_rows_affected(self, conn: sqlite3.Connection,
+                           cursor: sqlite3.Cursor, total_changes: int) -> int:
+        """
+        Method returns number of rows changed by the last executed query
+        (could be overridden when changes are made by triggers)
+        :param conn: connection the query was executed on
+        :param cursor: cursor the query was executed by
+        :param total_changes: total changes of the connection before
+                              the query execution
+        :return: number of changed rows
+        """
+        return max(cursor.rowcount, 0)
+
+    def _touch_table(self, table_name: str) -> None:
+        """
+        Method marks table data as changed, so data that was read from
+        the table before could be recognized as stale
+        :param table_name: name of the changed table
+        """
+        self.tables_versions[table_name] = (
+            self.tables_versions.get(table_name, 0) + 1)
+
+    def _get_database_versions(self) -> tuple:
+        """
+        Method returns versions of database data and schema read by one
+        query from the connection that tracks changes of other connections
+        (could be overridden when queries are executed on several
+        connections)
+        :return: tuple in the following format:
+        (data_version, schema_version)
+        """
+        with self._checkout_connection(read_only=True) as (conn, _):
+            return conn.execute(DATABASE_VERSIONS_QUERY).fetchone()
+
+    def get_data_version(self) -> int:
+        """
+        Method returns version of database data, it changes every time
+        another connection commits changes to database (changes made
+        through this connector are tracked by table versions)
+        :return: value of data_version PRAGMA
+        """
+        return self._get_database_versions()[0]
+
+    def get_schema_version(self) -> int:
+        """
+        Method returns version of database schema, it changes every time
+        tables, indexes, views or triggers are created or dropped by any
+        connection
+        :return: value of schema_version PRAGMA
+        """
+        return self._get_database_versions()[1]
+
+    def get_tables_versions(self, table_names: Iterable[str]) -> tuple:
+        """
+        Method returns versions of several tables data, database data
+        version is read only once for all of them (see get_table_version)
+        :param table_names: names of the tables
+        :return: tuple with versions of the tables in the same order
+        """
+        data_version = self.get_data_version()
+        return tuple((self.database_version, data_version,
+                      self.tables_versions.get(table_name, 0))
+                     for table_name in table_names)
+
+    def get_table_version(self, table_name: str) -> tuple:
+        """
+        Method returns version of the table data, it changes every time
+        the table is changed through this connector, the whole database
+        is changed by custom query (or restored) or another connection
+        commits changes
+        :param table_name: name of the table
+        :return: tuple in the following format:
+        (database_version, data_version, table_version)
+        """
+        return self.get_tables_versions((table_name, ))[0]
+
+    def has_table(self, table_name: str) -> bool:
+        """
+        Method checks whether table (or view) exists in database, the
+        result is cached until the table is changed through this connector
+        or database schema is changed by any connection
+        :param table_name: name of the table
+        :return: True - if table exists
+        """
+        data_version, schema_version = self._get_database_versions()
+        table_version = ((self.database_version, data_version,
+                          self.tables_versions.get(table_name, 0)),
+                         schema_version)
+        cached_existence = self.__tables_existence.get(table_name)
+        if cached_existence is None or cached_existence[0] != table_version:
+            table_info = self.__execute_query(TABLE_EXISTS_QUERY,
+                                              query_data=(table_name, ))
+            cached_existence = (table_version,
+                                bool(table_info and table_info[0][0]))
+            self.__tables_existence[table_name] = cached_existence
+        return cached_existence[1]
+
+    def __invalidate_rolled_back_data(self) -> None:
+        """
+        Method marks data of all tables as changed after rollback, so
+        data that was read inside rolled back transaction (or savepoint)
+        isn't used any more, tables existence is checked again
+        """
+        self.database_version += 1
+        self.__tables_existence.clear()
+
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Property checks whether queries are executed inside transaction
+        block (see transaction method)
+        """
+        return self.__transaction_depth > 0
+
+    @contextmanager
+    def transaction(self, mode: str = TRANSACTION_MODE,
+                    commit_every: Optional[int] = None
+                    ) -> Iterator['DBConnector']:
+        """
+        Method provides unit of work: all queries executed inside the block
+        are committed together on exit or rolled back if the block fails,
+        errors of queries are raised instead of being logged. Nested blocks
+        are executed as savepoints, so only their own changes are rolled
+        back, mode and commit_every of nested blocks are ignored
+        :param mode: locking mode of the transaction, one of
+                     TRANSACTION_MODES
+        :param commit_every: commit the transaction and begin new one after
+                             every N write statements (e.g. for long bulk
+                             loads), None - commit only on exit
+        :return: the connector itself
+        Note: with commit_every only changes after the last intermediate
+        commit are rolled back
+        """
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f'Unknown transaction mode: {mode}')
+        with self._checkout_connection(read_only=False) as (conn, _):
+            if self.in_transaction:
+                savepoint = f'{SAVEPOINT_PREFIX}{self.__transaction_depth}'
+                conn.execute(SAVEPOINT_QUERY.format(savepoint))
+                self.__transaction_depth += 1
+                try:
+                    yield self
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute(
+                            ROLLBACK_TO_SAVEPOINT_QUERY.format(savepoint))
+                    self.__invalidate_rolled_back_data()
+                    raise
+                finally:
+                    self.__transaction_depth -= 1
+                    if conn.in_transaction:
+                        conn.execute(
+                            RELEASE_SAVEPOINT_QUERY.format(savepoint))
+                self.__count_statements(conn, 0)
+                return
+
+            logger.debug(f'Begin {mode} transaction')
+            # implicitly opened transaction of previous queries is
+            # committed, so it isn't a part of the unit of work
+            conn.commit()
+            conn.execute(BEGIN_TRANSACTION_QUERY.format(mode))
+            self.__transaction_depth = 1
+            self.__transaction_mode = mode
+            self.__commit_every = commit_every
+            self.__uncommitted_statements = 0
+            try:
+                yield self
+                conn.commit()
+                logger.debug('Transaction has committed successfully')
+            except BaseException:
+                conn.rollback()
+                self.__invalidate_rolled_back_data()
+                logger.debug('Transaction has rolled back')
+                raise
+            finally:
+                self.__transaction_depth = 0
+
+    @contextmanager
+    def _checkout_connection(self, read_only: bool) -> Iterator[tuple]:
+        """
+        Method provides connection and cursor that should be used for
+        query execution (could be overridden to use connections pool)
+        :param read_only: True - if query doesn't modify database
+        :return: tuple in the following format: (connection, cursor)
+        """
+        yield self.conn, self.cursor
+
     def create_connection(self) -> None:
         """
         Method provides creating connection to SQLite database
         """
+        if self.conn is not None:
+            return
         logger.debug(f'Create connection to the {self.db_name}')
         try:
-            sqlite_connection = sqlite3.connect(self.db_name)
+            sqlite_connection = sqlite3.connect(
+                self.db_name, cached_statements=self.cached_statements,
+                uri=True)
+            register_hash_functions(sqlite_connection)
             self.cursor = sqlite_connection.cursor()
             self.conn = sqlite_connection
+            self.apply_profile(self.profile)
             logger.debug('Database is created and connected to '
                          'SQLite successfully')
         except sqlite3.Error as error:
@@ -80,39 +470,139 @@ class DBConnector:
         logger.debug('Disconnect from SQLite')
         try:
             self.cursor.close()
+            self.conn.close()
         except sqlite3.Error as error:
             logger.debug('Error while closing SQLite connection', error)
+        finally:
+            self.cursor = None
+            self.conn = None
 
     def create_db(self) -> None:
         """
-        Method provides destroying connection to SQLite database
+        Method provides creating database (SQLite creates database file
+        on connection, so existing connection is reused)
         """
         logger.info('Create database')
         self.create_connection()
 
-    def dump_db(self, new_db_name: str) -> None:
+    def apply_profile(self, profile: str) -> None:
+        """
+        Method provides applying connection profile: PRAGMA settings
+        described in CONNECTION_PROFILES config
+        :param profile: name of the connection profile
+        """
+        if profile not in CONNECTION_PROFILES:
+            raise ValueError(f'Unknown connection profile: {profile}')
+        logger.info(f'Apply {profile} profile to {self.db_name} connection')
+        self.profile = profile
+        self.conn.commit()
+        if ('locking_mode' not in self.fixed_pragmas and
+                self.__execute_query('PRAGMA locking_mode;')[0][0] ==
+                'exclusive' and
+                self.__execute_query('PRAGMA journal_mode;')[0][0] == 'wal'):
+            # locking mode of the database in WAL mode can't be changed
+            # from EXCLUSIVE to NORMAL until WAL mode is exited
+            self.__execute_query(PRAGMA_QUERY.format('journal_mode',
+                                                     'DELETE'))
+        for pragma_name, pragma_value in CONNECTION_PROFILES[profile].items():
+            if pragma_name not in self.fixed_pragmas:
+                self.__execute_query(PRAGMA_QUERY.format(pragma_name,
+                                                         pragma_value))
+        # exclusive lock is released only on the next database access
+        self.__execute_query(SCHEMA_VERSION_QUERY)
+
+    def get_pragmas(self) -> dict:
+        """
+        Method returns current values of pragmas used in connection profiles
+        :return: dict in the following format: {pragma_name: value, ...}
+        """
+        pragma_names = {pragma_name for profile in CONNECTION_PROFILES.values()
+                        for pragma_name in profile}
+        return {pragma_name: self.__execute_query(
+                    f'PRAGMA {pragma_name};')[0][0]
+                for pragma_name in sorted(pragma_names)}
+
+    def dump_db(self, new_db_name: str,
+                pages: int = BACKUP_PAGES_PER_STEP,
+                progress: Optional[Callable] = log_backup_progress) -> None:
         """
         Method provides dumping database
         :param new_db_name: dumped database name
+        :param pages: number of pages copied per backup step
+        :param progress: callback called after every backup step with
+                         (status, remaining, total) arguments
         """
         logger.info(f'Dump current db in new one: {new_db_name}')
+        new_db_conn = None
         try:
-            new_db_conn = sqlite3.connect(new_db_name)
+            new_db_conn = sqlite3.connect(new_db_name, uri=True)
             with new_db_conn:
-                self.conn.backup(new_db_conn)
+                self.conn.backup(new_db_conn, pages=pages, progress=progress)
             logger.debug('Database is dumped successfully')
         except sqlite3.Error as error:
             logger.debug('Error while connecting to SQLite', error)
         finally:
             logger.debug(f'Disconnect from SQLite: {new_db_name}')
-            new_db_conn.close()
+            if new_db_conn is not None:
+                new_db_conn.close()
+
+    def snapshot(self, pages: int = BACKUP_PAGES_PER_STEP,
+                 progress: Optional[Callable] = log_backup_progress
+                 ) -> sqlite3.Connection:
+        """
+        Method provides copying current database into private in-memory
+        database that could be restored later
+        :param pages: number of pages copied per backup step
+        :param progress: callback called after every backup step with
+                         (status, remaining, total) arguments
+        :return: connection to in-memory copy of the database
+        """
+        logger.info(f'Create snapshot of {self.db_name}')
+        snapshot_conn = sqlite3.connect(':memory:')
+        self.conn.backup(snapshot_conn, pages=pages, progress=progress)
+        return snapshot_conn
 
-    def add_table(self, table_name: str, fields: dict) -> None:
+    def restore(self, source_conn: sqlite3.Connection,
+                pages: int = BACKUP_PAGES_PER_STEP,
+                progress: Optional[Callable] = log_backup_progress) -> None:
+        """
+        Method provides replacing current database content with content of
+        another database (e.g. snapshot or connection of another connector)
+        :param source_conn: connection to the database that should be copied
+        :param pages: number of pages copied per backup step
+        :param progress: callback called after every backup step with
+                         (status, remaining, total) arguments
+        """
+        logger.info(f'Restore {self.db_name} from another database')
+        self.database_version += 1
+        source_conn.backup(self.conn, pages=pages, progress=progress)
+
+    def attach_db(self, db_name: str, alias: str) -> None:
+        """
+        Method provides attaching another database to the current connection
+        :param db_name: name of the database that should be attached
+        :param alias: schema name under which attached database is available
+        """
+        logger.info(f'Attach {db_name} database as {alias}')
+        self.__execute_query(ATTACH_QUERY.format(alias), query_data=(db_name,))
+
+    def detach_db(self, alias: str) -> None:
+        """
+        Method provides detaching previously attached database
+        :param alias: schema name of the attached database
+        """
+        logger.info(f'Detach {alias} database')
+        self.__execute_query(DETACH_QUERY.format(alias))
+
+    def add_table(self, table_name: str, fields: dict,
+                  without_rowid: bool = False) -> None:
         """
         Method provides creating table
         :param table_name: name of the table that should be created
         :param fields: dict with table fields configuration
         {field_name: filed_params}
+        :param without_rowid: True - create WITHOUT ROWID table, rows are
+                              stored in primary key b-tree
         """
         logger.info(f'Create table: {table_name}')
         columns = []
@@ -124,25 +614,55 @@ class DBConnector:
             else:
                 columns.append(' '.join([field_name, field_type]))
         fields_query = ', '.join(columns)
-        create_query = CREATE_QUERY.format(table_name, fields_query)
+        create_query = (CREATE_WITHOUT_ROWID_QUERY if without_rowid
+                        else CREATE_QUERY).format(table_name, fields_query)
 
         self.__execute_query(create_query)
+        self._touch_table(table_name)
+
+    def add_index(self, table_name: str, columns: tuple,
+                  index_name: Optional[str] = None) -> None:
+        """
+        Method provides creating index (if it doesn't exist yet)
+        :param table_name: name of the table that should be indexed
+        :param columns: tuple with column names that should be indexed
+        :param index_name: name of the index, by default it's built from
+                           table and column names: idx_<table>_<columns>
+        """
+        index_name = index_name or get_index_name(table_name, columns)
+        logger.info(f'Create index {index_name} on {table_name} table')
+        index_query = CREATE_INDEX_QUERY.format(index_name, table_name,
+                                                ', '.join(columns))
+
+        self.__execute_query(index_query)
 
     def insert_data(self, table_name: str, table_columns: tuple,
-                    table_data: list) -> None:
+                    table_data: Iterable[tuple],
+                    batch_size: int = INSERT_BATCH_SIZE) -> None:
         """
-        Method provides inserting data into table
+        Method provides inserting data into table. Rows are consumed
+        from any iterable (e.g. generator) in batches of limited size
+        and committed once after the last batch (or with the current
+        transaction, see transaction method)
         :param table_name: name of the table that will be filled
         :param table_columns: available table column names that will insert
-        :param table_data: columns data that will be filled
+        :param table_data: iterable with rows data that will be filled
+        :param batch_size: max number of rows inserted by one executemany()
         Note: column names and it's data should be in the same order
         """
         logger.info(f'Insert data into {table_name} table')
         data_query = ','.join(['?']*len(table_columns))
 
         insert_query = INSERT_QUERY.format(table_name, data_query)
-        self.__execute_query(insert_query, many=True, commit=True,
-                             query_data=table_data)
+        self._touch_table(table_name)
+        rows = iter(table_data)
+        batch = list(islice(rows, batch_size))
+        while batch:
+            next_batch = list(islice(rows, batch_size))
+            self.__execute_query(insert_query, many=True,
+                                 commit=not next_batch,
+                                 query_data=batch)
+            batch = next_batch
 
     def update_data(self, table_name: str, updated_data: tuple) -> None:
         """
@@ -158,18 +678,32 @@ class DBConnector:
                                            updated_data[0])
         values = (updated_data[3], updated_data[1])
 
+        self._touch_table(table_name)
         self.__execute_query(update_query, commit=True, query_data=values)
 
     def update_multiple_data(self, table_name: str, updated_data: list
-                             ) -> None:
+                             ) -> int:
         """
-        Method provides updating multiple data in table
+        Method provides updating multiple data in table. Rows are grouped
+        by updated column and every group is executed with executemany()
+        method, all groups are committed as a single transaction
         :param table_name: name of the table where data should be updated
         :param updated_data: list of tuples with data that should be updated
+                             (the same format as in update_data method)
+        :return: number of updated rows
         """
         logger.info(f'Update multiple data for {table_name} table')
-        for item_data in updated_data:
-            self.update_data(table_name, item_data)
+        grouped_data = {}
+        for condition_column, condition_value, column, value in updated_data:
+            grouped_data.setdefault((condition_column, column), []).append(
+                (value, condition_value))
+
+        batch = [(UPDATE_QUERY.format(table_name, column, condition_column),
+                  values)
+                 for (condition_column, column), values
+                 in grouped_data.items()]
+        self._touch_table(table_name)
+        return self.__execute_batch(batch)
 
     def select_wo_condition(self, table_name: str, columns_to_select: list
                             ) -> list:
@@ -181,38 +715,35 @@ class DBConnector:
                  like in columns_to_select
         """
         logger.info(f'Select {columns_to_select} from {table_name} table')
-        columns_query = (columns_to_select[0] if len(columns_to_select) == 1
-                         else ', '.join(columns_to_select))
-        select_query = SIMPLE_SELECT_QUERY.format(columns_query, table_name)
+        select_query = build_select_query(table_name, tuple(columns_to_select))
 
         return self.__execute_query(select_query)
 
     def select_with_condition(self, table_name: str, columns_to_select: list,
-                              condition: str) -> list:
+                              conditions: list) -> list:
         """
         Method provides selecting data with condition
         :param table_name: name of the table where data should be selected
         :param columns_to_select: list of columns that will be selected
-        :param condition: string with condition, following format:
-                          column_name = column_value, ...
+        :param conditions: list of tuples with conditions joined with AND,
+                           following format:
+                           [(column_name, operator, column_value), ...]
         :return: list with tuples with data from columns in the order
                  like in columns_to_select
         """
         logger.info(f'Select {columns_to_select} from {table_name} '
-                    f'table with condition {condition}')
-        columns_query = (columns_to_select[0] if len(columns_to_select) == 1
-                         else ', '.join(columns_to_select))
-        condition_query = f'{table_name} {WHERE_CLAUSE.format(condition)}'
-        select_query = SIMPLE_SELECT_QUERY.format(columns_query,
-                                                  condition_query)
+                    f'table with conditions {conditions}')
+        conditions_shape, query_data = parse_conditions(conditions)
+        select_query = build_select_query(table_name, tuple(columns_to_select),
+                                          conditions_shape)
 
-        return self.__execute_query(select_query)
+        return self.__execute_query(select_query, query_data=query_data)
 
     def select_with_join_and_condition(self, table_name: str,
                                        columns_to_select: list,
                                        another_table_name: str,
                                        join_filed: str,
-                                       condition: str) -> list:
+                                       conditions: list) -> list:
         """
         Method provides selecting data from multiple columns with condition
         (using JOIN statement)
@@ -221,24 +752,197 @@ class DBConnector:
         :param another_table_name: table name that will be joined
         :param join_filed: field name that will be used in ON statement
                            (this filed should be present in both tables)
-        :param condition: string with condition, following format:
-                          column_name = column_value, ...
+        :param conditions: list of tuples with conditions joined with AND,
+                           following format:
+                           [(column_name, operator, column_value), ...]
         :return: list with tuples with data from columns in the order
                  like in columns_to_select
         """
         logger.info(f'Select {columns_to_select} from {table_name} '
-                    f'table with condition {condition}')
-        columns_query = (columns_to_select[0] if len(columns_to_select) == 1
-                         else ', '.join(columns_to_select))
-        join_query = JOIN_CLAUSE.format(
-            another_table_name,
-            f'{table_name}.{join_filed} = {another_table_name}.{join_filed}')
-        condition_query = (f'{table_name} {join_query} '
-                           f'{WHERE_CLAUSE.format(condition)}')
-        select_query = SIMPLE_SELECT_QUERY.format(columns_query,
-                                                  condition_query)
+                    f'table with conditions {conditions}')
+        conditions_shape, query_data = parse_conditions(conditions)
+        select_query = build_select_query(table_name, tuple(columns_to_select),
+                                          conditions_shape,
+                                          (another_table_name, join_filed))
 
-        return self.__execute_query(select_query)
+        return self.__execute_query(select_query, query_data=query_data)
+
+    def explain_query_plan(self, select_query: str,
+                           query_data: Optional[Union[list, tuple]] = None
+                           ) -> list:
+        """
+        Method provides getting query plan of the select query
+        :param select_query: SQL-query that should be explained
+        :param query_data: values for query parameters if they are present
+        :return: list with query plan steps details, e.g.
+        ['SEARCH Ships USING INDEX idx_Ships_hull (hull=?)', ...]
+        """
+        logger.info('Explain query plan')
+        query_plan = self.__execute_query(
+            EXPLAIN_QUERY_PLAN.format(select_query), query_data=query_data)
+        return [plan_step[-1] for plan_step in query_plan or []]
+
+    def explain_select_with_join_and_condition(self, table_name: str,
+                                               columns_to_select: list,
+                                               another_table_name: str,
+                                               join_filed: str,
+                                               conditions: list) -> list:
+        """
+        Method provides getting query plan of the query that is executed
+        by select_with_join_and_condition method with the same parameters
+        :return: list with query plan steps details
+        """
+        conditions_shape, query_data = parse_conditions(conditions)
+        select_query = build_select_query(table_name, tuple(columns_to_select),
+                                          conditions_shape,
+                                          (another_table_name, join_filed))
+
+        return self.explain_query_plan(select_query, query_data)
+
+    def select_with_query(self, select_query: str,
+                          query_data: Optional[Union[list, tuple]] = None
+                          ) -> list:
+        """
+        Method provides selecting data with already built SQL-query
+        (e.g. queries across attached databases)
+        :param select_query: SQL-query that should be executed
+        :param query_data: values for query parameters if they are present
+        :return: list with tuples with selected data
+        """
+        logger.info('Select data with custom query')
+        return self.__execute_query(select_query, query_data=query_data)
+
+    def execute_with_query(self, query: str,
+                           query_data: Optional[Union[list, tuple]] = None
+                           ) -> None:
+        """
+        Method provides executing already built SQL-query that changes
+        database and committing it (e.g. creating views and triggers),
+        changed tables are unknown, so data of all tables is marked as
+        changed
+        :param query: SQL-query that should be executed
+        :param query_data: values for query parameters if they are present
+        """
+        logger.info('Execute custom query')
+        if not is_read_query(query):
+            self.database_version += 1
+        self.__execute_query(query, commit=True, query_data=query_data)
+
+    def select_in_chunks(self, select_query: str,
+                         query_data: Optional[Union[list, tuple]] = None,
+                         chunk_size: int = FETCH_CHUNK_SIZE,
+                         row_factory: Optional[Callable] = None
+                         ) -> Iterator[list]:
+        """
+        Method provides lazy selecting data with already built SQL-query,
+        rows are fetched with fetchmany() method by chunks through own
+        cursor, so several results could be iterated at the same time
+        :param select_query: SQL-query that should be executed
+        :param query_data: values for query parameters if they are present
+        :param chunk_size: max number of rows in one chunk
+                           (cursor arraysize)
+        :param row_factory: cursor row factory, e.g. sqlite3.Row or
+                            dict_row_factory, None - rows are tuples
+        :return: iterator over lists with selected rows
+        Note: cursor is closed when iterator is exhausted or closed. Errors
+        are raised even outside transaction block, so partially read result
+        isn't mistaken for the whole one. Query statistics are recorded
+        when iterator is exhausted, duration doesn't include time spent by
+        the consumer between chunks
+        """
+        logger.info('Select data by chunks with custom query')
+        with self._checkout_connection(read_only=True) as (conn, _):
+            cursor = conn.cursor()
+            cursor.arraysize = chunk_size
+            if row_factory is not None:
+                cursor.row_factory = row_factory
+            rows_number = 0
+            duration = 0
+            try:
+                start_time = time.perf_counter()
+                cursor.execute(select_query, query_data or ())
+                chunk = cursor.fetchmany()
+                duration += time.perf_counter() - start_time
+                while chunk:
+                    rows_number += len(chunk)
+                    yield chunk
+                    start_time = time.perf_counter()
+                    chunk = cursor.fetchmany()
+                    duration += time.perf_counter() - start_time
+            except sqlite3.Error as error:
+                logger.warning(f'Error while executing query {select_query}: '
+                               f'{error}')
+                raise
+            else:
+                if self.query_stats is not None:
+                    self.__record_query_stats(conn, select_query, query_data,
+                                              duration, rows_number)
+            finally:
+                # iterator could be closed after the connection is closed
+                with suppress(sqlite3.ProgrammingError):
+                    cursor.close()
+
+    def iter_select(self, select_query: str,
+                    query_data: Optional[Union[list, tuple]] = None,
+                    chunk_size: int = FETCH_CHUNK_SIZE,
+                    row_factory: Optional[Callable] = None) -> Iterator:
+        """
+        Method provides lazy selecting data row by row with already built
+        SQL-query, only one chunk of rows is kept in memory at a time
+        (see select_in_chunks)
+        :param select_query: SQL-query that should be executed
+        :param query_data: values for query parameters if they are present
+        :param chunk_size: number of rows fetched from cursor at once
+        :param row_factory: cursor row factory, None - rows are tuples
+        :return: iterator over selected rows
+        """
+        for rows_chunk in self.select_in_chunks(select_query, query_data,
+                                                chunk_size, row_factory):
+            yield from rows_chunk
+
+    def iter_wo_condition(self, table_name: str, columns_to_select: list,
+                          chunk_size: int = FETCH_CHUNK_SIZE,
+                          row_factory: Optional[Callable] = None
+                          ) -> Iterator:
+        """
+        Method provides lazy selecting data without condition
+        (see select_wo_condition and iter_select)
+        :param table_name: name of the table where data should be selected
+        :param columns_to_select: list of columns that will be selected
+        :param chunk_size: number of rows fetched from cursor at once
+        :param row_factory: cursor row factory, None - rows are tuples
+        :return: iterator over selected rows
+        """
+        logger.info(f'Iterate {columns_to_select} from {table_name} table')
+        select_query = build_select_query(table_name, tuple(columns_to_select))
+
+        return self.iter_select(select_query, chunk_size=chunk_size,
+                                row_factory=row_factory)
+
+    def iter_with_condition(self, table_name: str, columns_to_select: list,
+                            conditions: list,
+                            chunk_size: int = FETCH_CHUNK_SIZE,
+                            row_factory: Optional[Callable] = None
+                            ) -> Iterator:
+        """
+        Method provides lazy selecting data with condition
+        (see select_with_condition and iter_select)
+        :param table_name: name of the table where data should be selected
+        :param columns_to_select: list of columns that will be selected
+        :param conditions: list of tuples in the following format:
+                           [(column_name, operator, value), ...]
+        :param chunk_size: number of rows fetched from cursor at once
+        :param row_factory: cursor row factory, None - rows are tuples
+        :return: iterator over selected rows
+        """
+        logger.info(f'Iterate {columns_to_select} from {table_name} table '
+                    f'with {conditions} conditions')
+        conditions_shape, query_data = parse_conditions(conditions)
+        select_query = build_select_query(table_name, tuple(columns_to_select),
+                                          conditions_shape)
+
+        return self.iter_select(select_query, query_data, chunk_size,
+                                row_factory)
 
     def drop_table(self, table_name: str) -> None:
         """
@@ -247,4 +951,5 @@ class DBConnector:
         """
         logger.info(f'Drop {table_name} table')
         drop_query = f'DROP TABLE {table_name};'
+        self._touch_table(table_name)
         self.__execute_query(drop_query)
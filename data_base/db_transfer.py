@@ -0,0 +1,334 @@
+import argparse
+import csv
+import gzip
+import json
+import logging
+import marshal
+import os
+import struct
+from functools import partial
+from typing import IO, Iterable, Iterator, Optional
+
+from configs.db_constants_and_configs import (TABLES_CONFIG, DB_NAME,
+                                              DB_CONNECTION_PROFILE,
+                                              DB_GENERATION_PROFILE,
+                                              SIMPLE_SELECT_QUERY,
+                                              FOREIGN_KEY_CHECK_QUERY,
+                                              TRANSFER_FORMATS,
+                                              TRANSFER_FORMAT,
+                                              TRANSFER_MANIFEST_NAME,
+                                              TRANSFER_COMPRESS_LEVEL,
+                                              EXPORT_CHUNK_SIZE,
+                                              IMPORT_BATCH_SIZE,
+                                              BULK_TRANSACTION_MODE,
+                                              BULK_COMMIT_EVERY,
+                                              USE_SHIP_CONFIGURATIONS_TABLE)
+from data_base.compact_schema import is_compact_schema
+from data_base.db_commands import initialize_db, initialize_db_indexes
+from data_base.db_processing import DBConnector
+from data_base.materialized_configurations import enable_ship_configurations
+from utils.db_config_utils import get_table_columns
+
+TRANSFER_VERSION = 1
+TEXT_FORMATS = ('csv', 'jsonl')
+# every binary chunk is prefixed with its size, so it's read by one call
+BINARY_CHUNK_HEADER = struct.Struct('<Q')
+
+
+def get_table_file_name(table_name: str, transfer_format: str,
+                        compress: bool) -> str:
+    """
+    Function returns name of the file with table rows
+    :param table_name: name of the table from TABLES_CONFIG
+    :param transfer_format: format name ('csv', 'jsonl' or 'binary')
+    :param compress: True - if file is compressed with gzip
+    :return: file name
+    """
+    return (f'{table_name}.{transfer_format}'
+            f'{".gz" if compress else ""}')
+
+
+def open_table_file(path: str, mode: str, transfer_format: str,
+                    compress: bool) -> IO:
+    """
+    Function provides opening file with table rows
+    :param path: path of the file
+    :param mode: 'r' or 'w'
+    :param transfer_format: format name ('csv', 'jsonl' or 'binary')
+    :param compress: True - if file is compressed with gzip
+    :return: file object
+    """
+    open_file = (partial(gzip.open, compresslevel=TRANSFER_COMPRESS_LEVEL)
+                 if compress else open)
+    if transfer_format not in TEXT_FORMATS:
+        return open_file(path, f'{mode}b')
+    return open_file(path, f'{mode}t',
+                     newline='' if transfer_format == 'csv' else None)
+
+
+def write_csv_rows(table_file: IO, columns: tuple,
+                   rows_chunks: Iterator[list]) -> int:
+    """
+    Function provides writing rows into CSV file with columns header,
+    NULL values are written as empty strings
+    :return: number of written rows
+    """
+    writer = csv.writer(table_file)
+    writer.writerow(column.strip('"') for column in columns)
+    rows_number = 0
+    for rows_chunk in rows_chunks:
+        writer.writerows(rows_chunk)
+        rows_number += len(rows_chunk)
+    return rows_number
+
+
+def read_csv_rows(table_file: IO) -> Iterator[tuple]:
+    """
+    Function provides reading rows from CSV file, values are read as
+    strings and are converted by columns affinity on insertion
+    """
+    reader = csv.reader(table_file)
+    next(reader, None)
+    for row in reader:
+        yield tuple(value if value != '' else None for value in row)
+
+
+def write_jsonl_rows(table_file: IO, columns: tuple,
+                     rows_chunks: Iterator[list]) -> int:
+    """
+    Function provides writing rows into JSON lines file: every row is
+    written as JSON array
+    :return: number of written rows
+    """
+    rows_number = 0
+    for rows_chunk in rows_chunks:
+        table_file.writelines(f'{json.dumps(row)}\n' for row in rows_chunk)
+        rows_number += len(rows_chunk)
+    return rows_number
+
+
+def read_jsonl_rows(table_file: IO) -> Iterator[list]:
+    """
+    Function provides reading rows from JSON lines file
+    """
+    return map(json.loads, table_file)
+
+
+def write_binary_rows(table_file: IO, columns: tuple,
+                      rows_chunks: Iterator[list]) -> int:
+    """
+    Function provides writing rows into binary file: every chunk of rows
+    is serialized as one marshal object prefixed with its size
+    :return: number of written rows
+    """
+    rows_number = 0
+    for rows_chunk in rows_chunks:
+        chunk_data = marshal.dumps(rows_chunk)
+        table_file.write(BINARY_CHUNK_HEADER.pack(len(chunk_data)))
+        table_file.write(chunk_data)
+        rows_number += len(rows_chunk)
+    return rows_number
+
+
+def read_binary_rows(table_file: IO) -> Iterator[tuple]:
+    """
+    Function provides reading rows from binary file chunk by chunk
+    """
+    chunk_header = table_file.read(BINARY_CHUNK_HEADER.size)
+    while chunk_header:
+        chunk_size, = BINARY_CHUNK_HEADER.unpack(chunk_header)
+        yield from marshal.loads(table_file.read(chunk_size))
+        chunk_header = table_file.read(BINARY_CHUNK_HEADER.size)
+
+
+class RowsCounter:
+    """
+    Class that provides counting rows consumed from the rows iterator
+    """
+    def __init__(self, rows: Iterable):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+ROWS_WRITERS = {
+    'csv': write_csv_rows,
+    'jsonl': write_jsonl_rows,
+    'binary': write_binary_rows,
+}
+ROWS_READERS = {
+    'csv': read_csv_rows,
+    'jsonl': read_jsonl_rows,
+    'binary': read_binary_rows,
+}
+
+
+def export_database(db_connector: DBConnector, path: str,
+                    transfer_format: str = TRANSFER_FORMAT,
+                    compress: bool = False,
+                    chunk_size: int = EXPORT_CHUNK_SIZE) -> dict:
+    """
+    Function provides streaming export of all tables from TABLES_CONFIG
+    into directory: one file per table and manifest file. Rows are read
+    by cursor chunks, so only one chunk is kept in memory. Export fails
+    if any table can't be read completely, manifest isn't written then
+    :param db_connector: database connector object
+    :param path: directory where files should be written
+    :param transfer_format: format name ('csv', 'jsonl' or 'binary')
+    :param compress: True - compress files with gzip
+    :param chunk_size: number of rows fetched from database at once
+    :return: dict with manifest (see read_manifest)
+    """
+    if transfer_format not in TRANSFER_FORMATS:
+        raise ValueError(f'Unsupported transfer format: {transfer_format}')
+    logging.info(f'Export {db_connector.db_name} database into {path} in '
+                 f'{transfer_format} format')
+    os.makedirs(path, exist_ok=True)
+    manifest = {
+        'version': TRANSFER_VERSION,
+        'format': transfer_format,
+        'compress': compress,
+        'compact_schema': is_compact_schema(db_connector),
+        'tables': {},
+    }
+    for table_name in TABLES_CONFIG:
+        columns = get_table_columns(table_name)
+        file_name = get_table_file_name(table_name, transfer_format,
+                                        compress)
+        rows_chunks = db_connector.select_in_chunks(
+            SIMPLE_SELECT_QUERY.format(', '.join(columns), table_name),
+            chunk_size=chunk_size)
+        with open_table_file(os.path.join(path, file_name), 'w',
+                             transfer_format, compress) as table_file:
+            rows_number = ROWS_WRITERS[transfer_format](
+                table_file, columns, rows_chunks)
+        manifest['tables'][table_name] = {
+            'file': file_name,
+            'columns': columns,
+            'rows': rows_number,
+        }
+
+    manifest_path = os.path.join(path, TRANSFER_MANIFEST_NAME)
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def read_manifest(path: str) -> dict:
+    """
+    Function provides reading manifest of exported database
+    :param path: directory with exported database
+    :return: dict in the following format:
+    {'version': ..., 'format': ..., 'compress': ..., 'compact_schema': ...,
+     'tables': {table_name: {'file': ..., 'columns': [...], 'rows': ...}}}
+    """
+    with open(os.path.join(path, TRANSFER_MANIFEST_NAME)) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get('version') != TRANSFER_VERSION:
+        raise ValueError(f'Unsupported export version: '
+                         f'{manifest.get("version")}')
+    for table_name in TABLES_CONFIG:
+        columns = manifest['tables'].get(table_name, {}).get('columns')
+        if columns is None or tuple(columns) != get_table_columns(table_name):
+            raise ValueError(f'Exported {table_name} table doesn\'t match '
+                             f'db config')
+    return manifest
+
+
+def import_database(db_connector: DBConnector, path: str,
+                    batch_size: int = IMPORT_BATCH_SIZE,
+                    commit_every: Optional[int] = BULK_COMMIT_EVERY) -> dict:
+    """
+    Function provides streaming import of exported database: tables are
+    created if they don't exist (existing tables should have the same
+    regular or compact schema as exported ones), all tables are filled by
+    large executemany() batches in one IMMEDIATE transaction, indexes are
+    built and foreign keys are checked only after all rows are inserted.
+    Import is rolled back if number of rows in any file differs from
+    the manifest, with commit_every only batches after the last
+    intermediate commit are rolled back, so database should be cleared
+    before the next import
+    Note: rows are inserted as is, so the connection should use
+    bulk-load profile for the best speed
+    :param db_connector: database connector object
+    :param path: directory with exported database
+    :param batch_size: max number of rows inserted by one executemany()
+    :param commit_every: commit after every N batches, None - commit once
+                         after all tables are filled
+    :return: dict with import report following next format:
+    {'rows': {table_name: rows, ...}, 'foreign_key_violations': ...}
+    """
+    manifest = read_manifest(path)
+    logging.info(f'Import {path} in {manifest["format"]} format into '
+                 f'{db_connector.db_name} database')
+    if not all(db_connector.has_table(table_name)
+               for table_name in TABLES_CONFIG):
+        initialize_db(db_connector, manifest['compact_schema'])
+    elif is_compact_schema(db_connector) != manifest['compact_schema']:
+        raise ValueError(f'Schema of {db_connector.db_name} database '
+                         f'doesn\'t match schema of exported database '
+                         f'(compact: {manifest["compact_schema"]})')
+
+    imported_rows = {}
+    with db_connector.transaction(BULK_TRANSACTION_MODE, commit_every):
+        for table_name, table_manifest in manifest['tables'].items():
+            with open_table_file(os.path.join(path, table_manifest['file']),
+                                 'r', manifest['format'],
+                                 manifest['compress']) as table_file:
+                table_rows = RowsCounter(
+                    ROWS_READERS[manifest['format']](table_file))
+                db_connector.insert_data(
+                    table_name, tuple(table_manifest['columns']),
+                    table_rows, batch_size)
+            if table_rows.count != table_manifest['rows']:
+                raise ValueError(f'{table_manifest["file"]} file has '
+                                 f'{table_rows.count} rows instead of '
+                                 f'{table_manifest["rows"]}')
+            imported_rows[table_name] = table_rows.count
+
+    initialize_db_indexes(db_connector)
+    if USE_SHIP_CONFIGURATIONS_TABLE:
+        enable_ship_configurations(db_connector)
+    foreign_key_violations = db_connector.select_with_query(
+        FOREIGN_KEY_CHECK_QUERY)
+    if foreign_key_violations:
+        logging.warning(f'{len(foreign_key_violations)} foreign key '
+                        f'violations are found in imported data')
+    return {
+        'rows': imported_rows,
+        'foreign_key_violations': len(foreign_key_violations or []),
+    }
+
+
+def main() -> None:
+    """
+    Function provides command line entry point for exporting and importing
+    databases
+    """
+    parser = argparse.ArgumentParser(
+        description='Streaming database export/import')
+    parser.add_argument('command', choices=('export', 'import'))
+    parser.add_argument('path', help='directory with exported database')
+    parser.add_argument('--db-name', default=DB_NAME, help='database file')
+    parser.add_argument('--format', choices=TRANSFER_FORMATS,
+                        default=TRANSFER_FORMAT, help='export format')
+    parser.add_argument('--compress', action='store_true',
+                        help='compress exported files with gzip')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    profile = (DB_GENERATION_PROFILE if args.command == 'import'
+               else DB_CONNECTION_PROFILE)
+    with DBConnector(args.db_name, profile=profile) as db:
+        if args.command == 'export':
+            export_database(db, args.path, args.format, args.compress)
+        else:
+            print(json.dumps(import_database(db, args.path), indent=2))
+
+
+if __name__ == '__main__':
+    main()
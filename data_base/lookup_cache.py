@@ -0,0 +1,97 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from configs.db_constants_and_configs import LOOKUP_CACHE_SIZE
+from data_base.db_processing import DBConnector
+
+MISSING = object()
+
+
+class LookupCache:
+    """
+    Class that provides bounded LRU cache for values read from database,
+    every value is stored with the version of the table it was read from
+    and is treated as stale once the table version changes
+    """
+    def __init__(self, max_size: int = LOOKUP_CACHE_SIZE):
+        self.max_size = max_size
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'invalidations': 0,
+                        'evictions': 0}
+
+    def get(self, key: Hashable, table_version: tuple) -> Any:
+        """
+        Method returns cached value if it's still valid
+        :param key: key of the cached value
+        :param table_version: current version of the table the value
+                              was read from
+        :return: cached value or MISSING object
+        """
+        with self.__lock:
+            cached_item = self.__items.get(key)
+            if cached_item is None:
+                self.__stats['misses'] += 1
+                return MISSING
+            if cached_item[0] != table_version:
+                del self.__items[key]
+                self.__stats['invalidations'] += 1
+                self.__stats['misses'] += 1
+                return MISSING
+
+            self.__items.move_to_end(key)
+            self.__stats['hits'] += 1
+            return cached_item[1]
+
+    def put(self, key: Hashable, table_version: tuple, value: Any) -> None:
+        """
+        Method stores value in the cache, the least recently used value
+        is evicted if cache is full
+        :param key: key of the cached value
+        :param table_version: version of the table the value was read from
+        :param value: value that should be cached
+        """
+        with self.__lock:
+            self.__items[key] = (table_version, value)
+            self.__items.move_to_end(key)
+            if len(self.__items) > self.max_size:
+                self.__items.popitem(last=False)
+                self.__stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """
+        Method removes all values from the cache
+        """
+        with self.__lock:
+            self.__items.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Method returns cache statistics
+        :return: dict with hits, misses, invalidations, evictions counters
+                 and current cache size
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['size'] = len(self.__items)
+        stats['max_size'] = self.max_size
+        return stats
+
+
+_connectors_caches = weakref.WeakKeyDictionary()
+_connectors_caches_lock = threading.Lock()
+
+
+def get_lookup_cache(db_connector: DBConnector) -> LookupCache:
+    """
+    Function returns lookup cache of the database connector
+    (the cache is created on the first call)
+    :param db_connector: database connector object
+    :return: lookup cache object
+    """
+    with _connectors_caches_lock:
+        if db_connector not in _connectors_caches:
+            _connectors_caches[db_connector] = LookupCache()
+        return _connectors_caches[db_connector]
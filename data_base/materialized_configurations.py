@@ -0,0 +1,218 @@
+import argparse
+import logging
+from typing import Optional
+
+from configs.db_constants_and_configs import SHIP_CONFIGURATIONS_TABLE, DB_NAME
+from data_base.db_processing import DBConnector
+from data_base.ship_configurations import (SHIPS_TABLE,
+                                           build_ship_configurations_query)
+from utils.db_config_utils import (get_table_columns, get_primary_key,
+                                   get_foreign_keys)
+
+CONFIGURATIONS_TRIGGERS = ('insert', 'update', 'delete')
+
+
+def get_configuration_option_column(component_name: str,
+                                    option_name: str) -> str:
+    """
+    Function returns column name of the component option in materialized
+    ship configurations table, e.g. ('weapon', '"reload speed"') ->
+    '"weapon_reload speed"'
+    :param component_name: ship component name (column of Ships table)
+    :param option_name: option column name of the component table
+    :return: quoted column name
+    """
+    return f'"{component_name}_{option_name.strip(chr(34))}"'
+
+
+def get_configuration_options_columns(component_name: str) -> tuple:
+    """
+    Function returns columns with options of the ship component in
+    materialized ship configurations table
+    :param component_name: ship component name (column of Ships table)
+    :return: tuple with column names in the component table order
+    """
+    component_table = {column_name: referenced_table
+                       for column_name, referenced_table, _
+                       in get_foreign_keys(SHIPS_TABLE)}[component_name]
+    return tuple(get_configuration_option_column(component_name, option_name)
+                 for option_name in get_table_columns(component_table)[1:])
+
+
+def get_configurations_columns() -> tuple:
+    """
+    Function returns columns of materialized ship configurations table
+    derived from TABLES_CONFIG, their order is the same as the order of
+    build_ship_configurations_query output
+    :return: tuple with column names
+    """
+    components = [component_name for component_name, _, _
+                  in get_foreign_keys(SHIPS_TABLE)]
+    columns = [get_primary_key(SHIPS_TABLE), *components]
+    for component_name in components:
+        columns.extend(get_configuration_options_columns(component_name))
+    return tuple(columns)
+
+
+def get_configurations_table_config() -> dict:
+    """
+    Function returns fields configuration of materialized ship
+    configurations table: one row per ship with components ids and all
+    components options. Columns have no types, so values are stored
+    exactly as they are in the source tables (in any schema)
+    :return: dict with table fields configuration
+    """
+    columns = get_configurations_columns()
+    table_config = {col_name: '' for col_name in columns}
+    table_config[columns[0]] = 'PRIMARY KEY'
+    return table_config
+
+
+def build_configurations_fill_query(condition: Optional[str] = None) -> str:
+    """
+    Function provides building query that writes joined configurations
+    of ships into materialized table
+    :param condition: SQL-condition selecting ships, None - all ships
+    :return: SQL-query
+    """
+    return (f'INSERT OR REPLACE INTO {SHIP_CONFIGURATIONS_TABLE} '
+            f'({", ".join(get_configurations_columns())}) '
+            f'{build_ship_configurations_query(condition)}')
+
+
+def build_configurations_triggers_queries() -> list:
+    """
+    Function provides building queries that create triggers keeping
+    materialized ship configurations up to date: changed ships are
+    joined again, changed components options are copied to every ship
+    that references them
+    :return: list of SQL-queries
+    """
+    ship_key = get_primary_key(SHIPS_TABLE)
+    delete_old_ship = (f'DELETE FROM {SHIP_CONFIGURATIONS_TABLE} '
+                       f'WHERE {ship_key} = OLD.{ship_key};')
+    insert_new_ship = build_configurations_fill_query(
+        f'{SHIPS_TABLE}.{ship_key} = NEW.{ship_key}')
+    ships_triggers_bodies = {
+        'insert': insert_new_ship,
+        'update': f'{delete_old_ship} {insert_new_ship}',
+        'delete': delete_old_ship,
+    }
+    triggers_queries = [
+        f'CREATE TRIGGER IF NOT EXISTS '
+        f'{SHIP_CONFIGURATIONS_TABLE}_{SHIPS_TABLE}_{action} '
+        f'AFTER {action.upper()} ON {SHIPS_TABLE} '
+        f'BEGIN {ships_triggers_bodies[action]} END;'
+        for action in CONFIGURATIONS_TRIGGERS]
+
+    for component_name, component_table, component_key in (
+            get_foreign_keys(SHIPS_TABLE)):
+        options = ', '.join(get_table_columns(component_table)[1:])
+        configuration_options = ', '.join(
+            get_configuration_options_columns(component_name))
+        changed_keys = {
+            'insert': f'NEW.{component_key}',
+            'update': f'OLD.{component_key}, NEW.{component_key}',
+            'delete': f'OLD.{component_key}',
+        }
+        for action in CONFIGURATIONS_TRIGGERS:
+            triggers_queries.append(
+                f'CREATE TRIGGER IF NOT EXISTS '
+                f'{SHIP_CONFIGURATIONS_TABLE}_{component_table}_{action} '
+                f'AFTER {action.upper()} ON {component_table} BEGIN '
+                f'UPDATE {SHIP_CONFIGURATIONS_TABLE} '
+                f'SET ({configuration_options}) = ('
+                f'SELECT {options} FROM {component_table} '
+                f'WHERE {component_key} = '
+                f'{SHIP_CONFIGURATIONS_TABLE}.{component_name}) '
+                f'WHERE {component_name} IN ({changed_keys[action]}); END;')
+    return triggers_queries
+
+
+def get_configurations_triggers() -> list:
+    """
+    Function returns names of triggers maintaining materialized ship
+    configurations
+    :return: list of trigger names
+    """
+    tables = [SHIPS_TABLE] + [component_table for _, component_table, _
+                              in get_foreign_keys(SHIPS_TABLE)]
+    return [f'{SHIP_CONFIGURATIONS_TABLE}_{table_name}_{action}'
+            for table_name in tables for action in CONFIGURATIONS_TRIGGERS]
+
+
+def rebuild_ship_configurations(db_connector: DBConnector) -> None:
+    """
+    Function provides full rebuild of materialized ship configurations
+    by one bulk statement, e.g. after bulk data loading, the table is
+    cleared and filled in one transaction
+    :param db_connector: database connector object
+    """
+    logging.info(f'Rebuild {SHIP_CONFIGURATIONS_TABLE} in '
+                 f'{db_connector.db_name} database')
+    with db_connector.transaction():
+        db_connector.execute_with_query(
+            f'DELETE FROM {SHIP_CONFIGURATIONS_TABLE};')
+        db_connector.execute_with_query(build_configurations_fill_query())
+
+
+def enable_ship_configurations(db_connector: DBConnector) -> None:
+    """
+    Function provides creating materialized ship configurations table,
+    filling it and creating triggers that maintain it on every change
+    Note: it's much faster to enable materialized configurations after
+    bulk data insertion (or to rebuild them after it)
+    :param db_connector: database connector object
+    """
+    logging.info(f'Enable {SHIP_CONFIGURATIONS_TABLE} in '
+                 f'{db_connector.db_name} database')
+    if not db_connector.has_table(SHIP_CONFIGURATIONS_TABLE):
+        db_connector.add_table(SHIP_CONFIGURATIONS_TABLE,
+                               get_configurations_table_config())
+    rebuild_ship_configurations(db_connector)
+    for trigger_query in build_configurations_triggers_queries():
+        db_connector.execute_with_query(trigger_query)
+
+
+def disable_ship_configurations(db_connector: DBConnector) -> None:
+    """
+    Function provides dropping materialized ship configurations table
+    and its triggers
+    :param db_connector: database connector object
+    """
+    logging.info(f'Disable {SHIP_CONFIGURATIONS_TABLE} in '
+                 f'{db_connector.db_name} database')
+    for trigger_name in get_configurations_triggers():
+        db_connector.execute_with_query(
+            f'DROP TRIGGER IF EXISTS {trigger_name};')
+    if db_connector.has_table(SHIP_CONFIGURATIONS_TABLE):
+        db_connector.drop_table(SHIP_CONFIGURATIONS_TABLE)
+
+
+CONFIGURATIONS_COMMANDS = {
+    'enable': enable_ship_configurations,
+    'rebuild': rebuild_ship_configurations,
+    'disable': disable_ship_configurations,
+}
+
+
+def main() -> None:
+    """
+    Function provides command line entry point for managing materialized
+    ship configurations of existing database
+    """
+    parser = argparse.ArgumentParser(
+        description='Materialized ship configurations management')
+    parser.add_argument('command', choices=CONFIGURATIONS_COMMANDS,
+                        help='enable, rebuild (e.g. after bulk loading) or '
+                             'disable materialized configurations')
+    parser.add_argument('--db-name', default=DB_NAME, help='database file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with DBConnector(args.db_name) as db:
+        CONFIGURATIONS_COMMANDS[args.command](db)
+
+
+if __name__ == '__main__':
+    main()
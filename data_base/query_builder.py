@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Optional
+
+from configs.db_constants_and_configs import (SIMPLE_SELECT_QUERY,
+                                              WHERE_CLAUSE, JOIN_CLAUSE,
+                                              CONDITION_OPERATORS,
+                                              QUERY_SHAPES_CACHE_SIZE)
+
+
+def parse_conditions(conditions: Optional[list]) -> tuple:
+    """
+    Function provides splitting structured conditions into query shape
+    and query parameters
+    :param conditions: list of tuples in the following format:
+                       [(column_name, operator, value), ...]
+                       value should be a list or a tuple for IN operator
+    :return: tuple in the following format:
+    (((column_name, operator, number_of_values), ...), (value, ...))
+    """
+    conditions_shape = []
+    query_data = []
+    for column_name, operator, value in conditions or []:
+        operator = operator.upper()
+        if operator not in CONDITION_OPERATORS:
+            raise ValueError(f'Unsupported condition operator: {operator}')
+        if operator == 'IN':
+            conditions_shape.append((column_name, operator, len(value)))
+            query_data.extend(value)
+        else:
+            conditions_shape.append((column_name, operator, 1))
+            query_data.append(value)
+
+    return tuple(conditions_shape), tuple(query_data)
+
+
+@lru_cache(maxsize=QUERY_SHAPES_CACHE_SIZE)
+def build_select_query(table_name: str, columns_to_select: tuple,
+                       conditions_shape: tuple = (),
+                       join: Optional[tuple] = None) -> str:
+    """
+    Function provides building parametrized select query. The query text
+    depends only on the query shape, so it's built once per shape and
+    the same text is reused by sqlite3 statements cache
+    :param table_name: name of the table where data should be selected
+    :param columns_to_select: tuple of columns that will be selected
+    :param conditions_shape: conditions shape from parse_conditions function
+    :param join: tuple in the following format:
+                 (another_table_name, join_field)
+    :return: SQL-query with "?" placeholders for condition values
+    """
+    columns_query = ', '.join(columns_to_select)
+    from_query = table_name
+    if join:
+        another_table_name, join_field = join
+        from_query += ' ' + JOIN_CLAUSE.format(
+            another_table_name,
+            f'{table_name}.{join_field} = {another_table_name}.{join_field}')
+
+    if conditions_shape:
+        condition_query = ' AND '.join(
+            f'{column_name} IN ({", ".join(["?"] * number_of_values)})'
+            if operator == 'IN' else f'{column_name} {operator} ?'
+            for column_name, operator, number_of_values in conditions_shape)
+        from_query += ' ' + WHERE_CLAUSE.format(condition_query)
+
+    return SIMPLE_SELECT_QUERY.format(columns_query, from_query)
@@ -0,0 +1,149 @@
+import re
+import threading
+from collections import deque
+from typing import Optional
+
+from configs.db_constants_and_configs import (SLOW_QUERY_THRESHOLD_MS,
+                                              QUERY_STATS_MAX_SAMPLES,
+                                              QUERY_STATS_MAX_SLOW_QUERIES)
+from utils.stats_utils import get_latency_summary
+
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+PARAMETERS_LIST_PATTERN = re.compile(r'\?(?:\s*,\s*\?)+')
+WHITESPACES_PATTERN = re.compile(r'\s+')
+
+
+def get_query_shape(query: str) -> str:
+    """
+    Function returns shape of the SQL-query: literals are replaced with
+    placeholders, so queries that differ only by values have the same shape
+    :param query: SQL-query
+    :return: normalized SQL-query text
+    """
+    query_shape = STRING_LITERAL_PATTERN.sub('?', query)
+    query_shape = NUMBER_LITERAL_PATTERN.sub('?', query_shape)
+    query_shape = PARAMETERS_LIST_PATTERN.sub('?, ...', query_shape)
+    return WHITESPACES_PATTERN.sub(' ', query_shape).strip()
+
+
+class QueryStats:
+    """
+    Class that provides collecting statistics of executed SQL-queries
+    grouped by query shape and log of the latest slow queries
+    """
+    def __init__(self,
+                 slow_query_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+                 max_samples: int = QUERY_STATS_MAX_SAMPLES,
+                 max_slow_queries: int = QUERY_STATS_MAX_SLOW_QUERIES):
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.max_samples = max_samples
+        self.__lock = threading.Lock()
+        self.__shapes = {}
+        self.__slow_queries = deque(maxlen=max_slow_queries)
+
+    def is_slow(self, duration: float) -> bool:
+        """
+        Method checks if query duration exceeds slow query threshold
+        :param duration: query duration in seconds
+        :return: True - if query is slow
+        """
+        return duration * 1000 >= self.slow_query_threshold_ms
+
+    def record(self, query: str, duration: float, rows: int,
+               query_plan: Optional[list] = None) -> None:
+        """
+        Method provides recording executed query
+        :param query: executed SQL-query
+        :param duration: query duration in seconds
+        :param rows: number of rows returned (or affected) by the query
+        :param query_plan: query plan steps details for slow queries
+        """
+        query_shape = get_query_shape(query)
+        with self.__lock:
+            shape_stats = self.__shapes.setdefault(query_shape, {
+                'calls': 0, 'rows': 0, 'total_time': 0.0,
+                'latencies': deque(maxlen=self.max_samples)})
+            shape_stats['calls'] += 1
+            shape_stats['rows'] += rows
+            shape_stats['total_time'] += duration
+            shape_stats['latencies'].append(duration)
+            if self.is_slow(duration):
+                self.__slow_queries.append({
+                    'query': query_shape,
+                    'duration_ms': duration * 1000,
+                    'rows': rows,
+                    'query_plan': query_plan or [],
+                })
+
+    def reset(self) -> None:
+        """
+        Method removes all collected statistics
+        """
+        with self.__lock:
+            self.__shapes.clear()
+            self.__slow_queries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Method returns statistics for every query shape
+        :return: dict in the following format:
+        {query_shape: {'calls': ..., 'rows': ..., 'total_ms': ...,
+                       'mean_ms': ..., 'p50_ms': ..., 'p95_ms': ...,
+                       'p99_ms': ..., 'max_ms': ...}, ...}
+        Note: percentiles are calculated over the last max_samples calls
+        """
+        with self.__lock:
+            shapes = {query_shape: (dict(shape_stats),
+                                    list(shape_stats['latencies']))
+                      for query_shape, shape_stats in self.__shapes.items()}
+
+        result = {}
+        for query_shape, (shape_stats, latencies) in shapes.items():
+            latency_summary = get_latency_summary(latencies)
+            latency_summary.update({
+                'calls': shape_stats['calls'],
+                'rows': shape_stats['rows'],
+                'total_ms': shape_stats['total_time'] * 1000,
+                'mean_ms': (shape_stats['total_time'] * 1000 /
+                            shape_stats['calls']),
+            })
+            del latency_summary['count']
+            result[query_shape] = latency_summary
+        return result
+
+    def get_slow_queries(self) -> list:
+        """
+        Method returns log of the latest slow queries (oldest ones are
+        dropped when max_slow_queries is exceeded)
+        :return: list of dicts in the following format:
+        [{'query': ..., 'duration_ms': ..., 'rows': ...,
+          'query_plan': [...]}, ...]
+        """
+        with self.__lock:
+            return list(self.__slow_queries)
+
+    def format_report(self, top: int = 10) -> list:
+        """
+        Method provides human-readable report of the slowest query shapes
+        :param top: number of query shapes with the biggest total time
+        :return: list of report lines
+        """
+        stats = sorted(self.get_stats().items(),
+                       key=lambda shape_stats: shape_stats[1]['total_ms'],
+                       reverse=True)
+        report = []
+        for query_shape, shape_stats in stats[:top]:
+            report.append(
+                f'{shape_stats["total_ms"]:10.2f} ms total, '
+                f'{shape_stats["calls"]:7d} calls, '
+                f'p50 {shape_stats["p50_ms"]:.3f} ms, '
+                f'p95 {shape_stats["p95_ms"]:.3f} ms, '
+                f'p99 {shape_stats["p99_ms"]:.3f} ms, '
+                f'{shape_stats["rows"]} rows: {query_shape}')
+        for slow_query in self.get_slow_queries():
+            report.append(f'slow query {slow_query["duration_ms"]:.2f} ms: '
+                          f'{slow_query["query"]}')
+            report.extend(f'    {plan_step}'
+                          for plan_step in slow_query['query_plan'])
+        return report
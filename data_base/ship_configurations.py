@@ -0,0 +1,143 @@
+from typing import Iterable, Iterator, Optional
+
+from utils.db_config_utils import (get_table_columns, get_primary_key,
+                                   get_foreign_keys)
+
+SHIPS_TABLE = 'Ships'
+
+
+def build_ship_configurations_query(condition: Optional[str] = None) -> str:
+    """
+    Function provides building query that joins Ships table with all
+    component tables described in Ships foreign keys
+    :param condition: SQL-condition of WHERE clause, None - select all ships
+    :return: SQL-query, each output row has the following format:
+    (ship, component_0, ..., component_n,
+     component_0_option_0, ..., component_n_option_m)
+    """
+    ship_key = get_primary_key(SHIPS_TABLE)
+    foreign_keys = get_foreign_keys(SHIPS_TABLE)
+    columns_to_select = [f'{SHIPS_TABLE}.{ship_key}']
+    columns_to_select.extend(f'{SHIPS_TABLE}.{component_name}'
+                             for component_name, _, _ in foreign_keys)
+    join_query = []
+    for component_name, component_table, component_key in foreign_keys:
+        columns_to_select.extend(
+            f'{component_table}.{option}'
+            for option in get_table_columns(component_table)[1:])
+        join_query.append(
+            f'LEFT JOIN {component_table} ON {SHIPS_TABLE}.{component_name} '
+            f'= {component_table}.{component_key}')
+
+    if condition is not None:
+        join_query.append(f'WHERE {condition}')
+    return (f'SELECT {", ".join(columns_to_select)} FROM {SHIPS_TABLE} '
+            f'{" ".join(join_query)};')
+
+
+class ShipConfigurations:
+    """
+    Class that provides compact in-memory storage of ship configurations:
+    every ship keeps only ids of its components and options of every
+    component are stored once
+    """
+    def __init__(self):
+        foreign_keys = get_foreign_keys(SHIPS_TABLE)
+        self.components = tuple(component_name for component_name, _, _
+                                in foreign_keys)
+        self.options_names = {
+            component_name: get_table_columns(component_table)[1:]
+            for component_name, component_table, _ in foreign_keys}
+        self.ships = {}
+        self.options = {component_name: {}
+                        for component_name in self.components}
+
+    def __len__(self) -> int:
+        return len(self.ships)
+
+    def __contains__(self, ship_id: str) -> bool:
+        return ship_id in self.ships
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ships)
+
+    def add_row(self, row: tuple) -> None:
+        """
+        Method provides adding ship configuration from the row of
+        build_ship_configurations_query output
+        :param row: tuple with ship configuration data
+        """
+        components_ids = row[1:len(self.components) + 1]
+        self.ships[row[0]] = components_ids
+        options_index = len(self.components) + 1
+        for component_name, component_id in zip(self.components,
+                                                components_ids):
+            options_number = len(self.options_names[component_name])
+            component_options = self.options[component_name]
+            if component_id not in component_options:
+                component_options[component_id] = row[
+                    options_index:options_index + options_number]
+            options_index += options_number
+
+    def get_parameter(self, ship_id: str, param_name: str) -> str:
+        """
+        Method returns ship parameter value
+        (the same as get_ship_parameter function)
+        :param ship_id: concrete id of the ship
+        :param param_name: parameter name that should be selected
+        :return: parameter value
+        """
+        component_index = self.components.index(param_name)
+        return self.ships[ship_id][component_index].strip("'")
+
+    def get_parameter_options(self, ship_id: str, param_name: str) -> dict:
+        """
+        Method returns ship parameter options
+        (the same as get_ship_parameter_options function)
+        :param ship_id: concrete id of the ship
+        :param param_name: parameter name that options should be selected
+        :return: dict with option values following next format:
+        {option_name: option_value, ...}
+        """
+        component_id = self.ships[ship_id][self.components.index(param_name)]
+        return dict(zip(self.options_names[param_name],
+                        self.options[param_name][component_id]))
+
+    def get_component(self, ship_id: str, param_name: str) -> tuple:
+        """
+        Method returns ship component value and its options, missing ship
+        has None value and empty options
+        :param ship_id: concrete id of the ship
+        :param param_name: component name
+        :return: tuple in the following format: (value, options)
+        """
+        if ship_id not in self.ships:
+            return None, {}
+        return (self.get_parameter(ship_id, param_name),
+                self.get_parameter_options(ship_id, param_name))
+
+
+def compare_ship_configurations(expected: ShipConfigurations,
+                                actual: ShipConfigurations,
+                                test_cases: Iterable[tuple]) -> list:
+    """
+    Function provides comparing ship components of two configurations
+    :param expected: configurations loaded from original database
+    :param actual: configurations loaded from dumped database
+    :param test_cases: iterable with (ship_id, component_name) pairs
+    :return: list of failed pairs following next format:
+    [(ship_id, component_name, (expected_value, actual_value),
+      (expected_options, actual_options)), ...]
+    """
+    failed_cases = []
+    for ship_id, component_name in test_cases:
+        expected_value, expected_options = expected.get_component(
+            ship_id, component_name)
+        actual_value, actual_options = actual.get_component(ship_id,
+                                                            component_name)
+        if (expected_value, expected_options) != (actual_value,
+                                                  actual_options):
+            failed_cases.append((ship_id, component_name,
+                                 (expected_value, actual_value),
+                                 (expected_options, actual_options)))
+    return failed_cases
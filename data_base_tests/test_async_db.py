@@ -0,0 +1,86 @@
+import asyncio
+
+from configs.db_constants_and_configs import NUMBER_OF_ROWS_PER_TABLE
+from data_base.async_db_commands import (compare_ships_configuration_async,
+                                         gather_with_concurrency,
+                                         get_ship_parameter_async)
+from data_base.async_db_processing import AsyncDBConnector
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   generate_updated_db_data,
+                                   get_ship_parameter)
+from data_base.db_diff import compare_databases
+from data_base.db_processing import DBConnector
+
+ROWS_PER_TABLE = dict(NUMBER_OF_ROWS_PER_TABLE, Ships=50)
+COMPONENTS = ('weapon', 'hull', 'engine')
+
+
+def test_async_comparison_matches_diff_engine(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    dumped_db_name = str(tmp_path / 'dumped.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db, rows_per_table=ROWS_PER_TABLE)
+        db.dump_db(dumped_db_name)
+        with DBConnector(dumped_db_name) as dumped_db:
+            generate_updated_db_data(dumped_db, ROWS_PER_TABLE)
+        expected_report = compare_databases(db, dumped_db_name)['ships']
+        expected_hull = get_ship_parameter(db, 'ship-0', 'hull')
+
+    test_cases = [(f'ship-{index}', component)
+                  for index in range(ROWS_PER_TABLE['Ships'])
+                  for component in COMPONENTS]
+
+    async def run_comparison():
+        async with AsyncDBConnector(original_db_name, workers=3) as async_db, \
+                AsyncDBConnector(dumped_db_name, workers=3) as async_dumped_db:
+            hull = await get_ship_parameter_async(async_db, 'ship-0', 'hull')
+            ships = await async_db.select_wo_condition('Ships', ['ship'])
+            report = await compare_ships_configuration_async(
+                async_db, async_dumped_db, test_cases, concurrency=8)
+        return hull, ships, report
+
+    hull, ships, report = asyncio.run(run_comparison())
+
+    assert hull == expected_hull
+    assert len(ships) == ROWS_PER_TABLE['Ships']
+    assert report and report == expected_report
+
+
+def test_gather_with_concurrency_limits_running_awaitables():
+    running = []
+    max_running = []
+
+    async def sleep_and_return(value: int) -> int:
+        running.append(value)
+        max_running.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(value)
+        return value
+
+    result = asyncio.run(gather_with_concurrency(
+        (sleep_and_return(value) for value in range(20)), concurrency=3))
+
+    assert result == list(range(20))
+    assert max(max_running) == 3
+
+
+def test_gather_with_concurrency_creates_awaitables_lazily():
+    finished = []
+    pending_numbers = []
+
+    async def sleep_and_return(value: int) -> int:
+        await asyncio.sleep(0.001)
+        finished.append(value)
+        return value
+
+    def create_awaitables():
+        for value in range(100):
+            pending_numbers.append(value - len(finished))
+            yield sleep_and_return(value)
+
+    result = asyncio.run(gather_with_concurrency(create_awaitables(),
+                                                 concurrency=4))
+
+    assert result == list(range(100))
+    assert max(pending_numbers) <= 4
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from configs.db_constants_and_configs import TABLES_CONFIG
+from data_base.compact_schema import is_compact_schema
+from data_base.db_commands import (initialize_db, initialize_db_indexes,
+                                   generate_random_db_data,
+                                   generate_updated_db_data,
+                                   get_ship_parameter,
+                                   get_ship_parameter_options,
+                                   load_ship_configurations)
+from data_base.db_diff import compare_databases
+from data_base.db_processing import DBConnector
+
+ROWS_PER_TABLE = {'weapons': 20, 'hulls': 5, 'engines': 6, 'Ships': 2000}
+
+
+def build_db(db_name: str, compact: bool = False,
+             without_rowid: bool = False) -> None:
+    with DBConnector(db_name) as db:
+        initialize_db(db, compact, without_rowid)
+        generate_random_db_data(db, seed=1, rows_per_table=ROWS_PER_TABLE)
+        initialize_db_indexes(db)
+
+
+@pytest.mark.parametrize('without_rowid', [False, True])
+def test_compact_schema_keeps_string_lookups(tmp_path, without_rowid):
+    regular_db_name = str(tmp_path / 'regular.db')
+    compact_db_name = str(tmp_path / 'compact.db')
+    build_db(regular_db_name)
+    build_db(compact_db_name, compact=True, without_rowid=without_rowid)
+
+    with DBConnector(regular_db_name) as regular_db, \
+            DBConnector(compact_db_name) as compact_db:
+        assert not is_compact_schema(regular_db)
+        assert is_compact_schema(compact_db)
+        assert compact_db.select_with_query(
+            'SELECT typeof(ship), typeof(weapon) FROM Ships LIMIT 1;'
+        ) == [('integer', 'integer')]
+        for ship_id in ('ship-0', 'ship-1999'):
+            for param_name in ('weapon', 'hull', 'engine'):
+                assert get_ship_parameter(compact_db, ship_id,
+                                          param_name) == \
+                    get_ship_parameter(regular_db, ship_id, param_name)
+                assert get_ship_parameter_options(compact_db, ship_id,
+                                                  param_name) == \
+                    get_ship_parameter_options(regular_db, ship_id,
+                                               param_name)
+        assert load_ship_configurations(compact_db).ships == \
+            load_ship_configurations(regular_db).ships
+
+    assert os.path.getsize(compact_db_name) < \
+        os.path.getsize(regular_db_name)
+
+
+def test_compact_schema_diff_reports_string_ids(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    dumped_db_name = str(tmp_path / 'dumped.db')
+    build_db(original_db_name, compact=True)
+    with DBConnector(original_db_name) as db:
+        expected_hull = get_ship_parameter(db, 'ship-0', 'hull')
+        actual_hull_id = (int(expected_hull.split('-')[1]) + 1) % \
+            ROWS_PER_TABLE['hulls']
+        db.dump_db(dumped_db_name)
+        with DBConnector(dumped_db_name) as dumped_db:
+            dumped_db.update_data('Ships', ('ship', 0, 'hull',
+                                            actual_hull_id))
+        report = compare_databases(db, dumped_db_name)
+
+    actual_hull = f'hull-{actual_hull_id}'
+    assert report['tables'] == dict(
+        {table_name: {} for table_name in TABLES_CONFIG},
+        Ships={'ship-0': {'hull': (expected_hull, actual_hull)}})
+    assert report['ships'][('ship-0', 'hull')]['value'] == (
+        expected_hull, actual_hull)
+
+
+def test_compact_schema_updated_data(tmp_path):
+    db_name = str(tmp_path / 'compact.db')
+    build_db(db_name, compact=True)
+    with DBConnector(db_name) as db:
+        generate_updated_db_data(db, rows_per_table=ROWS_PER_TABLE)
+        assert db.select_with_query(
+            'SELECT COUNT(*) FROM Ships WHERE typeof(hull) != "integer";'
+        ) == [(0, )]
@@ -0,0 +1,48 @@
+from configs.db_constants_and_configs import TABLES_CONFIG
+from data_base.dataset_cache import (DatasetCache, build_random_db,
+                                     get_dataset_fingerprint)
+from data_base.db_processing import DBConnector
+
+
+def select_tables(db: DBConnector) -> dict:
+    return {table_name: db.select_wo_condition(table_name, ['*'])
+            for table_name in TABLES_CONFIG}
+
+
+def test_build_random_db_restores_cached_dataset(tmp_path):
+    dataset_cache = DatasetCache(str(tmp_path / 'cache'))
+    tables_data = []
+    restored = []
+    for db_index in range(2):
+        with DBConnector(str(tmp_path / f'{db_index}.db')) as db:
+            restored.append(build_random_db(db, seed=1,
+                                            dataset_cache=dataset_cache))
+            tables_data.append(select_tables(db))
+            indexes = db.select_with_query(
+                'SELECT name FROM sqlite_master WHERE type = "index" '
+                'AND name LIKE "idx_%";')
+
+    assert restored == [False, True]
+    assert tables_data[0] == tables_data[1]
+    assert indexes
+    assert len(dataset_cache.get_entries()) == 1
+
+
+def test_dataset_without_seed_is_not_cached(tmp_path):
+    dataset_cache = DatasetCache(str(tmp_path / 'cache'))
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        assert not build_random_db(db, dataset_cache=dataset_cache)
+
+    assert dataset_cache.get_entries() == []
+
+
+def test_dataset_cache_evicts_least_recently_used_entries(tmp_path):
+    dataset_cache = DatasetCache(str(tmp_path / 'cache'), max_size=1)
+    for seed in range(3):
+        with DBConnector(str(tmp_path / f'{seed}.db')) as db:
+            build_random_db(db, seed=seed, dataset_cache=dataset_cache)
+
+    assert [path for path, _, _ in dataset_cache.get_entries()] == [
+        dataset_cache.get_path(get_dataset_fingerprint(2))]
+    assert get_dataset_fingerprint(1) != get_dataset_fingerprint(
+        1, workers=2)
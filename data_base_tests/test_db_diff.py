@@ -0,0 +1,31 @@
+from configs.db_constants_and_configs import TABLES_CONFIG
+from data_base.db_commands import initialize_db, generate_random_db_data
+from data_base.db_diff import compare_databases
+from data_base.db_processing import DBConnector
+
+
+def test_compare_databases_finds_changed_rows(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    dumped_db_name = str(tmp_path / 'dumped.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        db.dump_db(dumped_db_name)
+        with DBConnector(dumped_db_name) as dumped_db:
+            assert compare_databases(db, dumped_db_name) == {
+                'tables': {table_name: {} for table_name in TABLES_CONFIG},
+                'ships': {},
+            }
+
+            dumped_db.update_data('Ships', ('ship', 'ship-0', 'hull',
+                                            'hull-unknown'))
+            report = compare_databases(db, dumped_db_name)
+
+        expected_hull = db.select_with_query(
+            'SELECT hull FROM Ships WHERE ship = "ship-0";')[0][0]
+
+    assert report['tables']['Ships'] == {
+        'ship-0': {'hull': (expected_hull, 'hull-unknown')}}
+    assert report['ships'][('ship-0', 'hull')]['value'] == (expected_hull,
+                                                            'hull-unknown')
+    assert set(report['ships']) == {('ship-0', 'hull')}
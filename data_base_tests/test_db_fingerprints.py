@@ -0,0 +1,57 @@
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              NUMBER_OF_ROWS_PER_TABLE)
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   generate_updated_db_data)
+from data_base.db_diff import compare_databases
+from data_base.db_fingerprints import (enable_fingerprints,
+                                       compare_fingerprints,
+                                       get_table_fingerprint)
+from data_base.db_processing import DBConnector
+
+
+def test_fingerprints_find_changed_rows(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    dumped_db_name = str(tmp_path / 'dumped.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        enable_fingerprints(db, buckets=16)
+        db.dump_db(dumped_db_name)
+        assert compare_fingerprints(db, dumped_db_name) == {
+            table_name: [] for table_name in TABLES_CONFIG}
+
+        with DBConnector(dumped_db_name) as dumped_db:
+            generate_updated_db_data(dumped_db)
+            dumped_db.insert_data('hulls', ('hull', 'armor', 'type',
+                                            'capacity'),
+                                  [('hull-new', 1, 1, 1)])
+            dumped_db.execute_with_query(
+                'DELETE FROM weapons WHERE weapon = "weapon-0";')
+            ships_fingerprint = get_table_fingerprint(dumped_db, 'Ships')
+
+        changed_keys = compare_fingerprints(db, dumped_db_name)
+        diff_report = compare_databases(db, dumped_db_name)
+
+    assert ships_fingerprint[1] == NUMBER_OF_ROWS_PER_TABLE['Ships']
+    assert 'hull-new' in changed_keys['hulls']
+    assert 'weapon-0' in changed_keys['weapons']
+    assert changed_keys == {
+        table_name: sorted(changed_rows)
+        for table_name, changed_rows in diff_report['tables'].items()}
+
+
+def test_fingerprints_are_restored_after_revert(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        enable_fingerprints(db)
+        fingerprint = get_table_fingerprint(db, 'Ships')
+        hull = db.select_with_query(
+            'SELECT hull FROM Ships WHERE ship = "ship-0";')[0][0]
+
+        db.update_data('Ships', ('ship', 'ship-0', 'hull', 'hull-unknown'))
+        changed_fingerprint = get_table_fingerprint(db, 'Ships')
+        db.update_data('Ships', ('ship', 'ship-0', 'hull', hull))
+
+        assert changed_fingerprint != fingerprint
+        assert get_table_fingerprint(db, 'Ships') == fingerprint
@@ -0,0 +1,22 @@
+from data_base.db_commands import (initialize_db, initialize_db_indexes,
+                                   generate_random_db_data,
+                                   explain_ship_parameter_options,
+                                   get_full_scans, get_used_indexes)
+from data_base.db_processing import DBConnector
+
+
+def test_join_uses_foreign_key_indexes(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        reverse_plan_wo_indexes = explain_ship_parameter_options(
+            db, 'hull', 'hulls.hull')
+        initialize_db_indexes(db)
+        ship_plan = explain_ship_parameter_options(db, 'hull')
+        reverse_plan = explain_ship_parameter_options(db, 'hull',
+                                                      'hulls.hull')
+
+    assert get_full_scans(reverse_plan_wo_indexes)
+    assert not get_full_scans(ship_plan)
+    assert not get_full_scans(reverse_plan)
+    assert 'idx_Ships_hull' in get_used_indexes(reverse_plan)
@@ -0,0 +1,70 @@
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   generate_updated_db_data,
+                                   get_ship_parameter)
+from data_base.db_diff import compare_databases, compare_overlay
+from data_base.db_overlay import OverlayDBConnector
+from data_base.db_processing import DBConnector
+
+
+def test_overlay_keeps_original_db_untouched(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        original_ships = db.select_wo_condition('Ships', ['*'])
+
+    with OverlayDBConnector(original_db_name) as overlay_db:
+        overlay_db.update_data('Ships', ('ship', 'ship-0', 'hull',
+                                         'hull-unknown'))
+        overlay_db.update_data('Ships', ('ship', 'ship-1', 'ship',
+                                         'ship-renamed'))
+        merged_ships = overlay_db.select_wo_condition('Ships', ['ship'])
+        hull = get_ship_parameter(overlay_db, 'ship-0', 'hull')
+        overlay_size = overlay_db.get_overlay_size()
+
+    with DBConnector(original_db_name) as db:
+        assert db.select_wo_condition('Ships', ['*']) == original_ships
+
+    assert hull == 'hull-unknown'
+    assert len(merged_ships) == len(original_ships)
+    assert ('ship-renamed', ) in merged_ships
+    assert ('ship-1', ) not in merged_ships
+    assert overlay_size['Ships'] == 3
+
+
+def test_materialized_overlay_matches_overlay_report(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    materialized_db_name = str(tmp_path / 'materialized.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+
+    with OverlayDBConnector(original_db_name,
+                            str(tmp_path / 'overlay.db')) as overlay_db:
+        generate_updated_db_data(overlay_db)
+        overlay_report = compare_overlay(overlay_db)
+        overlay_db.materialize(materialized_db_name)
+
+    with DBConnector(original_db_name) as db:
+        materialized_report = compare_databases(db, materialized_db_name)
+
+    assert overlay_report['tables']['Ships']
+    assert overlay_report == materialized_report
+
+
+def test_overlay_updates_report_changed_rows(tmp_path):
+    original_db_name = str(tmp_path / 'original.db')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+
+    with OverlayDBConnector(original_db_name) as overlay_db:
+        rows_affected = overlay_db.update_multiple_data('Ships', [
+            ('ship', 'ship-0', 'hull', 'hull-unknown'),
+            ('ship', 'ship-1', 'engine', 'engine-unknown'),
+            ('ship', 'ship-unknown', 'hull', 'hull-unknown'),
+        ])
+        overlay_size = overlay_db.get_overlay_size()
+
+    assert rows_affected == 2
+    assert overlay_size['Ships'] == 2
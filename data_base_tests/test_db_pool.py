@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from data_base.db_pool import PooledDBConnector
+
+TABLE_NAME = 'items'
+TABLE_FIELDS = {'item': 'TEXT PRIMARY KEY', 'power': 'INTEGER'}
+NUMBER_OF_ROWS = 100
+
+
+def test_pooled_connector_reads_from_multiple_threads(tmp_path):
+    with PooledDBConnector(str(tmp_path / 'test.db'), max_readers=4) as db:
+        db.add_table(TABLE_NAME, TABLE_FIELDS)
+        db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS),
+                       [(f'item-{index}', index)
+                        for index in range(NUMBER_OF_ROWS)])
+
+        def select_power(index: int) -> int:
+            return db.select_with_condition(
+                TABLE_NAME, ['power'], [('item', '=', f'item-{index}')])[0][0]
+
+        def update_power(index: int) -> None:
+            db.update_data(TABLE_NAME, ('item', f'item-{index}', 'power',
+                                        index * 2))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            selected_powers = list(executor.map(select_power,
+                                                range(NUMBER_OF_ROWS)))
+            list(executor.map(update_power, range(NUMBER_OF_ROWS)))
+            updated_powers = list(executor.map(select_power,
+                                               range(NUMBER_OF_ROWS)))
+        stats = db.pool.get_stats()
+
+    assert selected_powers == list(range(NUMBER_OF_ROWS))
+    assert updated_powers == [index * 2 for index in range(NUMBER_OF_ROWS)]
+    assert stats['reader_checkouts'] == 2 * NUMBER_OF_ROWS
+    assert stats['checked_out'] == 0
+    assert 1 <= stats['readers_created'] <= 8
+
+
+def test_pooled_connector_attaches_db_to_readers(tmp_path):
+    attached_db_name = str(tmp_path / 'attached.db')
+    with PooledDBConnector(attached_db_name) as attached_db:
+        attached_db.add_table(TABLE_NAME, TABLE_FIELDS)
+        attached_db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS),
+                                [('item-0', 10)])
+
+    with PooledDBConnector(str(tmp_path / 'test.db')) as db:
+        db.attach_db(attached_db_name, 'other')
+        selected_data = db.select_with_query(
+            f'SELECT power FROM other.{TABLE_NAME};')
+        db.detach_db('other')
+
+    assert selected_data == [(10,)]
+
+
+def test_pooled_transaction_isolates_other_threads(tmp_path):
+    with PooledDBConnector(str(tmp_path / 'test.db')) as db:
+        db.add_table(TABLE_NAME, TABLE_FIELDS)
+        db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS), [('item-0', 10)])
+
+        def select_power() -> int:
+            return db.select_with_query(
+                f'SELECT power FROM {TABLE_NAME};')[0][0]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with db.transaction():
+                db.update_data(TABLE_NAME, ('item', 'item-0', 'power', 20))
+                own_power = select_power()
+                other_thread_power = executor.submit(select_power).result()
+            committed_power = executor.submit(select_power).result()
+
+    assert (own_power, other_thread_power, committed_power) == (20, 10, 20)
@@ -0,0 +1,286 @@
+import sqlite3
+
+import pytest
+
+from data_base.db_processing import (DBConnector, get_in_memory_db_name,
+                                     dict_row_factory)
+from data_base.query_builder import build_select_query, parse_conditions
+from data_base.query_stats import QueryStats
+
+TABLE_NAME = 'items'
+TABLE_FIELDS = {'item': 'TEXT PRIMARY KEY', 'power': 'INTEGER',
+                'armor': 'INTEGER'}
+
+
+def create_filled_db(db: DBConnector, number_of_rows: int = 10) -> None:
+    db.add_table(TABLE_NAME, TABLE_FIELDS)
+    db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS),
+                   [(f'item-{index}', index, index)
+                    for index in range(number_of_rows)])
+
+
+def test_update_multiple_data_groups_rows_by_column(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        rows_affected = db.update_multiple_data(TABLE_NAME, [
+            ('item', 'item-0', 'power', 100),
+            ('item', 'item-1', 'armor', 200),
+            ('item', 'item-2', 'power', 300),
+            ('item', 'item-unknown', 'power', 400),
+        ])
+        selected_data = db.select_wo_condition(TABLE_NAME,
+                                               ['item', 'power', 'armor'])
+
+    assert rows_affected == 3
+    assert selected_data[:3] == [('item-0', 100, 0), ('item-1', 1, 200),
+                                 ('item-2', 300, 2)]
+
+
+def test_update_multiple_data_rolls_back_on_error(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        rows_affected = db.update_multiple_data(TABLE_NAME, [
+            ('item', 'item-0', 'power', 100),
+            ('item', 'item-1', 'unknown_column', 200),
+        ])
+        selected_data = db.select_wo_condition(TABLE_NAME, ['power'])
+
+    assert rows_affected == 0
+    assert selected_data[0] == (0,)
+
+
+def test_select_with_condition_binds_parameters(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        selected_data = db.select_with_condition(
+            TABLE_NAME, ['item'], [('power', '>=', 7), ('armor', '!=', 8)])
+        selected_by_list = db.select_with_condition(
+            TABLE_NAME, ['power'], [('item', 'in', ['item-1', 'item-3'])])
+        quoted_data = db.select_with_condition(
+            TABLE_NAME, ['item'], [('item', '=', 'item-"0"')])
+
+    assert selected_data == [('item-7',), ('item-9',)]
+    assert selected_by_list == [(1,), (3,)]
+    assert quoted_data == []
+
+
+def test_select_query_is_built_once_per_shape(tmp_path):
+    build_select_query.cache_clear()
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        for index in range(5):
+            db.select_with_condition(TABLE_NAME, ['power'],
+                                     [('item', '=', f'item-{index}')])
+
+    assert build_select_query.cache_info().misses == 1
+    assert build_select_query.cache_info().hits == 4
+
+
+def test_unsupported_condition_operator_is_rejected():
+    with pytest.raises(ValueError):
+        parse_conditions([('item', '; DROP TABLE items; --', 'item-0')])
+
+
+def test_insert_data_consumes_iterable_by_batches(tmp_path):
+    rows = ((f'item-{index}', index, index) for index in range(25))
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        db.add_table(TABLE_NAME, TABLE_FIELDS)
+        db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS), rows, batch_size=10)
+        selected_data = db.select_wo_condition(TABLE_NAME, ['power'])
+
+    assert selected_data == [(index,) for index in range(25)]
+
+
+def test_snapshot_and_restore_in_memory_db():
+    progress_calls = []
+    with DBConnector(get_in_memory_db_name('test_snapshot')) as db:
+        create_filled_db(db)
+        snapshot_conn = db.snapshot(
+            pages=1, progress=lambda *args: progress_calls.append(args))
+        db.update_data(TABLE_NAME, ('item', 'item-0', 'power', 100))
+
+        with DBConnector(get_in_memory_db_name('test_copy')) as db_copy:
+            db_copy.restore(db.conn)
+            copied_power = db_copy.select_with_condition(
+                TABLE_NAME, ['power'], [('item', '=', 'item-0')])
+
+        db.restore(snapshot_conn)
+        restored_power = db.select_with_condition(
+            TABLE_NAME, ['power'], [('item', '=', 'item-0')])
+
+    assert copied_power == [(100,)]
+    assert restored_power == [(0,)]
+    assert progress_calls
+
+
+def test_query_stats_are_grouped_by_query_shape(tmp_path):
+    query_stats = QueryStats(slow_query_threshold_ms=0)
+    with DBConnector(str(tmp_path / 'test.db'),
+                     query_stats=query_stats) as db:
+        create_filled_db(db)
+        for index in range(3):
+            db.select_with_condition(TABLE_NAME, ['power'],
+                                     [('item', '=', f'item-{index}')])
+        db.select_with_query(f"SELECT power FROM {TABLE_NAME} "
+                             f"WHERE item = 'item-1' AND power > 0;")
+        db.select_with_query(f"SELECT power FROM {TABLE_NAME} "
+                             f"WHERE item = 'item-2' AND power > 1;")
+
+    stats = query_stats.get_stats()
+    select_stats = stats['SELECT power FROM items WHERE item = ?;']
+    literal_select_stats = stats[
+        'SELECT power FROM items WHERE item = ? AND power > ?;']
+    slow_queries = query_stats.get_slow_queries()
+
+    assert select_stats['calls'] == 3
+    assert select_stats['rows'] == 3
+    assert select_stats['p50_ms'] <= select_stats['p99_ms']
+    assert literal_select_stats['calls'] == 2
+    assert stats['INSERT INTO items VALUES (?, ...);']['rows'] == 10
+    assert any(slow_query['query_plan'] for slow_query in slow_queries)
+
+
+def test_query_stats_record_streamed_selects(tmp_path):
+    query_stats = QueryStats(slow_query_threshold_ms=0)
+    with DBConnector(str(tmp_path / 'test.db'),
+                     query_stats=query_stats) as db:
+        create_filled_db(db, number_of_rows=25)
+        rows = list(db.iter_with_condition(TABLE_NAME, ['item'],
+                                           [('power', '>=', 5)],
+                                           chunk_size=4))
+
+    stats = query_stats.get_stats()['SELECT item FROM items WHERE power >= ?;']
+
+    assert len(rows) == 20
+    assert stats['calls'] == 1
+    assert stats['rows'] == 20
+
+
+def test_query_stats_do_not_change_explain_results(tmp_path):
+    query_stats = QueryStats(slow_query_threshold_ms=0)
+    select_query = f'SELECT * FROM {TABLE_NAME} WHERE item = ?'
+    with DBConnector(str(tmp_path / 'test.db'),
+                     query_stats=query_stats) as db:
+        create_filled_db(db)
+        query_plan = db.explain_query_plan(select_query, ('item-1', ))
+        with db.transaction():
+            transaction_query_plan = db.explain_query_plan(select_query,
+                                                           ('item-1', ))
+        streamed_query_plan = list(db.iter_select(
+            f'EXPLAIN QUERY PLAN {select_query}', ('item-1', )))
+
+    assert query_plan
+    assert transaction_query_plan == query_plan
+    assert [plan_step[-1] for plan_step in streamed_query_plan] == \
+        query_plan
+
+
+def test_query_stats_keep_latest_slow_queries():
+    query_stats = QueryStats(slow_query_threshold_ms=0, max_slow_queries=2)
+    for index in range(5):
+        query_stats.record(f'SELECT {index};', 0.001, index)
+
+    assert [slow_query['rows'] for slow_query
+            in query_stats.get_slow_queries()] == [3, 4]
+    assert query_stats.get_stats()['SELECT ?;']['calls'] == 5
+
+
+def test_connection_profiles_are_applied_to_single_connection(tmp_path):
+    db = DBConnector(str(tmp_path / 'test.db'), profile='bulk-load')
+    with db:
+        connection = db.conn
+        db.create_db()
+        bulk_load_pragmas = db.get_pragmas()
+        create_filled_db(db)
+        db.apply_profile('read-heavy')
+        read_heavy_pragmas = db.get_pragmas()
+
+        assert db.conn is connection
+    assert db.conn is None
+
+    assert bulk_load_pragmas['locking_mode'] == 'exclusive'
+    assert bulk_load_pragmas['synchronous'] == 0
+    assert read_heavy_pragmas['locking_mode'] == 'normal'
+    assert read_heavy_pragmas['journal_mode'] == 'wal'
+    assert read_heavy_pragmas['mmap_size'] == 268435456
+
+
+def test_unknown_connection_profile_is_rejected():
+    with pytest.raises(ValueError):
+        DBConnector('test.db', profile='unknown')
+
+
+def test_iterators_have_own_cursors_and_bounded_chunks(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db, number_of_rows=25)
+        chunks = list(db.select_in_chunks(
+            build_select_query(TABLE_NAME, ('item', )), chunk_size=10))
+        powers = db.iter_wo_condition(TABLE_NAME, ['power'], chunk_size=4)
+        armors = db.iter_with_condition(TABLE_NAME, ['armor'],
+                                        [('armor', '>=', 20)])
+        interleaved_rows = list(zip(powers, armors))
+        dict_rows = list(db.iter_with_condition(
+            TABLE_NAME, ['item', 'power'], [('item', '=', 'item-3')],
+            row_factory=dict_row_factory))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert interleaved_rows == [((index, ), (index + 20, ))
+                                for index in range(5)]
+    assert dict_rows == [{'item': 'item-3', 'power': 3}]
+
+
+def test_transaction_rolls_back_nested_savepoints(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        with db.transaction('IMMEDIATE'):
+            db.update_data(TABLE_NAME, ('item', 'item-0', 'power', 100))
+            with pytest.raises(sqlite3.OperationalError):
+                with db.transaction():
+                    db.update_data(TABLE_NAME,
+                                   ('item', 'item-1', 'power', 200))
+                    db.update_data(TABLE_NAME,
+                                   ('item', 'item-1', 'unknown', 200))
+            assert db.update_multiple_data(TABLE_NAME, [
+                ('item', 'item-2', 'power', 300)]) == 1
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.update_data(TABLE_NAME, ('item', 'item-3', 'power', 400))
+                raise ValueError('broken unit of work')
+        selected_data = db.select_wo_condition(TABLE_NAME, ['power'])
+
+    assert not db.in_transaction
+    assert selected_data[:4] == [(100,), (1,), (300,), (3,)]
+
+
+def test_transaction_commits_every_n_statements(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    rows = [(f'item-{index}', index, index) for index in range(15)]
+    with DBConnector(db_name) as db:
+        db.add_table(TABLE_NAME, TABLE_FIELDS)
+        with pytest.raises(RuntimeError):
+            with db.transaction(commit_every=2):
+                db.insert_data(TABLE_NAME, tuple(TABLE_FIELDS),
+                               rows, batch_size=5)
+                with DBConnector(db_name) as other_db:
+                    committed_rows = other_db.select_with_query(
+                        f'SELECT COUNT(*) FROM {TABLE_NAME};')
+                raise RuntimeError('interrupted load')
+        selected_data = db.select_with_query(
+            f'SELECT COUNT(*) FROM {TABLE_NAME};')
+
+    assert committed_rows == [(10,)]
+    assert selected_data == [(10,)]
+
+
+def test_unknown_transaction_mode_is_rejected(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        with pytest.raises(ValueError):
+            with db.transaction('LAZY'):
+                pass
+
+
+def test_iterator_errors_are_raised_outside_transaction(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        create_filled_db(db)
+        with pytest.raises(sqlite3.OperationalError):
+            list(db.iter_wo_condition(TABLE_NAME, ['unknown']))
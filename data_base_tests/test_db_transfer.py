@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from configs.db_constants_and_configs import TABLES_CONFIG
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   get_ship_parameter_options)
+from data_base.db_diff import compare_databases
+from data_base.db_processing import DBConnector
+from data_base.db_transfer import export_database, import_database
+
+
+@pytest.mark.parametrize('transfer_format, compress, compact', [
+    ('csv', False, False),
+    ('jsonl', True, False),
+    ('binary', True, True),
+])
+def test_export_import_round_trip(tmp_path, transfer_format, compress,
+                                  compact):
+    original_db_name = str(tmp_path / 'original.db')
+    imported_db_name = str(tmp_path / 'imported.db')
+    export_path = str(tmp_path / 'export')
+    with DBConnector(original_db_name) as db:
+        initialize_db(db, compact)
+        generate_random_db_data(db, seed=1)
+        db.update_data('hulls', ('hull', 1 if compact else 'hull-1',
+                                 'armor', None))
+        manifest = export_database(db, export_path, transfer_format,
+                                   compress, chunk_size=7)
+
+        with DBConnector(imported_db_name) as imported_db:
+            report = import_database(imported_db, export_path,
+                                     batch_size=11)
+            imported_options = get_ship_parameter_options(
+                imported_db, 'ship-0', 'weapon')
+
+        assert compare_databases(db, imported_db_name) == {
+            'tables': {table_name: {} for table_name in TABLES_CONFIG},
+            'ships': {},
+        }
+        assert imported_options == get_ship_parameter_options(
+            db, 'ship-0', 'weapon')
+
+    assert manifest['tables']['Ships']['rows'] == 200
+    assert report == {
+        'rows': {'weapons': 20, 'hulls': 5, 'engines': 6, 'Ships': 200},
+        'foreign_key_violations': 0,
+    }
+
+
+def test_import_rolls_back_on_broken_file(tmp_path):
+    export_path = tmp_path / 'export'
+    with DBConnector(str(tmp_path / 'original.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        export_database(db, str(export_path), 'jsonl')
+    with open(export_path / 'Ships.jsonl', 'a') as ships_file:
+        ships_file.write('[broken\n')
+
+    with DBConnector(str(tmp_path / 'imported.db')) as imported_db:
+        with pytest.raises(ValueError):
+            import_database(imported_db, str(export_path))
+        assert imported_db.select_with_query(
+            'SELECT COUNT(*) FROM weapons;') == [(0, )]
+
+
+def test_import_rejects_truncated_file(tmp_path):
+    export_path = tmp_path / 'export'
+    with DBConnector(str(tmp_path / 'original.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        export_database(db, str(export_path))
+    ships_file_path = export_path / 'Ships.csv'
+    ships_lines = ships_file_path.read_text().splitlines(keepends=True)
+    ships_file_path.write_text(''.join(ships_lines[:-10]))
+
+    with DBConnector(str(tmp_path / 'imported.db')) as imported_db:
+        with pytest.raises(ValueError, match='190 rows instead of 200'):
+            import_database(imported_db, str(export_path))
+        assert imported_db.select_with_query(
+            'SELECT COUNT(*) FROM Ships;') == [(0, )]
+
+
+def test_import_rejects_schema_mismatch(tmp_path):
+    export_path = str(tmp_path / 'export')
+    with DBConnector(str(tmp_path / 'original.db')) as db:
+        initialize_db(db, compact=True)
+        generate_random_db_data(db)
+        export_database(db, export_path)
+
+    with DBConnector(str(tmp_path / 'imported.db')) as imported_db:
+        initialize_db(imported_db, compact=False)
+        with pytest.raises(ValueError, match='compact: True'):
+            import_database(imported_db, export_path)
+        assert imported_db.select_with_query(
+            'SELECT COUNT(*) FROM Ships;') == [(0, )]
+
+
+def test_export_fails_on_unreadable_table(tmp_path):
+    export_path = tmp_path / 'export'
+    with DBConnector(str(tmp_path / 'original.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        db.drop_table('Ships')
+        with pytest.raises(sqlite3.OperationalError):
+            export_database(db, str(export_path))
+
+    assert not (export_path / 'manifest.json').exists()
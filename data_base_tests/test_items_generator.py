@@ -0,0 +1,92 @@
+from itertools import chain
+
+import pytest
+
+from configs.db_constants_and_configs import (NUMBER_OF_ROWS_PER_TABLE,
+                                              INTEGER_RANGE)
+from data_base.db_commands import initialize_db, generate_random_db_data
+from data_base.db_processing import DBConnector
+from data_generators.items_generator import ItemsGenerator
+from data_generators.sharded_generator import (generate_sharded_rows,
+                                               get_generation_executor)
+
+
+def test_generate_rows_yields_bounded_chunks():
+    item_generator = ItemsGenerator('Ships')
+    chunks = list(item_generator.generate_rows(chunk_size=30))
+    rows = list(chain.from_iterable(chunks))
+
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert len(rows) == NUMBER_OF_ROWS_PER_TABLE['Ships']
+    assert [row[0] for row in rows] == [
+        f'ship-{index}' for index in range(NUMBER_OF_ROWS_PER_TABLE['Ships'])]
+    assert all(len(row) == len(item_generator.columns) for row in rows)
+    assert all(row[1].startswith('weapon-') for row in rows)
+
+
+def test_numpy_backend_keeps_output_schema():
+    pytest.importorskip('numpy')
+    python_rows = list(chain.from_iterable(
+        ItemsGenerator('weapons').generate_rows()))
+    numpy_rows = list(chain.from_iterable(
+        ItemsGenerator('weapons', 'numpy', seed=1).generate_rows()))
+    same_seed_rows = list(chain.from_iterable(
+        ItemsGenerator('weapons', 'numpy', seed=1).generate_rows()))
+
+    assert numpy_rows == same_seed_rows
+    assert [row[0] for row in numpy_rows] == [row[0] for row in python_rows]
+    assert all(isinstance(value, int) and
+               INTEGER_RANGE[0] <= value <= INTEGER_RANGE[1]
+               for row in numpy_rows for value in row[1:])
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        ItemsGenerator('weapons', 'unknown')
+
+
+def test_sharded_rows_do_not_depend_on_workers_number():
+    rows_per_table = dict(NUMBER_OF_ROWS_PER_TABLE, Ships=1000)
+    serial_rows = list(chain.from_iterable(generate_sharded_rows(
+        'Ships', 7, rows_per_table=rows_per_table, shard_size=128)))
+    executor = get_generation_executor(3)
+    try:
+        parallel_rows = list(chain.from_iterable(generate_sharded_rows(
+            'Ships', 7, executor, rows_per_table=rows_per_table,
+            shard_size=128, max_pending_shards=4)))
+    finally:
+        executor.shutdown()
+    another_seed_rows = list(chain.from_iterable(generate_sharded_rows(
+        'Ships', 8, rows_per_table=rows_per_table, shard_size=128)))
+
+    assert parallel_rows == serial_rows
+    assert [row[0] for row in serial_rows] == [
+        f'ship-{index}' for index in range(1000)]
+    assert another_seed_rows != serial_rows
+
+
+def test_sharded_db_generation_is_reproducible(tmp_path):
+    tables_data = []
+    for workers in (1, 2):
+        with DBConnector(str(tmp_path / f'{workers}.db')) as db:
+            initialize_db(db)
+            generate_random_db_data(db, seed=3, workers=workers)
+            tables_data.append({
+                table_name: db.select_wo_condition(table_name, ['*'])
+                for table_name in NUMBER_OF_ROWS_PER_TABLE})
+
+    assert tables_data[0] == tables_data[1]
+    assert len(tables_data[0]['Ships']) == NUMBER_OF_ROWS_PER_TABLE['Ships']
+
+
+def test_tables_get_different_streams_under_one_seed(tmp_path):
+    with DBConnector(str(tmp_path / 'seeded.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=7)
+        options_columns = [
+            [row[1] for row in db.select_wo_condition(table_name, ['*'])]
+            for table_name in ('weapons', 'hulls', 'engines')]
+
+    assert options_columns[0] != options_columns[1]
+    assert options_columns[0] != options_columns[2]
+    assert options_columns[1] != options_columns[2]
@@ -0,0 +1,77 @@
+import random
+from collections import Counter
+
+import pytest
+
+from benchmarks.load_generator import (KeySampler, get_load_report,
+                                       parse_operations_mix, run_load_worker)
+from data_base.db_commands import initialize_db, generate_random_db_data
+from data_base.db_processing import DBConnector
+
+
+def test_zipf_key_sampler_is_bounded_and_skewed():
+    key_sampler = KeySampler(100, 'zipf', generator=random.Random(1))
+    samples = Counter(key_sampler.sample() for _ in range(10000))
+
+    assert min(samples) >= 0 and max(samples) < 100
+    assert samples.most_common(1)[0][0] == 0
+    assert samples[0] > 10 * samples[99]
+
+
+def test_uniform_key_sampler_is_bounded():
+    key_sampler = KeySampler(10, generator=random.Random(1))
+    samples = {key_sampler.sample() for _ in range(1000)}
+
+    assert samples == set(range(10))
+
+
+def test_unknown_key_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        KeySampler(10, 'normal')
+
+
+def test_operations_mix_is_parsed():
+    assert parse_operations_mix(['get_ship_parameter=3', 'update_ship=1']) \
+        == {'get_ship_parameter': 3.0, 'update_ship': 1.0}
+    with pytest.raises(ValueError):
+        parse_operations_mix(['delete_ship=1'])
+
+
+def test_load_report_merges_workers_results():
+    workers_results = [
+        {'get_ship_parameter': {'latencies': [0.001, 0.003],
+                                'errors_latencies': []},
+         'update_ship': {'latencies': [0.002], 'errors_latencies': [0.01]}},
+        {'get_ship_parameter': {'latencies': [0.002],
+                                'errors_latencies': [0.0001, 0.0001]},
+         'update_ship': {'latencies': [], 'errors_latencies': []}},
+    ]
+    report = get_load_report(workers_results, duration=2)
+
+    assert report['get_ship_parameter']['count'] == 3
+    assert report['get_ship_parameter']['throughput_ops'] == 1.5
+    assert report['get_ship_parameter']['errors'] == 2
+    assert report['get_ship_parameter']['p50_ms'] == pytest.approx(2)
+    assert report['get_ship_parameter']['errors_mean_ms'] == \
+        pytest.approx(0.1)
+    assert report['update_ship']['errors'] == 1
+    assert report['update_ship']['max_ms'] == pytest.approx(2)
+    assert report['total']['count'] == 4
+    assert report['total']['errors'] == 3
+    assert report['total']['max_ms'] == pytest.approx(3)
+
+
+def test_load_worker_uses_ship_keys_of_database(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    with DBConnector(db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        db.execute_with_query('UPDATE Ships SET ship = "imported-" || ship;')
+
+    results = run_load_worker(
+        db_name, 0, {'get_ship_parameter': 1, 'get_ship_parameter_options': 1,
+                     'update_ship': 1}, 0.2, 'zipf', seed=1)
+
+    assert all(operation_results['latencies'] and
+               not operation_results['errors_latencies']
+               for operation_results in results.values())
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   get_ship_parameter,
+                                   get_ship_parameter_options,
+                                   get_lookup_cache_stats)
+from data_base.db_pool import PooledDBConnector
+from data_base.db_processing import DBConnector
+from data_base.lookup_cache import LookupCache, MISSING
+
+
+def test_lookup_cache_evicts_least_recently_used_values():
+    lookup_cache = LookupCache(max_size=2)
+    lookup_cache.put('first', (0, 0), 1)
+    lookup_cache.put('second', (0, 0), 2)
+    lookup_cache.get('first', (0, 0))
+    lookup_cache.put('third', (0, 0), 3)
+
+    assert lookup_cache.get('second', (0, 0)) is MISSING
+    assert lookup_cache.get('first', (0, 1)) is MISSING
+    assert lookup_cache.get('third', (0, 0)) == 3
+    assert lookup_cache.get_stats() == {
+        'hits': 2, 'misses': 2, 'invalidations': 1, 'evictions': 1,
+        'size': 1, 'max_size': 2}
+
+
+def test_ship_lookups_are_cached_and_invalidated_on_update(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        hull = get_ship_parameter(db, 'ship-0', 'hull')
+        hull_options = get_ship_parameter_options(db, 'ship-0', 'hull')
+        assert get_ship_parameter(db, 'ship-0', 'hull') == hull
+        assert get_ship_parameter_options(db, 'ship-0', 'hull') == \
+            hull_options
+        stats_before_update = get_lookup_cache_stats(db)
+
+        db.update_data('hulls', ('hull', hull, 'armor', 100))
+        updated_hull_options = get_ship_parameter_options(db, 'ship-0',
+                                                          'hull')
+        db.update_multiple_data('Ships', [('ship', 'ship-0', 'hull',
+                                           'hull-unknown')])
+        updated_hull = get_ship_parameter(db, 'ship-0', 'hull')
+
+    assert stats_before_update['hits'] == 4
+    assert updated_hull_options == dict(hull_options, armor=100)
+    assert updated_hull == 'hull-unknown'
+
+
+def test_ship_lookups_are_invalidated_by_other_writers(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    with DBConnector(db_name) as db, DBConnector(db_name) as other_db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        get_ship_parameter(db, 'ship-0', 'hull')
+
+        other_db.update_data('Ships', ('ship', 'ship-0', 'hull', 'hull-19'))
+        hull_after_other_update = get_ship_parameter(db, 'ship-0', 'hull')
+        db.execute_with_query(
+            'UPDATE Ships SET hull = "hull-18" WHERE ship = "ship-0";')
+        hull_after_custom_query = get_ship_parameter(db, 'ship-0', 'hull')
+
+    assert hull_after_other_update == 'hull-19'
+    assert hull_after_custom_query == 'hull-18'
+
+
+def test_ship_lookups_are_invalidated_by_rollback(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        hull = get_ship_parameter(db, 'ship-0', 'hull')
+        updated_hull = 'hull-18' if hull != 'hull-18' else 'hull-19'
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.update_data('Ships', ('ship', 'ship-0', 'hull',
+                                         updated_hull))
+                assert get_ship_parameter(db, 'ship-0', 'hull') == \
+                    updated_hull
+                db.add_table('rolled_back', {'item': 'TEXT'})
+                assert db.has_table('rolled_back')
+                raise RuntimeError('broken unit of work')
+
+        assert get_ship_parameter(db, 'ship-0', 'hull') == hull
+        assert not db.has_table('rolled_back')
+
+
+def test_pooled_ship_lookups_are_shared_between_threads(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    with PooledDBConnector(db_name) as db, \
+            DBConnector(db_name, profile='read-heavy') as other_db, \
+            ThreadPoolExecutor(max_workers=1) as first_thread, \
+            ThreadPoolExecutor(max_workers=1) as second_thread:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        hull = first_thread.submit(get_ship_parameter, db, 'ship-0',
+                                   'hull').result()
+        other_db.update_data('hulls', ('hull', hull, 'armor', 100))
+        stats_before_lookups = get_lookup_cache_stats(db)
+        options = [
+            thread.submit(get_ship_parameter_options, db, 'ship-0',
+                          'hull').result()
+            for thread in (first_thread, second_thread) * 2]
+        stats = get_lookup_cache_stats(db)
+
+    assert all(thread_options == options[0] for thread_options in options)
+    assert options[0]['armor'] == 100
+    assert stats['hits'] - stats_before_lookups['hits'] == 6
+    assert stats['invalidations'] - \
+        stats_before_lookups['invalidations'] == 1
@@ -0,0 +1,97 @@
+import pytest
+
+from configs.db_constants_and_configs import SHIP_CONFIGURATIONS_TABLE
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   generate_updated_db_data,
+                                   get_ship_parameter,
+                                   get_ship_parameter_options)
+from data_base.db_overlay import OverlayDBConnector
+from data_base.db_processing import DBConnector
+from data_base.materialized_configurations import (
+    enable_ship_configurations, disable_ship_configurations,
+    rebuild_ship_configurations)
+from data_base.ship_configurations import build_ship_configurations_query
+from utils.data_generation_utils import generate_test_cases
+
+
+def get_joined_configurations(db: DBConnector) -> list:
+    return sorted(db.select_with_query(build_ship_configurations_query()))
+
+
+def get_materialized_configurations(db: DBConnector) -> list:
+    return sorted(db.select_with_query(
+        f'SELECT * FROM {SHIP_CONFIGURATIONS_TABLE};'))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_ship_configurations_are_maintained_by_triggers(tmp_path, compact):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db, compact)
+        generate_random_db_data(db, seed=1)
+        joined_options = {
+            (ship_id, component): get_ship_parameter_options(db, ship_id,
+                                                             component)
+            for ship_id, component in generate_test_cases()}
+
+        enable_ship_configurations(db)
+        assert db.has_table(SHIP_CONFIGURATIONS_TABLE)
+        assert get_materialized_configurations(db) == \
+            get_joined_configurations(db)
+        for (ship_id, component), options in joined_options.items():
+            assert get_ship_parameter_options(db, ship_id, component) == \
+                options
+
+        generate_updated_db_data(db)
+        db.insert_data('Ships', ('ship', 'weapon', 'hull', 'engine'),
+                       [(1000, 1, 1, 1) if compact else
+                        ('ship-1000', 'weapon-1', 'hull-1', 'engine-1')])
+        db.execute_with_query('DELETE FROM weapons WHERE rowid = 1;')
+        assert get_materialized_configurations(db) == \
+            get_joined_configurations(db)
+
+        db.execute_with_query(f'DELETE FROM {SHIP_CONFIGURATIONS_TABLE};')
+        rebuild_ship_configurations(db)
+        assert get_materialized_configurations(db) == \
+            get_joined_configurations(db)
+
+        disable_ship_configurations(db)
+        assert not db.has_table(SHIP_CONFIGURATIONS_TABLE)
+        assert db.update_multiple_data(
+            'Ships', [('ship', 1 if compact else 'ship-1',
+                       'hull', 2 if compact else 'hull-2')]) == 1
+
+
+def test_overlay_shadows_ship_configurations(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    with DBConnector(db_name) as db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        enable_ship_configurations(db)
+
+    with OverlayDBConnector(db_name) as overlay_db:
+        overlay_db.update_data('hulls', ('hull', 'hull-1', 'armor', 100))
+        assert get_materialized_configurations(overlay_db) == \
+            get_joined_configurations(overlay_db)
+        ship_id = overlay_db.select_with_query(
+            'SELECT ship FROM Ships WHERE hull = "hull-1" LIMIT 1;')[0][0]
+        assert get_ship_parameter_options(
+            overlay_db, ship_id, 'hull')['armor'] == 100
+
+
+def test_ship_configurations_disabled_by_other_connection(tmp_path):
+    db_name = str(tmp_path / 'test.db')
+    with DBConnector(db_name) as db, DBConnector(db_name) as other_db:
+        initialize_db(db)
+        generate_random_db_data(db, seed=1)
+        enable_ship_configurations(db)
+        assert db.has_table(SHIP_CONFIGURATIONS_TABLE)
+        options = get_ship_parameter_options(db, 'ship-0', 'hull')
+
+        disable_ship_configurations(other_db)
+        db.update_data('hulls', ('hull', get_ship_parameter(db, 'ship-0',
+                                                            'hull'),
+                                 'armor', 100))
+
+        assert not db.has_table(SHIP_CONFIGURATIONS_TABLE)
+        assert get_ship_parameter_options(db, 'ship-0', 'hull') == \
+            dict(options, armor=100)
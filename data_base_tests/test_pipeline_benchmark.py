@@ -0,0 +1,34 @@
+from benchmarks.pipeline_benchmark import (compare_with_baseline,
+                                           run_pipeline_benchmark)
+
+
+def test_pipeline_benchmark_measures_all_phases(tmp_path):
+    results = run_pipeline_benchmark(100, str(tmp_path),
+                                     number_of_lookups=10)
+
+    assert set(results) == {'initialize_db', 'generate_random_db_data',
+                            'initialize_db_indexes', 'dump_db',
+                            'generate_updated_db_data', 'compare', 'lookups',
+                            'lookups_latency'}
+    assert results['lookups']['rows'] == 10
+    assert results['lookups_latency']['get_ship_parameter']['count'] == 10
+    assert not list(tmp_path.iterdir())
+
+
+def test_regressions_are_found_by_baseline_threshold():
+    results = {'sizes': {'100': {
+        'dump_db': {'duration_s': 3.0},
+        'compare': {'duration_s': 1.1},
+        'lookups_latency': {'get_ship_parameter': {}},
+    }}}
+    baseline = {'sizes': {'100': {
+        'dump_db': {'duration_s': 1.0},
+        'compare': {'duration_s': 1.0},
+    }}}
+
+    regressions = compare_with_baseline(results, baseline, threshold=1.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith('dump_db for 100 ships')
+    assert results['sizes']['100']['compare']['baseline_ratio'] == \
+        1.1 / 1.0
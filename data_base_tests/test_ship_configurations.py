@@ -0,0 +1,48 @@
+from data_base.db_commands import (initialize_db, generate_random_db_data,
+                                   get_ship_parameter,
+                                   get_ship_parameter_options,
+                                   load_ship_configurations)
+from data_base.db_processing import DBConnector
+from data_base.ship_configurations import compare_ship_configurations
+from utils.data_generation_utils import (generate_test_cases,
+                                         generate_test_cases_chunks,
+                                         get_shard_chunks, iter_test_cases)
+
+
+def test_load_ship_configurations_matches_lookups(tmp_path):
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        ship_configurations = load_ship_configurations(db, chunk_size=7)
+
+        assert len(ship_configurations) == 200
+        for ship_id, component in generate_test_cases():
+            assert ship_configurations.get_parameter(ship_id, component) == \
+                get_ship_parameter(db, ship_id, component)
+            assert ship_configurations.get_parameter_options(
+                ship_id, component) == get_ship_parameter_options(
+                db, ship_id, component)
+
+
+def test_load_ship_configurations_of_chunk_and_comparison(tmp_path):
+    chunks = list(generate_test_cases_chunks(64))
+    shards = [list(get_shard_chunks(chunks, shard_index, 3))
+              for shard_index in range(3)]
+    assert [len(chunk) for chunk in chunks] == [64, 64, 64, 8]
+    assert shards == [[chunks[0], chunks[3]], [chunks[1]], [chunks[2]]]
+
+    with DBConnector(str(tmp_path / 'test.db')) as db:
+        initialize_db(db)
+        generate_random_db_data(db)
+        expected = load_ship_configurations(db, ship_ids=chunks[1])
+        db.update_data('Ships', ('ship', 'ship-70', 'hull', 'hull-unknown'))
+        actual = load_ship_configurations(db, ship_ids=chunks[1])
+
+    assert set(expected) == set(chunks[1])
+    failed_cases = compare_ship_configurations(
+        expected, actual, iter_test_cases(chunks[1] + ['ship-999']))
+    assert [failed_case[:2] for failed_case in failed_cases] == [
+        ('ship-70', 'hull')]
+    assert failed_cases[0][2][1] == 'hull-unknown'
+    assert failed_cases[0][3][1] == {'armor': None, 'type': None,
+                                     'capacity': None}
@@ -1,31 +1,37 @@
-import pytest
+from data_base.db_commands import load_ship_configurations
+from data_base.ship_configurations import compare_ship_configurations
+from utils.data_generation_utils import iter_test_cases
 
-from data_base.db_commands import (get_ship_parameter,
-                                   get_ship_parameter_options)
-from utils.data_generation_utils import generate_test_cases
 
+def test_ships_configuration(ship_to_check, component_to_check,
+                             databases_diff):
+    component_diff = databases_diff['ships'].get((ship_to_check,
+                                                  component_to_check))
+    if component_diff is None:
+        return
 
-@pytest.mark.parametrize(
-    'ship_to_check, component_to_check', generate_test_cases()
-)
-def test_ships_configuration(ship_to_check, component_to_check, db_connector,
-                             dumped_db_connector):
-
-    expected_component_value = get_ship_parameter(db_connector, ship_to_check,
-                                                  component_to_check)
-    actual_component_value = get_ship_parameter(dumped_db_connector,
-                                                ship_to_check,
-                                                component_to_check)
+    expected_component_value, actual_component_value = \
+        component_diff['value']
 
     assert expected_component_value == actual_component_value, \
         f'{ship_to_check}, {component_to_check}:'
 
-    expected_component_options = get_ship_parameter_options(db_connector,
-                                                            ship_to_check,
-                                                            component_to_check)
-    actual_component_options = get_ship_parameter_options(dumped_db_connector,
-                                                          ship_to_check,
-                                                          component_to_check)
+    expected_component_options, actual_component_options = \
+        component_diff['options']
 
     assert expected_component_options == actual_component_options, \
         f'{ship_to_check}, {component_to_check}:'
+
+
+def test_ships_configurations_chunk(ships_chunk, db_connector,
+                                    dumped_db_connector):
+    failed_cases = compare_ship_configurations(
+        load_ship_configurations(db_connector, ship_ids=ships_chunk),
+        load_ship_configurations(dumped_db_connector, ship_ids=ships_chunk),
+        iter_test_cases(ships_chunk))
+
+    assert not failed_cases, '\n'.join(
+        f'{ship_id}, {component}: expected {expected_value} '
+        f'{expected_options}, actual {actual_value} {actual_options}'
+        for ship_id, component, (expected_value, actual_value),
+        (expected_options, actual_options) in failed_cases)
@@ -0,0 +1,24 @@
+import pytest
+
+from utils.stats_utils import get_percentile, get_latency_summary
+
+
+def test_percentile_uses_nearest_rank():
+    sorted_values = list(range(1, 11))
+
+    assert get_percentile(sorted_values, 50) == 5
+    assert get_percentile(sorted_values, 95) == 10
+    assert get_percentile(sorted_values, 0) == 1
+    assert get_percentile(sorted_values, 100) == 10
+    assert get_percentile([], 50) == 0.0
+
+
+def test_latency_summary_is_measured_in_milliseconds():
+    summary = get_latency_summary([0.004, 0.001, 0.003, 0.002])
+
+    assert summary == pytest.approx({
+        'count': 4, 'total_ms': 10, 'mean_ms': 2.5, 'max_ms': 4,
+        'p50_ms': 2, 'p95_ms': 4, 'p99_ms': 4})
+    assert get_latency_summary([], percentiles=(90, )) == {
+        'count': 0, 'total_ms': 0, 'mean_ms': 0.0, 'max_ms': 0.0,
+        'p90_ms': 0.0}
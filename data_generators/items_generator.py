@@ -1,12 +1,21 @@
 import logging
+import random
+from typing import Iterator, Optional
 
 from configs.db_constants_and_configs import (TABLES_CONFIG,
                                               NUMBER_OF_ROWS_PER_TABLE,
-                                              INTEGER_RANGE)
+                                              INTEGER_RANGE,
+                                              GENERATION_CHUNK_SIZE,
+                                              GENERATION_BACKEND,
+                                              GENERATION_BACKENDS)
 from utils.data_generation_utils import (generate_n_items,
                                          generate_n_integers,
                                          generate_items_for_ships,
                                          get_random_value)
+from utils.numpy_generation_utils import (get_numpy_generator,
+                                          generate_n_items_array,
+                                          generate_n_integers_array,
+                                          generate_items_for_ships_array)
 
 
 class ItemsGenerator:
@@ -19,11 +28,21 @@ class ItemsGenerator:
         'engines': 'engine'
     }
 
-    def __init__(self, table_name: str):
+    def __init__(self, table_name: str, backend: str = GENERATION_BACKEND,
+                 seed: Optional[int] = None,
+                 rows_per_table: Optional[dict] = None):
+        if backend not in GENERATION_BACKENDS:
+            raise ValueError(f'Unsupported generation backend: {backend}')
         self.name = self.table_item_matcher.get(table_name)
         self.table_name = table_name
         self.columns = self.__get_columns()
-        self.number_of_rows = NUMBER_OF_ROWS_PER_TABLE.get(self.table_name)
+        self.rows_per_table = rows_per_table or NUMBER_OF_ROWS_PER_TABLE
+        self.number_of_rows = self.rows_per_table.get(self.table_name)
+        self.backend = backend
+        self.numpy_generator = (get_numpy_generator(seed)
+                                if backend == 'numpy' else None)
+        self.random_generator = (random.Random(seed) if seed is not None
+                                 else random)
 
     def __get_columns(self) -> tuple:
         """Method returns available columns for table according to db config"""
@@ -31,23 +50,78 @@ class ItemsGenerator:
         return tuple(col_name for col_name in item_config
                      if col_name != 'foreign_keys')
 
-    def __generate_data_for_ships(self) -> dict:
+    def __generate_data_for_ships(self, start: int, number: int) -> dict:
         """
         Generating data for Ships table differs from other tables
+        :param start: index of the first generated row
+        :param number: number of rows that will be generated
         :return: dict in the following format
         {column_name: [column_values,...], ...}
         """
         generated_result = {}
         for col_name in self.columns:
             if col_name == 'ship':
-                generated_col_data = generate_n_items(self.name,
-                                                      self.number_of_rows)
+                generated_col_data = generate_n_items(self.name, number,
+                                                      start)
             else:
                 table_for_col = [k for k, v in self.table_item_matcher.items()
                                  if v == col_name][0]
                 generated_col_data = generate_items_for_ships(
-                    col_name, self.number_of_rows, 0,
-                    NUMBER_OF_ROWS_PER_TABLE[table_for_col])
+                    col_name, number, 0,
+                    self.rows_per_table[table_for_col],
+                    self.random_generator)
+            generated_result[col_name] = generated_col_data
+
+        return generated_result
+
+    def __generate_numpy_columns(self, start: int, number: int) -> dict:
+        """
+        Method generates columns data for the range of table rows with
+        numpy backend: every column is generated as a whole array
+        :param start: index of the first generated row
+        :param number: number of rows that will be generated
+        :return: dict in the following format
+        {column_name: [column_values,...], ...}
+        """
+        generated_result = {}
+        for col_name in self.columns:
+            if col_name == self.name:
+                generated_col_data = generate_n_items_array(self.name, number,
+                                                            start)
+            elif self.table_name == 'Ships':
+                table_for_col = [k for k, v in self.table_item_matcher.items()
+                                 if v == col_name][0]
+                generated_col_data = generate_items_for_ships_array(
+                    self.numpy_generator, col_name, number, 0,
+                    self.rows_per_table[table_for_col])
+            else:
+                generated_col_data = generate_n_integers_array(
+                    self.numpy_generator, number, *INTEGER_RANGE)
+            generated_result[col_name] = generated_col_data.tolist()
+
+        return generated_result
+
+    def __generate_columns(self, start: int, number: int) -> dict:
+        """
+        Method generates columns data for the range of table rows
+        :param start: index of the first generated row
+        :param number: number of rows that will be generated
+        :return: dict in the following format
+        {column_name: [column_values,...], ...}
+        """
+        if self.backend == 'numpy':
+            return self.__generate_numpy_columns(start, number)
+        if self.table_name == 'Ships':
+            return self.__generate_data_for_ships(start, number)
+
+        generated_result = {}
+        for col_name in self.columns:
+            if col_name in self.table_item_matcher.values():
+                generated_col_data = generate_n_items(self.name, number,
+                                                      start)
+            else:
+                generated_col_data = generate_n_integers(
+                    number, *INTEGER_RANGE, self.random_generator)
             generated_result[col_name] = generated_col_data
 
         return generated_result
@@ -57,20 +131,33 @@ class ItemsGenerator:
         :returns dict where value is a list of generated data for each column
         {column_name: [column_values,...], ...}"""
         logging.info(f'Generating data for {self.name} item')
-        if self.table_name == 'Ships':
-            generated_result = self.__generate_data_for_ships()
-        else:
-            generated_result = {}
-            for col_name in self.columns:
-                if col_name in self.table_item_matcher.values():
-                    generated_col_data = generate_n_items(self.name,
-                                                          self.number_of_rows)
-                else:
-                    generated_col_data = generate_n_integers(
-                        self.number_of_rows, *INTEGER_RANGE)
-                generated_result[col_name] = generated_col_data
+        return self.__generate_columns(0, self.number_of_rows)
 
-        return generated_result
+    def generate_rows(self, chunk_size: int = GENERATION_CHUNK_SIZE
+                      ) -> Iterator[list]:
+        """Method lazily generates table rows according to described rules,
+        only one chunk of rows is kept in memory at a time
+        :param chunk_size: max number of rows in one chunk
+        :returns iterator over lists of tuples in the next format:
+        [(value_for_column_0, value_for_column_1, ...), (...), ...]"""
+        logging.info(f'Generating rows for {self.name} item by chunks '
+                     f'of {chunk_size} rows')
+        for start in range(0, self.number_of_rows, chunk_size):
+            number = min(chunk_size, self.number_of_rows - start)
+            generated_chunk = self.__generate_columns(start, number)
+            yield list(zip(*(generated_chunk[col_name]
+                             for col_name in self.columns)))
+
+    def generate_rows_range(self, start: int, number: int) -> list:
+        """Method generates rows for the range of table rows, it is used
+        for generating table shards with their own seeds
+        :param start: index of the first generated row
+        :param number: number of rows that will be generated
+        :returns list of tuples in the next format:
+        [(value_for_column_0, value_for_column_1, ...), (...), ...]"""
+        generated_range = self.__generate_columns(start, number)
+        return list(zip(*(generated_range[col_name]
+                          for col_name in self.columns)))
 
     def generate_updated_data(self) -> dict:
         """Method generates data for table update according to described rules
@@ -81,15 +168,18 @@ class ItemsGenerator:
         available_columns_for_update = tuple(set(self.columns) - {self.name})
         result = {}
         for item in generate_n_items(self.name, self.number_of_rows):
-            column_to_update = get_random_value(available_columns_for_update)
+            column_to_update = get_random_value(available_columns_for_update,
+                                                self.random_generator)
             if self.table_name == 'Ships':
                 table_for_col = [k for k, v in self.table_item_matcher.items()
                                  if v == column_to_update][0]
                 value_to_update = generate_items_for_ships(
                     column_to_update, 1, 0,
-                    NUMBER_OF_ROWS_PER_TABLE[table_for_col])[0]
+                    self.rows_per_table[table_for_col],
+                    self.random_generator)[0]
             else:
-                value_to_update = generate_n_integers(1, *INTEGER_RANGE)[0]
+                value_to_update = generate_n_integers(
+                    1, *INTEGER_RANGE, self.random_generator)[0]
             result[f'{item}'] = (column_to_update, value_to_update)
 
         return result
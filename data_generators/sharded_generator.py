@@ -0,0 +1,98 @@
+import hashlib
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from configs.db_constants_and_configs import (NUMBER_OF_ROWS_PER_TABLE,
+                                              GENERATION_BACKEND,
+                                              GENERATION_SHARD_SIZE)
+from data_generators.items_generator import ItemsGenerator
+
+
+def get_shard_seed(master_seed: int, table_name: str,
+                   shard_index: int) -> int:
+    """
+    Function provides deriving seed of the table shard from master seed,
+    the seed doesn't depend on process and PYTHONHASHSEED value
+    :param master_seed: seed of the whole generation
+    :param table_name: name of the generated table
+    :param shard_index: index of the shard in the table
+    :return: 64-bit seed of the shard
+    """
+    shard_key = f'{master_seed}:{table_name}:{shard_index}'.encode()
+    return int.from_bytes(hashlib.sha256(shard_key).digest()[:8], 'big')
+
+
+def generate_table_shard(table_name: str, shard_index: int, shard_size: int,
+                         master_seed: int,
+                         backend: str = GENERATION_BACKEND,
+                         rows_per_table: Optional[dict] = None) -> list:
+    """
+    Function provides generating rows of one table shard with its own seed
+    :param table_name: name of the generated table
+    :param shard_index: index of the shard in the table
+    :param shard_size: max number of rows in the shard
+    :param master_seed: seed of the whole generation
+    :param backend: generation backend name ('python' or 'numpy')
+    :param rows_per_table: dict with number of rows for each table
+    :return: list of tuples with rows of the shard
+    """
+    item_generator = ItemsGenerator(
+        table_name, backend,
+        get_shard_seed(master_seed, table_name, shard_index), rows_per_table)
+    start = shard_index * shard_size
+    number = min(shard_size, item_generator.number_of_rows - start)
+    return item_generator.generate_rows_range(start, number)
+
+
+def generate_sharded_rows(table_name: str, master_seed: int,
+                          executor: Optional[Executor] = None,
+                          backend: str = GENERATION_BACKEND,
+                          rows_per_table: Optional[dict] = None,
+                          shard_size: int = GENERATION_SHARD_SIZE,
+                          max_pending_shards: int = 1) -> Iterator[list]:
+    """
+    Function provides generating table rows by shards in executor workers,
+    shards are yielded in the order of rows, so the result depends only on
+    master seed and shard size, but not on the number of workers
+    :param table_name: name of the generated table
+    :param master_seed: seed of the whole generation
+    :param executor: executor that generates shards,
+                     None - shards are generated in the current process
+    :param backend: generation backend name ('python' or 'numpy')
+    :param rows_per_table: dict with number of rows for each table
+    :param shard_size: max number of rows in one shard
+    :param max_pending_shards: max number of shards that are generated
+                               but not consumed yet
+    :return: iterator over lists of tuples with rows of each shard
+    """
+    number_of_rows = (rows_per_table or NUMBER_OF_ROWS_PER_TABLE)[table_name]
+    shards_args = ((table_name, shard_index, shard_size, master_seed,
+                    backend, rows_per_table)
+                   for shard_index in range(-(-number_of_rows // shard_size)))
+    if executor is None:
+        for shard_args in shards_args:
+            yield generate_table_shard(*shard_args)
+        return
+
+    pending_shards = deque()
+    for shard_args in shards_args:
+        pending_shards.append(executor.submit(generate_table_shard,
+                                              *shard_args))
+        if len(pending_shards) >= max_pending_shards:
+            yield pending_shards.popleft().result()
+    while pending_shards:
+        yield pending_shards.popleft().result()
+
+
+def get_generation_executor(workers: int) -> Optional[Executor]:
+    """
+    Function provides creating process pool for sharded generation
+    :param workers: number of worker processes
+    :return: process pool executor, None - if only one worker is required
+    """
+    if workers <= 1:
+        return None
+    logging.info(f'Create process pool with {workers} generation workers')
+    return ProcessPoolExecutor(max_workers=workers)
@@ -1,60 +1,69 @@
 import logging
-from random import randint, sample
+import random
+from itertools import islice
+from typing import Iterable, Iterator
 
 
-def generate_n_items(item_name: str, number: int) -> list:
+def generate_n_items(item_name: str, number: int, start: int = 0) -> list:
     """
     Function provides string-items generation
     :param item_name: name of the feature to generate
     :param number: number of items that will be generated
+    :param start: index of the first item
     :return: list with generated data
     """
     logging.debug(f'Generate {number} number of {item_name} items')
-    return [f'{item_name}-{index}' for index in range(number)]
+    return [f'{item_name}-{index}' for index in range(start, start + number)]
 
 
 def generate_n_integers(number_of_digits: int, left_border: int,
-                        right_border: int) -> list:
+                        right_border: int,
+                        generator: random.Random = random) -> list:
     """
     Function provides digits generation
     :param number_of_digits: number of items that will be generated
     :param left_border: left border of the generation interval
     :param right_border: right border of the generation interval
+    :param generator: random generator, global random module by default
     :return: list with generated data
     """
     logging.debug(f'Generate {number_of_digits} random numbers from '
                   f'[{left_border}, {right_border}] interval')
-    return [randint(left_border, right_border) for _
+    return [generator.randint(left_border, right_border) for _
             in range(number_of_digits)]
 
 
 def generate_items_for_ships(item_name: str, number: int, left_border: int,
-                             right_border: int) -> list:
+                             right_border: int,
+                             generator: random.Random = random) -> list:
     """
     Function that generates available items for ship components
     :param item_name: ship component name
     :param number: number of items that will be generated
     :param left_border: left border of the generation interval
     :param right_border: right border of the generation interval
+    :param generator: random generator, global random module by default
     :return: list with generated data
     """
     logging.debug(f'Generate {number} items for {item_name} of ship '
                   f'from [{left_border}, {right_border}] interval')
     result = []
     for item_index in range(number):
-        item_suffix = randint(left_border, right_border-1)
+        item_suffix = generator.randint(left_border, right_border-1)
         result.append(f'{item_name}-{item_suffix}')
     return result
 
 
-def get_random_value(available_items: tuple) -> str:
+def get_random_value(available_items: tuple,
+                     generator: random.Random = random) -> str:
     """
     Function returns random value from tuple
     :param available_items: available data to get from
+    :param generator: random generator, global random module by default
     :return: item from tuple
     """
     logging.debug(f'Get random value from {available_items}')
-    return sample(available_items, 1)[0]
+    return generator.sample(available_items, 1)[0]
 
 
 def generate_test_cases(item_case_name: str = 'ship',
@@ -71,9 +80,50 @@ def generate_test_cases(item_case_name: str = 'ship',
     """
     logging.debug('Generate test cases')
     testing_items = generate_n_items(item_case_name, number_of_case_items)
-    result = []
+    return list(iter_test_cases(testing_items, available_components))
+
+
+def iter_test_cases(testing_items: Iterable[str],
+                    available_components: tuple =
+                    ('weapon', 'hull', 'engine')) -> Iterator[tuple]:
+    """
+    Function provides lazy test cases generation for the given items
+    :param testing_items: item ids for which test cases should be generated
+    :param available_components: tuple with components for each item
+    :return: iterator over pairs of ship-component
+    """
     for item in testing_items:
         for component in available_components:
-            result.append((item, component))
+            yield item, component
 
-    return result
+
+def generate_test_cases_chunks(chunk_size: int,
+                               item_case_name: str = 'ship',
+                               number_of_case_items: int = 200
+                               ) -> Iterator[list]:
+    """
+    Function provides lazy generation of test items grouped into chunks,
+    so test cases don't have to be built eagerly
+    :param chunk_size: number of items in one chunk
+    :param item_case_name: name for the item for which
+                           test cases should be generated
+    :param number_of_case_items: number of desired distinct items
+    :return: iterator over lists with item ids
+    """
+    for start in range(0, number_of_case_items, chunk_size):
+        yield generate_n_items(item_case_name,
+                               min(chunk_size, number_of_case_items - start),
+                               start)
+
+
+def get_shard_chunks(chunks: Iterable, shard_index: int,
+                     shards_number: int) -> Iterator:
+    """
+    Function returns chunks of the shard: chunks are distributed between
+    shards in round-robin order
+    :param chunks: iterable with all chunks
+    :param shard_index: index of the shard from [0, shards_number) interval
+    :param shards_number: total number of shards
+    :return: iterator over chunks of the shard
+    """
+    return islice(chunks, shard_index, None, shards_number)
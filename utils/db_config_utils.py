@@ -0,0 +1,51 @@
+from functools import lru_cache
+
+from configs.db_constants_and_configs import (TABLES_CONFIG,
+                                              EXTRA_INDEXES_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def get_table_columns(table_name: str) -> tuple:
+    """
+    Function returns table column names according to db config
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: tuple with column names in the config order
+    """
+    return tuple(col_name for col_name in TABLES_CONFIG[table_name]
+                 if col_name != 'foreign_keys')
+
+
+def get_primary_key(table_name: str) -> str:
+    """
+    Function returns primary key column name of the table
+    (the first column in the db config)
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: primary key column name
+    """
+    return get_table_columns(table_name)[0]
+
+
+def get_foreign_keys(table_name: str) -> list:
+    """
+    Function returns foreign keys configuration of the table
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: list of tuples in the following format:
+    [(column_name, referenced_table, referenced_column), ...]
+    """
+    return TABLES_CONFIG[table_name].get('foreign_keys', [])
+
+
+def get_table_indexes(table_name: str) -> list:
+    """
+    Function returns indexes that should be created for the table:
+    one index per foreign key column plus extra indexes from db config
+    :param table_name: name of the table from TABLES_CONFIG
+    :return: list of tuples with indexed columns in the following format:
+    [(column_name, ...), ...]
+    """
+    indexes = [(column_name, ) for column_name, _, _
+               in get_foreign_keys(table_name)]
+    for index_columns in EXTRA_INDEXES_CONFIG.get(table_name, []):
+        if tuple(index_columns) not in indexes:
+            indexes.append(tuple(index_columns))
+    return indexes
@@ -0,0 +1,85 @@
+import hashlib
+import sqlite3
+
+HASH_BYTES = 8
+HASH_MODULO = 2 ** (8 * HASH_BYTES)
+HASH_MAX = 2 ** (8 * HASH_BYTES - 1)
+
+
+def normalize_hash(value: int) -> int:
+    """
+    Function provides wrapping integer into signed 64-bit range,
+    so it could be stored as SQLite integer
+    :param value: any integer
+    :return: integer from [-2^63, 2^63) interval
+    """
+    return (value + HASH_MAX) % HASH_MODULO - HASH_MAX
+
+
+def get_row_hash(*values) -> int:
+    """
+    Function returns stable hash of the row values, it doesn't depend on
+    process and PYTHONHASHSEED value
+    :param values: row values
+    :return: signed 64-bit hash
+    """
+    digest = hashlib.blake2b(repr(values).encode(),
+                             digest_size=HASH_BYTES).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def get_bucket(value, buckets: int) -> int:
+    """
+    Function returns bucket number of the primary key value
+    :param value: primary key value
+    :param buckets: number of buckets
+    :return: bucket number from [0, buckets) interval
+    """
+    return get_row_hash(value) % buckets
+
+
+def add_hashes(first_hash: int, second_hash: int) -> int:
+    """
+    Function returns sum of hashes, it's used for order independent
+    combining of rows hashes that could be updated incrementally
+    """
+    return normalize_hash(first_hash + second_hash)
+
+
+def subtract_hashes(first_hash: int, second_hash: int) -> int:
+    """
+    Function returns difference of hashes (reverse for add_hashes)
+    """
+    return normalize_hash(first_hash - second_hash)
+
+
+class HashSum:
+    """
+    SQLite aggregate that combines rows hashes with add_hashes function
+    """
+    def __init__(self):
+        self.value = 0
+
+    def step(self, row_hash: int) -> None:
+        if row_hash is not None:
+            self.value = add_hashes(self.value, row_hash)
+
+    def finalize(self) -> int:
+        return self.value
+
+
+def register_hash_functions(connection: sqlite3.Connection) -> None:
+    """
+    Function provides registering hash functions in SQLite connection,
+    they are used by fingerprint triggers, so every connection that
+    changes fingerprinted tables should have them
+    :param connection: sqlite connection
+    """
+    connection.create_function('row_hash', -1, get_row_hash,
+                               deterministic=True)
+    connection.create_function('key_bucket', 2, get_bucket,
+                               deterministic=True)
+    connection.create_function('hash_add', 2, add_hashes, deterministic=True)
+    connection.create_function('hash_sub', 2, subtract_hashes,
+                               deterministic=True)
+    connection.create_aggregate('hash_sum', 1, HashSum)
@@ -0,0 +1,72 @@
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def get_numpy_generator(seed: int = None) -> 'numpy.random.Generator':
+    """
+    Function provides creating seeded numpy random generator
+    :param seed: seed of the generator, None - use random seed
+    :return: numpy random generator
+    """
+    if numpy is None:
+        raise ImportError('numpy package is required for numpy generation '
+                          'backend')
+    return numpy.random.default_rng(seed)
+
+
+def generate_n_items_array(item_name: str, number: int,
+                           start: int = 0) -> 'numpy.ndarray':
+    """
+    Function provides string-items generation as a whole column
+    :param item_name: name of the feature to generate
+    :param number: number of items that will be generated
+    :param start: index of the first item
+    :return: array with generated data
+    """
+    logging.debug(f'Generate {number} number of {item_name} items')
+    indexes = numpy.arange(start, start + number).astype(str)
+    return numpy.char.add(f'{item_name}-', indexes)
+
+
+def generate_n_integers_array(generator: 'numpy.random.Generator',
+                              number_of_digits: int, left_border: int,
+                              right_border: int) -> 'numpy.ndarray':
+    """
+    Function provides digits generation as a whole column
+    :param generator: numpy random generator
+    :param number_of_digits: number of items that will be generated
+    :param left_border: left border of the generation interval
+    :param right_border: right border of the generation interval
+                         (included like in random.randint)
+    :return: array with generated data
+    """
+    logging.debug(f'Generate {number_of_digits} random numbers from '
+                  f'[{left_border}, {right_border}] interval')
+    return generator.integers(left_border, right_border,
+                              size=number_of_digits, endpoint=True)
+
+
+def generate_items_for_ships_array(generator: 'numpy.random.Generator',
+                                   item_name: str, number: int,
+                                   left_border: int,
+                                   right_border: int) -> 'numpy.ndarray':
+    """
+    Function that generates available items for ship components
+    as a whole column
+    :param generator: numpy random generator
+    :param item_name: ship component name
+    :param number: number of items that will be generated
+    :param left_border: left border of the generation interval
+    :param right_border: right border of the generation interval
+                         (excluded like in generate_items_for_ships)
+    :return: array with generated data
+    """
+    logging.debug(f'Generate {number} items for {item_name} of ship '
+                  f'from [{left_border}, {right_border}) interval')
+    item_suffixes = generator.integers(left_border, right_border,
+                                       size=number).astype(str)
+    return numpy.char.add(f'{item_name}-', item_suffixes)
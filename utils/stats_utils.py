@@ -0,0 +1,39 @@
+import math
+
+
+def get_percentile(sorted_values: list, percentile: float) -> float:
+    """
+    Function returns percentile of the values (nearest-rank method)
+    :param sorted_values: list with values sorted in ascending order
+    :param percentile: percentile in [0, 100] interval
+    :return: percentile value, 0.0 for empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def get_latency_summary(latencies: list,
+                        percentiles: tuple = (50, 95, 99)) -> dict:
+    """
+    Function provides summary of latencies measurements
+    :param latencies: list with latencies in seconds
+    :param percentiles: percentiles that should be calculated
+    :return: dict with latencies summary in milliseconds:
+    {'count': ..., 'total_ms': ..., 'mean_ms': ..., 'max_ms': ...,
+     'p50_ms': ..., ...}
+    """
+    sorted_latencies = sorted(latencies)
+    total = sum(sorted_latencies)
+    summary = {
+        'count': len(sorted_latencies),
+        'total_ms': total * 1000,
+        'mean_ms': total / len(sorted_latencies) * 1000
+        if sorted_latencies else 0.0,
+        'max_ms': sorted_latencies[-1] * 1000 if sorted_latencies else 0.0,
+    }
+    for percentile in percentiles:
+        summary[f'p{percentile}_ms'] = get_percentile(sorted_latencies,
+                                                      percentile) * 1000
+    return summary